@@ -8,103 +8,72 @@ Use this module for importing PYPOWER function names into your namespace. For
 example::
 
     from pypower.api import runpf
+
+Each function is imported from its module the first time it is used, so
+that importing this module does not import NumPy, SciPy, the bundled cases
+or the tests. Python versions without module C{__getattr__} (before 3.7)
+import them all at once.
 """
 
 from __future__ import absolute_import
 
-from .add_userfcn import add_userfcn
-from .bustypes import bustypes
-from .case118 import case118
-from .case14 import case14
-from .case24_ieee_rts import case24_ieee_rts
-from .case300 import case300
-from .case30pwl import case30pwl
-from .case30 import case30
-from .case30Q import case30Q
-from .case39 import case39
-from .case4gs import case4gs
-from .case57 import case57
-from .case6ww import case6ww
-from .case9 import case9
-from .case9Q import case9Q
-from .cplex_options import cplex_options
-from .d2AIbr_dV2 import d2AIbr_dV2
-from .d2ASbr_dV2 import d2ASbr_dV2
-from .d2Ibr_dV2 import d2Ibr_dV2
-from .d2Sbr_dV2 import d2Sbr_dV2
-from .d2Sbus_dV2 import d2Sbus_dV2
-from .dAbr_dV import dAbr_dV
-from .dcopf import dcopf
-from .dcopf_solver import dcopf_solver
-from .dcpf import dcpf
-from .dIbr_dV import dIbr_dV
-from .dSbr_dV import dSbr_dV
-from .dSbus_dV import dSbus_dV
-from .ext2int import ext2int
-from .fairmax import fairmax
-from .fdpf import fdpf
-from .gausspf import gausspf
-from .get_reorder import get_reorder
-from .hasPQcap import hasPQcap
-from .int2ext import int2ext
-from .ipoptopf_solver import ipoptopf_solver
-from .ipopt_options import ipopt_options
-from .isload import isload
-from .loadcase import loadcase
-from .makeAang import makeAang
-from .makeApq import makeApq
-from .makeAvl import makeAvl
-from .makeAy import makeAy
-from .makeBdc import makeBdc
-from .makeB import makeB
-from .makeLODF import makeLODF
-from .makePTDF import makePTDF
-from .makeSbus import makeSbus
-from .makeYbus import makeYbus
-from .modcost import modcost
-from .mosek_options import mosek_options
-from .newtonpf import newtonpf
-from .opf_args import opf_args
-from .opf_consfcn import opf_consfcn
-from .opf_costfcn import opf_costfcn
-from .opf_execute import opf_execute
-from .opf_hessfcn import opf_hessfcn
-from .opf_model import opf_model
-from .opf import opf
-from .opf_setup import opf_setup
-from .pfsoln import pfsoln
-from .pipsopf_solver import pipsopf_solver
-from .pips import pips
-from .pipsver import pipsver
-from .poly2pwl import poly2pwl
-from .polycost import polycost
-from .ppoption import ppoption
-from .ppver import ppver
-from .pqcost import pqcost
-from .printpf import printpf
-from .qps_cplex import qps_cplex
-from .qps_ipopt import qps_ipopt
-from .qps_mosek import qps_mosek
-from .qps_pips import qps_pips
-from .qps_pypower import qps_pypower
-from .remove_userfcn import remove_userfcn
-from .rundcopf import rundcopf
-from .rundcpf import rundcpf
-from .runduopf import runduopf
-from .runopf import runopf
-from .runopf_w_res import runopf_w_res
-from .runpf import runpf
-from .runuopf import runuopf
-from .run_userfcn import run_userfcn
-from .savecase import savecase
-from .scale_load import scale_load
-from .set_reorder import set_reorder
-from .toggle_iflims import toggle_iflims
-from .toggle_reserves import toggle_reserves
-from .total_load import total_load
-from .totcost import totcost
-from .uopf import uopf
-from .update_mupq import update_mupq
-
-from .t.test_pypower import test_pypower
-from .t.t_case30_userfcns import t_case30_userfcns
+import sys
+
+from importlib import import_module
+
+
+## functions, each defined in the module of the same name
+_FUNCTIONS = (
+    'add_userfcn', 'bfswpf', 'bustypes', 'case118', 'case14', 'casecache',
+    'case24_ieee_rts', 'case300', 'case30pwl', 'case30', 'case30Q', 'case39',
+    'case4gs', 'case57', 'case6ww', 'case9', 'case9Q', 'cplex_options',
+    'cpf_corrector', 'cpf_p', 'cpf_p_jac', 'cpf_predictor', 'd2AIbr_dV2',
+    'd2ASbr_dV2', 'd2Ibr_dV2', 'd2Sbr_dV2', 'd2Sbus_dV2', 'dAbr_dV', 'dcopf',
+    'dcopf_solver', 'dcpf', 'dcscreen', 'dIbr_dV', 'dSbr_dV', 'dSbus_dV',
+    'ext2int', 'fairmax', 'fdpf', 'find_islands', 'gausspf', 'get_reorder',
+    'hasPQcap', 'int2ext', 'ipoptopf_solver', 'ipopt_options', 'isload',
+    'jac_builder', 'loadcase', 'loadtspf', 'lodf_model', 'makeAang',
+    'makeApq', 'makeAvl', 'makeAy', 'makeBdc', 'makeB', 'makeLODF',
+    'makePTDF', 'makeSbus', 'makeYbus', 'modcost', 'mosek_options',
+    'newtonpf', 'opf_args', 'opf_consfcn', 'opf_costfcn', 'opf_execute',
+    'opf_hessfcn', 'opf_model', 'opf', 'optimal_multiplier', 'opf_setup',
+    'pf_session', 'pfsoln', 'pipsopf_solver', 'pips', 'pipsver', 'poly2pwl',
+    'polycost', 'ppoption', 'pptiming', 'ppver', 'pqcost', 'printpf',
+    'psse2ppc', 'qps_cplex', 'qps_ipopt', 'qps_mosek', 'qps_pips',
+    'qps_pypower', 'remove_userfcn', 'runcpf', 'rundcopf', 'rundcpf',
+    'runduopf', 'runopf', 'runopf_w_res', 'runpf', 'runpf_batch', 'runpf_n1',
+    'runtspf', 'runuopf',
+    'run_userfcn', 'savecase', 'scale_load', 'set_reorder', 'synthcase',
+    'toggle_iflims', 'toggle_reserves', 'total_load', 'totcost', 'uopf',
+    'update_mupq', 'ybus_model',
+)
+
+## module of each function, relative to pypower
+_MODULES = dict((name, name) for name in _FUNCTIONS)
+_MODULES['test_pypower'] = 't.test_pypower'
+_MODULES['t_case30_userfcns'] = 't.t_case30_userfcns'
+_MODULES['loadcase_bin'] = 'casebin'
+_MODULES['savecase_bin'] = 'casebin'
+_MODULES['loadcase_m'] = 'casem'
+_MODULES['get_casecache'] = 'casecache'
+_MODULES['set_casecache'] = 'casecache'
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+    value = getattr(import_module('pypower.' + _MODULES[name]), name)
+    globals()[name] = value             ## later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
@@ -0,0 +1,293 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Times the power flow, OPF and sensitivity functions on test cases.
+"""
+
+import os
+import sys
+import json
+import platform
+import tracemalloc
+
+from time import time
+from optparse import OptionParser
+from subprocess import check_call
+from os.path import dirname, join
+
+import numpy
+import scipy
+
+from numpy import errstate
+
+from pypower.loadcase import loadcase
+from pypower.ext2int import ext2int
+from pypower.ppoption import ppoption
+from pypower.pptiming import pptiming, timing_recorder
+from pypower.ppver import ppver
+from pypower.runpf import runpf
+from pypower.rundcpf import rundcpf
+from pypower.runopf import runopf
+from pypower.rundcopf import rundcopf
+from pypower.runuopf import runuopf
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+from pypower.synthcase import synthcase
+
+
+## bundled cases timed by default, and larger synthetic ones
+CASES = ['case9', 'case14', 'case30', 'case39', 'case57', 'case118',
+         'case300', 'case118x10', 'case300x10']
+
+
+def _pf(alg):
+    def run(ppc, ppopt):
+        r, success = runpf(ppc, ppoption(ppopt, PF_ALG=alg))
+        return success
+    return run
+
+
+def _dcpf(ppc, ppopt):
+    r, success = rundcpf(ppc, ppopt)
+    return success
+
+
+def _opf(runner):
+    def run(ppc, ppopt):
+        return runner(ppc, ppopt)['success']
+    return run
+
+
+def _ptdf(ppc, ppopt):
+    tm = timing_recorder(ppopt['TIMING'])
+    t = tm.tic()
+    ppc = ext2int(ppc)
+    t = tm.toc('ext2int', t)
+    makePTDF(ppc['baseMVA'], ppc['bus'], ppc['branch'])
+    tm.toc('makePTDF', t)
+    return True
+
+
+def _lodf(ppc, ppopt):
+    tm = timing_recorder(ppopt['TIMING'])
+    t = tm.tic()
+    ppc = ext2int(ppc)
+    t = tm.toc('ext2int', t)
+    H = makePTDF(ppc['baseMVA'], ppc['bus'], ppc['branch'])
+    t = tm.toc('makePTDF', t)
+    with errstate(divide='ignore', invalid='ignore'):   ## radial branches
+        makeLODF(ppc['branch'], H)
+    tm.toc('makeLODF', t)
+    return True
+
+
+## name, function and largest number of buses timed by default
+SOLVERS = [
+    ('runpf_nr',   _pf(1),            None),
+    ('runpf_fdxb', _pf(2),            None),
+    ('runpf_fdbx', _pf(3),            None),
+    ('runpf_gs',   _pf(4),            300),
+    ('runpf_bfsw', _pf(5),            None),
+    ('rundcpf',    _dcpf,             None),
+    ('runopf',     _opf(runopf),      1200),
+    ('rundcopf',   _opf(rundcopf),    None),
+    ('runuopf',    _opf(runuopf),     300),
+    ('makePTDF',   _ptdf,             None),
+    ('makeLODF',   _lodf,             None),
+]
+
+
+def _case(name):
+    ## a bundled case, or a synthetic one of n copies for a name 'caseXXXxn'
+    base, _, n = name.partition('x')
+    ppc = loadcase(join(dirname(__file__), base))
+    if n:
+        ppc = synthcase(int(n) * ppc['bus'].shape[0], base=ppc)
+    return ppc
+
+
+## Python code run in a new interpreter to time imports and start up
+IMPORTS = [
+    ('python',       'pass'),
+    ('pypower.api',  'import pypower.api'),
+    ('pypower.main', 'import pypower.main'),
+    ('pf --help',    "from pypower.main import pf; pf(['--help'])"),
+    ('runpf',        'from pypower.api import runpf'),
+]
+
+
+def _run_python(code):
+    ## wall time of a new interpreter running code, with this pypower
+    env = dict(os.environ)
+    path = dirname(dirname(__file__))
+    env['PYTHONPATH'] = os.pathsep.join([path] +
+        ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    with open(os.devnull, 'w') as null:
+        t0 = time()
+        check_call([sys.executable, '-c', code], stdout=null, env=env)
+        return time() - t0
+
+
+def _info():
+    ## versions and machine the results were obtained with
+    return {'pypower': ppver()['Version'], 'numpy': numpy.__version__,
+            'scipy': scipy.__version__, 'python': platform.python_version(),
+            'machine': platform.machine(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'time': time()}
+
+
+def benchmark(cases=None, solvers=None, repeat=3, memory=True, fname='',
+              baseline=None, quiet=False, imports=True):
+    """Times the power flow, OPF and sensitivity functions on test cases.
+
+    Runs each function of C{solvers} on each case of C{cases} C{repeat}
+    times and returns a dict with the versions of PYPOWER, NumPy, SciPy and
+    Python and the machine used (in C{'info'}) and a list of C{'results'},
+    one dict for each case and function with keys:
+
+        - C{case}       case name
+        - C{nb}         number of buses
+        - C{solver}     function name
+        - C{success}    C{True} if all runs succeeded
+        - C{time}       best wall time of the runs, in seconds
+        - C{times}      wall times of all runs
+        - C{phases}     wall time and number of calls of each phase, summed
+                        over the runs, as recorded with the C{TIMING}
+                        option, see L{pptiming}
+        - C{peak_mem}   peak memory allocated in an extra run, in bytes
+                        (only if C{memory} is true)
+        - C{ratio}      C{time} divided by the time of the same case and
+                        function in C{baseline} (only if C{baseline} is
+                        given and has it)
+
+    C{cases} are names of bundled cases, or of the form C{'case300x10'} for
+    a case of 10 copies of C{case300} built by L{synthcase}. By default
+    C{case9} to C{case300} and 10 copies of C{case118} and C{case300} are
+    used. C{solvers} is a list of names from:
+
+        - C{runpf_nr}, C{runpf_fdxb}, C{runpf_fdbx}, C{runpf_gs},
+          C{runpf_bfsw}: L{runpf} with C{PF_ALG} 1 to 5
+        - C{rundcpf}, C{runopf}, C{rundcopf}, C{runuopf}
+        - C{makePTDF}, C{makeLODF}: the PTDF and LODF matrices (and the
+          PTDF matrix they are computed from), for the case converted to
+          internal indexing
+
+    All are used by default, but then Gauss-Seidel and L{runuopf} only for
+    cases up to 300 buses and L{runopf} up to 1200 buses.
+
+    If C{imports} is true, the start up time of a new Python interpreter
+    which imports C{pypower.api} or C{pypower.main}, prints the C{pf}
+    command line help or imports L{runpf} is also measured, with C{case}
+    C{'import'} and the name of the test in C{solver}, see C{IMPORTS}.
+    The time of C{'python'}, which imports nothing, is included for
+    reference.
+
+    Peak memory is measured with C{tracemalloc}, which slows down the run,
+    so it is done in a separate run which is not timed.
+
+    If C{fname} is given, the results are saved to it as JSON. C{baseline}
+    is the name of such a file, or a dict returned by a previous call, to
+    compare with. Unless C{quiet} is true, a line is printed for each case
+    and function.
+
+    From the command line::
+        python -m pypower.benchmark -o new.json --baseline old.json
+
+    @see: L{pptiming}, L{synthcase}
+    """
+    if cases is None:
+        cases = CASES
+    limit = solvers is None             ## skip the slow ones on big cases
+    if solvers is None:
+        solvers = [s[0] for s in SOLVERS]
+    funcs = dict((s[0], s) for s in SOLVERS)
+    for s in solvers:
+        if s not in funcs:
+            raise ValueError('benchmark: unknown function %s' % s)
+    if isinstance(baseline, str):
+        with open(baseline) as fd:
+            baseline = json.load(fd)
+    if baseline is not None:
+        base = dict(((r['case'], r['solver']), r['time'])
+                    for r in baseline['results'])
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    results = []
+
+    def add(r):
+        if baseline is not None and (r['case'], r['solver']) in base:
+            r['ratio'] = r['time'] / base[(r['case'], r['solver'])]
+        results.append(r)
+        if not quiet:
+            sys.stdout.write('%-12s %6d  %-12s %10.4f %10s %8s%s\n' % (
+                r['case'], r['nb'], r['solver'], r['time'],
+                '%.1f' % (r['peak_mem'] / 1e6) if 'peak_mem' in r else '-',
+                '%.2f' % r['ratio'] if 'ratio' in r else '-',
+                '' if r['success'] else '  (failed)'))
+
+    if not quiet:
+        sys.stdout.write('%-12s %6s  %-12s %10s %10s %8s\n' % ('case', 'nb',
+                         'function', 'time (s)', 'peak (MB)', 'ratio'))
+    if imports:
+        for s, code in IMPORTS:
+            times = [_run_python(code) for _ in range(repeat)]
+            add({'case': 'import', 'nb': 0, 'solver': s, 'success': True,
+                 'time': min(times), 'times': times})
+
+    for name in cases:
+        ppc = _case(name)
+        nb = ppc['bus'].shape[0]
+        for s in solvers:
+            _, run, maxnb = funcs[s]
+            if limit and maxnb is not None and nb > maxnb:
+                continue
+            tm = pptiming()
+            opt = ppoption(ppopt, TIMING=tm)
+            times = []
+            success = True
+            for _ in range(repeat):
+                t0 = time()
+                success = run(ppc, opt) and success
+                times.append(time() - t0)
+            r = {'case': name, 'nb': nb, 'solver': s,
+                 'success': bool(success), 'time': min(times),
+                 'times': times, 'phases': tm.summary()}
+
+            if memory:
+                tracemalloc.start()
+                run(ppc, ppoption(ppopt, TIMING=0))
+                r['peak_mem'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            add(r)
+
+    bm = {'info': _info(), 'results': results}
+    if fname:
+        with open(fname, 'w') as fd:
+            json.dump(bm, fd, indent=1)
+
+    return bm
+
+
+if __name__ == '__main__':
+    parser = OptionParser(usage='usage: %prog [options]')
+    parser.add_option('-c', '--cases', default='', help='comma separated '
+                      'case names, e.g. case30,case300x10 [default: all]')
+    parser.add_option('-f', '--functions', default='',
+                      help='comma separated function names [default: all]')
+    parser.add_option('-r', '--repeat', type='int', default=3,
+                      help='number of timed runs [default: %default]')
+    parser.add_option('-m', '--no-memory', action='store_true',
+                      help='do not measure peak memory')
+    parser.add_option('-o', '--outfile', default='',
+                      help='save the results to a JSON file')
+    parser.add_option('-b', '--baseline', default=None,
+                      help='JSON file of earlier results to compare with')
+    parser.add_option('-i', '--no-imports', action='store_true',
+                      help='do not measure import times')
+    options, args = parser.parse_args()
+
+    benchmark(options.cases.split(',') if options.cases else None,
+              options.functions.split(',') if options.functions else None,
+              options.repeat, not options.no_memory, options.outfile,
+              options.baseline, imports=not options.no_imports)
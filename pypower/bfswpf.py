@@ -0,0 +1,176 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves the power flow of a radial network by backward/forward sweeps.
+"""
+
+import sys
+
+from time import time
+
+from numpy import \
+    arange, zeros, ones, where, conj, r_, add, asarray, linalg, Inf
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+from scipy.sparse.csgraph import breadth_first_order
+
+from pypower.ppoption import ppoption
+from pypower.newtonpf import newtonpf
+
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+
+
+def bfswpf(Ybus, Sbus, V0, Yf, Yt, branch, ref, pv, pq, ppopt=None):
+    """Solves the power flow of a radial network by backward/forward sweeps.
+
+    Solves for bus voltages given the full system admittance matrix (for
+    all buses), the complex bus power injection vector (for all buses),
+    the initial vector of complex bus voltages, the branch admittance
+    matrices C{Yf} and C{Yt} and the C{branch} matrix, and column vectors
+    with the lists of bus indices for the swing bus, PV buses, and PQ
+    buses, respectively. C{ppopt} is a PYPOWER options vector which can be
+    used to set the termination tolerance, maximum number of iterations,
+    and output options (see L{ppoption} for details). Uses default options
+    if this parameter is not given. Returns the final complex voltages, a
+    flag which indicates whether it converged or not, and the number of
+    iterations performed.
+
+    The buses are ordered once by depth from the swing bus along the
+    in-service branches. Each iteration then sweeps the levels of the tree
+    from the leaves up, summing the branch currents given by the bus
+    injections and the branch two-port models, and back down, updating
+    the voltages from those of the parent buses, one level at a time with
+    vectorized operations. If the network is not radial (it is meshed, or
+    has several swing buses) or has PV buses, L{newtonpf} is used instead.
+
+    If the C{ITER_CALLBACK} option is set, it is called after each
+    iteration with a dict of the iteration number, the mismatch norm
+    C{'normF'}, the largest voltage change C{'step'}, the wall time of the
+    iteration C{'time'} and the voltages C{'V'}. The iterations stop if it
+    returns a true value.
+
+    @see: L{runpf}
+    """
+    ## default arguments
+    if ppopt is None:
+        ppopt = ppoption()
+
+    ## options
+    tol     = ppopt['PF_TOL']
+    max_it  = ppopt['PF_MAX_IT_BFSW']
+    verbose = ppopt['VERBOSE']
+    callback = ppopt['ITER_CALLBACK']
+
+    nb = len(V0)
+    on = find(branch[:, BR_STATUS] > 0)
+    f = branch[on, F_BUS].astype(int)
+    t = branch[on, T_BUS].astype(int)
+
+    ## order the buses from the swing bus
+    radial = len(ref) == 1 and len(pv) == 0 and len(on) == nb - 1
+    if radial:
+        A = sparse((ones(len(on)), (f, t)), (nb, nb))
+        order, pred = breadth_first_order(A, ref[0], directed=False)
+        radial = len(order) == nb
+    if not radial:
+        if verbose:
+            sys.stdout.write('Network is not radial or has PV buses, '
+                             'using Newton\'s method.\n')
+        V, converged, i = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+        return V, converged, i
+
+    ## parent and child end of each branch, and their two-port admittances,
+    ## I = Y * V with currents into the branch
+    Yff = asarray(Yf[on, f]).ravel()
+    Yft = asarray(Yf[on, t]).ravel()
+    Ytf = asarray(Yt[on, f]).ravel()
+    Ytt = asarray(Yt[on, t]).ravel()
+    down = pred[t] == f             ## branch goes from parent to child
+    p = where(down, f, t)
+    c = where(down, t, f)
+    Ypp, Ypc = where(down, Yff, Ytt), where(down, Yft, Ytf)
+    Ycp, Ycc = where(down, Ytf, Yft), where(down, Ytt, Yff)
+
+    ## bus shunts are the part of diag(Ybus) not due to branches
+    Ysh = Ybus.diagonal()
+    add.at(Ysh, f, -Yff)
+    add.at(Ysh, t, -Ytt)
+
+    ## branches grouped by level of their child bus
+    depth = zeros(nb, int)
+    br = zeros(nb, int)
+    br[c] = arange(len(on))
+    for k in order[1:]:
+        depth[k] = depth[pred[k]] + 1
+    levels = [br[order[depth[order] == d]] for d in range(1, depth.max() + 1)]
+
+    ## initialize
+    converged = 0
+    i = 0
+    V = V0.copy()
+    Ic = zeros(len(on), complex)        ## currents into branches at child end
+
+    ## evaluate F(x0)
+    mis = V * conj(Ybus * V) - Sbus
+    F = r_[mis[pq].real, mis[pq].imag]
+
+    ## check tolerance
+    normF = linalg.norm(F, Inf)
+    if verbose > 1:
+        sys.stdout.write('\n it    max P & Q mismatch (p.u.)')
+        sys.stdout.write('\n----  ---------------------------')
+        sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+    if normF < tol:
+        converged = 1
+        if verbose > 1:
+            sys.stdout.write('\nConverged!\n')
+
+    ## do backward/forward sweeps
+    while (not converged and i < max_it):
+        ## update iteration counter
+        i = i + 1
+        if callback is not None:
+            t0 = time()
+            V1 = V.copy()
+
+        ## backward sweep, net current injections less the currents into
+        ## the branches to the children of each bus
+        J = conj(Sbus / V) - Ysh * V
+        for k in reversed(levels):
+            Ic[k] = J[c[k]]
+            ## parent end current from the child end quantities
+            Vp = (Ic[k] - Ycc[k] * V[c[k]]) / Ycp[k]
+            add.at(J, p[k], -(Ypp[k] * Vp + Ypc[k] * V[c[k]]))
+
+        ## forward sweep
+        for k in levels:
+            V[c[k]] = (Ic[k] - Ycp[k] * V[p[k]]) / Ycc[k]
+
+        ## evalute F(x)
+        mis = V * conj(Ybus * V) - Sbus
+        F = r_[mis[pq].real, mis[pq].imag]
+
+        ## check for convergence
+        normF = linalg.norm(F, Inf)
+        if verbose > 1:
+            sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+        if normF < tol:
+            converged = 1
+            if verbose:
+                sys.stdout.write('\nBackward/forward sweep power flow '
+                                 'converged in %d iterations.\n' % i)
+
+        if callback is not None and \
+                callback({'solver': 'bfswpf', 'iteration': i, 'normF': normF,
+                          'step': abs(V - V1).max(), 'time': time() - t0,
+                          'V': V}):
+            break
+
+    if verbose:
+        if not converged:
+            sys.stdout.write('Backward/forward sweep power flow did not '
+                             'converge in %d iterations.' % i)
+
+    return V, converged, i
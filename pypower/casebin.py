@@ -0,0 +1,150 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Saves and loads PYPOWER cases in a binary directory format.
+"""
+
+import os
+import re
+import json
+
+from sys import stderr
+from shutil import rmtree
+from importlib import import_module
+
+from numpy import ndarray, generic, ascontiguousarray, save, load
+
+from scipy.sparse import issparse, csr_matrix
+
+
+## name and version of the format, in the header
+FORMAT = 'PYPOWER binary case'
+FORMAT_VERSION = 1
+
+HEADER = 'case.json'
+
+
+def savecase_bin(dirname, ppc):
+    """Saves a case dict to a binary case directory.
+
+    Writes the directory C{dirname} (usually with extension C{.ppc}, see
+    L{savecase}) with each array of C{ppc} in a NumPy C{.npy} file, written
+    with a single bulk copy, and a small JSON header C{case.json} with the
+    other values (C{version}, C{baseMVA}, ...) and the names of the array
+    files. Sparse matrices are saved as CSR arrays, nested dicts and lists
+    (e.g. C{reserves}) are saved with their arrays, and the functions of
+    C{userfcn} by module and name, so that they are imported again by
+    L{loadcase_bin}. Values which cannot be saved (e.g. object arrays or
+    the C{om} of OPF results) are skipped with a warning.
+
+    The directory is written next to C{dirname} and then renamed to it, so
+    that processes loading the case never see a partly written one.
+    """
+    dirname = os.path.normpath(dirname)
+    tmp = '%s.tmp%d' % (dirname, os.getpid())
+    if os.path.exists(tmp):
+        rmtree(tmp)
+    os.makedirs(tmp)
+
+    files = set()
+
+    def array_file(path, a):
+        ## write an array to a new file named after its path in ppc
+        name = re.sub(r'[^\w.-]', '_', '.'.join(path)) or 'array'
+        fname, k = name + '.npy', 1
+        while fname in files:
+            fname, k = '%s.%d.npy' % (name, k), k + 1
+        files.add(fname)
+        save(os.path.join(tmp, fname), ascontiguousarray(a),
+             allow_pickle=False)
+        return fname
+
+    def encode(path, v):
+        if isinstance(v, ndarray):
+            if v.dtype.hasobject:
+                raise TypeError('object array')
+            return {'__array__': array_file(path, v)}
+        elif issparse(v):
+            v = csr_matrix(v)
+            return {'__sparse__': [array_file(path + [a], getattr(v, a))
+                                   for a in ['data', 'indices', 'indptr']],
+                    'shape': list(v.shape)}
+        elif isinstance(v, generic):
+            return v.item()
+        elif isinstance(v, dict):
+            d = {}
+            for k in v:
+                try:
+                    d[str(k)] = encode(path + [str(k)], v[k])
+                except TypeError as e:
+                    stderr.write('savecase_bin: %s skipped, %s\n' %
+                                 ('.'.join(path + [str(k)]), e))
+            return d
+        elif isinstance(v, (list, tuple)):
+            return [encode(path + [str(i)], x) for i, x in enumerate(v)]
+        elif callable(v) and hasattr(v, '__module__') and \
+                hasattr(v, '__name__'):
+            return {'__function__': '%s:%s' % (v.__module__, v.__name__)}
+        elif v is None or isinstance(v, (bool, int, float, str)):
+            return v
+        raise TypeError('cannot save a %s' % type(v).__name__)
+
+    header = {'format': FORMAT, 'format_version': FORMAT_VERSION,
+              'case': encode([], ppc)}
+    with open(os.path.join(tmp, HEADER), 'w') as fd:
+        json.dump(header, fd, indent=1)
+
+    ## replace any previous case
+    if os.path.exists(dirname):
+        old = '%s.old%d' % (dirname, os.getpid())
+        os.rename(dirname, old)
+        os.rename(tmp, dirname)
+        rmtree(old)
+    else:
+        os.rename(tmp, dirname)
+
+    return dirname
+
+
+def loadcase_bin(dirname, mmap_mode='c'):
+    """Loads a case dict from a binary case directory.
+
+    Reads a directory written by L{savecase_bin}. The arrays are memory
+    mapped with C{numpy.load} and the given C{mmap_mode}, so that only the
+    header is read at once and the data is paged in as it is used. With
+    the default C{'c'} (copy-on-write), the arrays can be modified without
+    changing the files, and processes loading the same case share the
+    pages they do not modify. C{'r'} maps them read-only, and C{None}
+    reads them into memory.
+    """
+    with open(os.path.join(dirname, HEADER)) as fd:
+        header = json.load(fd)
+    if header.get('format') != FORMAT or \
+            header.get('format_version', 0) > FORMAT_VERSION:
+        raise ValueError('loadcase_bin: %s is not a binary case of a '
+                         'supported version' % dirname)
+
+    def array(fname):
+        fname = os.path.join(dirname, fname)
+        try:
+            return load(fname, mmap_mode=mmap_mode, allow_pickle=False)
+        except ValueError:              ## empty arrays cannot be mapped
+            return load(fname, allow_pickle=False)
+
+    def decode(v):
+        if isinstance(v, dict):
+            if '__array__' in v:
+                return array(v['__array__'])
+            elif '__sparse__' in v:
+                return csr_matrix(tuple(array(f) for f in v['__sparse__']),
+                                  shape=tuple(v['shape']))
+            elif '__function__' in v:
+                module, name = v['__function__'].split(':')
+                return getattr(import_module(module), name)
+            return dict((k, decode(x)) for k, x in v.items())
+        elif isinstance(v, list):
+            return [decode(x) for x in v]
+        return v
+
+    return decode(header['case'])
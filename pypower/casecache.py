@@ -0,0 +1,165 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Cache of parsed case files for L{loadcase}.
+"""
+
+import os
+
+from sys import stderr
+from copy import deepcopy
+from hashlib import sha1
+from shutil import rmtree
+from collections import OrderedDict
+
+from pypower.casebin import savecase_bin, loadcase_bin
+
+
+class casecache(object):
+    """Cache of parsed case files for L{loadcase}.
+
+    Keeps the cases read from files by L{loadcase}, after conversion to
+    version 2, so that loading the same file again does not parse or run
+    it again. Cases are keyed by the absolute path, the modification time
+    and a SHA-1 hash of the contents of the file, so that a changed file
+    is always read again, even if its modification time is unchanged.
+
+    Up to C{maxsize} cases are kept in memory and, if C{cachedir} is
+    given, each case is also saved to that directory in the binary format
+    of L{savecase_bin}, from which it is loaded memory mapped by later
+    processes. The least recently used cases are removed when there are
+    more than C{maxsize} in memory, or when the cases in C{cachedir} take
+    more than C{maxbytes} bytes.
+
+    The cache is used by L{loadcase} once set with L{set_casecache}::
+        set_casecache(casecache(cachedir='/tmp/pypower-cache'))
+        results, success = runpf('case_big')    ## parses case_big.py
+        results, success = runpf('case_big')    ## from the cache
+
+    C{hits} and C{misses} count the cases found or not in the cache.
+
+    @see: L{loadcase}, L{savecase_bin}
+    """
+
+    def __init__(self, maxsize=16, cachedir=None, maxbytes=2**30):
+        self.maxsize = maxsize
+        self.cachedir = cachedir
+        self.maxbytes = maxbytes
+        self.cases = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cachedir is not None and not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+
+    def key(self, fname):
+        """Returns the key of a case file, from its path, modification time
+        and contents.
+        """
+        h = sha1()
+        with open(fname, 'rb') as fd:
+            for block in iter(lambda: fd.read(1 << 20), b''):
+                h.update(block)
+        s = '%s\0%r\0%s' % (os.path.abspath(fname),
+                            os.stat(fname).st_mtime, h.hexdigest())
+        return sha1(s.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Returns a copy of the cached case of C{key}, or C{None}.
+        """
+        if key in self.cases:
+            self.cases[key] = ppc = self.cases.pop(key)     ## most recent
+            self.hits += 1
+            return deepcopy(ppc)
+
+        path = self._path(key)
+        if path is not None and os.path.isdir(path):
+            try:
+                ppc = loadcase_bin(path)
+                os.utime(path, None)                ## most recent
+            except Exception as e:
+                stderr.write('casecache: %s not loaded, %s\n' % (path, e))
+            else:
+                self._remember(key, ppc)
+                self.hits += 1
+                return deepcopy(ppc)
+
+        self.misses += 1
+        return None
+
+    def put(self, key, ppc):
+        """Adds a copy of case C{ppc} to the cache with C{key}.
+        """
+        self._remember(key, deepcopy(ppc))
+
+        path = self._path(key)
+        if path is not None:
+            try:
+                savecase_bin(path, ppc)
+            except (IOError, OSError) as e:
+                stderr.write('casecache: %s not saved, %s\n' % (path, e))
+            self._evict(path)
+
+    def clear(self):
+        """Removes all cases from the cache, in memory and on disk.
+        """
+        self.cases.clear()
+        for path, _, _ in self._entries():
+            rmtree(path, ignore_errors=True)
+
+    def _remember(self, key, ppc):
+        self.cases[key] = ppc
+        while len(self.cases) > self.maxsize:
+            self.cases.popitem(last=False)          ## least recently used
+
+    def _path(self, key):
+        if self.cachedir is None:
+            return None
+        return os.path.join(self.cachedir, key + '.ppc')
+
+    def _entries(self):
+        ## path, last use and size of the cases in cachedir
+        if self.cachedir is None:
+            return []
+        entries = []
+        for name in os.listdir(self.cachedir):
+            path = os.path.join(self.cachedir, name)
+            if not name.endswith('.ppc') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f))
+                           for f in os.listdir(path))
+                entries.append((path, os.path.getmtime(path), size))
+            except OSError:                 ## removed by another process
+                pass
+        return entries
+
+    def _evict(self, keep):
+        ## removes the least recently used cases from cachedir, except keep
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(e[2] for e in entries)
+        for path, _, size in entries:
+            if total <= self.maxbytes:
+                break
+            if path != keep:
+                rmtree(path, ignore_errors=True)
+                total -= size
+
+
+## the cache used by loadcase
+_casecache = [None]
+
+
+def set_casecache(cache):
+    """Sets the L{casecache} used by L{loadcase}, or C{None} for none.
+
+    Returns the previous one.
+    """
+    old, _casecache[0] = _casecache[0], cache
+    return old
+
+
+def get_casecache():
+    """Returns the L{casecache} used by L{loadcase}, or C{None}.
+    """
+    return _casecache[0]
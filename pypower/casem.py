@@ -0,0 +1,102 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Loads a MATPOWER case file.
+"""
+
+import re
+
+from warnings import catch_warnings, simplefilter
+
+from numpy import fromstring, zeros
+
+
+## comments, line continuations and the output name of the case function
+_COMMENT = re.compile(r'%[^\n]*')
+_CONTINUATION = re.compile(r'\.\.\.[^\n]*\n')
+_FUNCTION = re.compile(r'^\s*function\s+(\w+)\s*=', re.M)
+
+## assignments of a matrix, cell array, string or scalar
+_ASSIGN = re.compile(r"^\s*([A-Za-z]\w*(?:\.[A-Za-z]\w*)*)\s*=\s*"
+                     r"(\[[^\]]*\]|\{[^}]*\}|'[^']*'|[^;\n]+)", re.M)
+_ROW = re.compile(r'[^;\n]*[^;\s]')
+_STRING = re.compile(r"'([^']*)'")
+
+
+def loadcase_m(fname):
+    """Loads a MATPOWER case file.
+
+    Reads a MATPOWER case file C{fname} (with extension C{.m}), in either
+    the version 2 format (a function returning a struct, e.g. C{mpc}, with
+    fields C{mpc.bus}, C{mpc.gen}, ...) or the version 1 format (a function
+    returning C{baseMVA}, C{bus}, C{gen}, ...), and returns a dict with the
+    matrices as 2-D float arrays, numbers as floats and strings as strings.
+    Nested struct fields, e.g. C{mpc.reserves.cost}, are nested dicts and
+    cell arrays of strings, e.g. C{mpc.bus_name}, lists of strings.
+
+    The file is not run as MATLAB code: only assignments of constants are
+    read and other statements are ignored. Each matrix is converted by a
+    single call to C{numpy.fromstring} on the text of its block, with the
+    number of columns taken from its first row, so that cases with tens of
+    thousands of buses load in a fraction of a second.
+
+    Raises C{ValueError} if a matrix has non numeric entries or rows of
+    different lengths.
+
+    @see: L{loadcase}
+    """
+    with open(fname) as fd:
+        text = fd.read()
+
+    text = _CONTINUATION.sub(' ', _COMMENT.sub('', text))
+    m = _FUNCTION.search(text)
+    prefix = m.group(1) + '.' if m else ''
+
+    s = {}
+    for name, value in _ASSIGN.findall(text):
+        if prefix and name.startswith(prefix):
+            name = name[len(prefix):]
+        value = value.strip()
+        if value.startswith('['):
+            value = _matrix(name, value[1:-1])
+        elif value.startswith('{'):
+            value = _STRING.findall(value)
+        elif value.startswith("'"):
+            value = value[1:-1]
+        else:
+            try:
+                value = float(value)
+            except ValueError:          ## an expression, not a constant
+                continue
+
+        ## nested struct fields
+        d = s
+        keys = name.split('.')
+        for k in keys[:-1]:
+            d = d.setdefault(k, {})
+        d[keys[-1]] = value
+
+    return s
+
+
+def _matrix(name, text):
+    ## converts the text between the brackets of a matrix to a 2-D array
+    text = text.replace(',', ' ')
+    rows = [len(row.split()) for row in _ROW.findall(text)]
+    if not rows:
+        return zeros((0, 0))
+    ncols = rows[0]
+    if any(n != ncols for n in rows):
+        raise ValueError('loadcase_m: rows of different lengths in matrix %s'
+                         % name)
+
+    text = text.replace(';', ' ')
+    with catch_warnings():              ## stops at non numeric entries
+        simplefilter('ignore', DeprecationWarning)
+        a = fromstring(text, sep=' ')
+    n = len(text.split())
+    if a.size != n:
+        raise ValueError('loadcase_m: invalid matrix %s' % name)
+
+    return a.reshape((n // ncols, ncols))
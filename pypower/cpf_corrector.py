@@ -0,0 +1,110 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Solves the corrector step of the continuation power flow.
+"""
+
+import sys
+
+from numpy import angle, exp, conj, r_, linalg, Inf
+
+from scipy.sparse.linalg import spsolve
+
+from pypower.cpf_p import cpf_p
+from pypower.cpf_p_jac import cpf_p_jac
+from pypower.ppoption import ppoption
+
+
+def cpf_corrector(jac, Sbusb, V0, ref, pv, pq, lam0, Sxfr, Vprv, lamprv, z,
+                  step, parameterization, ppopt=None):
+    """Solves the corrector step of the continuation power flow.
+
+    Solves the power flow equations, with the bus injections
+    C{Sbusb + lam * Sxfr}, augmented with the parameterization function
+    L{cpf_p}, for the voltages and C{lam}, by Newton's method starting
+    from the predicted point C{(V0, lam0)}. C{jac} is the L{jac_builder}
+    of the power flow Jacobian, C{(Vprv, lamprv)} the previous solution,
+    C{z} the tangent and C{step} the step size used by the predictor. The
+    termination tolerance and maximum number of iterations are taken
+    from C{ppopt}, as for L{newtonpf}. Returns the final complex voltages,
+    a flag which indicates whether it converged or not, the number of
+    iterations performed and the final C{lam}.
+
+    @see: L{cpf_predictor}, L{runcpf}
+    """
+    ## default arguments
+    if ppopt is None:
+        ppopt = ppoption()
+
+    ## options
+    tol     = ppopt['PF_TOL']
+    max_it  = ppopt['PF_MAX_IT']
+    verbose = ppopt['VERBOSE']
+
+    ## initialize
+    converged = 0
+    i = 0
+    V = V0
+    Va = angle(V)
+    Vm = abs(V)
+    lam = lam0
+    Ybus = jac.Ybus
+
+    ## set up indexing for updating V
+    pvpq = r_[pv, pq]
+    npvpq = len(pvpq)
+    nj = npvpq + len(pq)
+    dF_dlam = -r_[Sxfr[pvpq].real, Sxfr[pq].imag]
+
+    ## evaluate F(x0, lam0), including the parameterization function
+    mis = V * conj(Ybus * V) - Sbusb - lam * Sxfr
+    F = r_[  mis[pvpq].real,
+             mis[pq].imag,
+             cpf_p(parameterization, step, z, V, lam, Vprv, lamprv, pv, pq)  ]
+
+    ## check tolerance
+    normF = linalg.norm(F, Inf)
+    if verbose > 1:
+        sys.stdout.write('\n it    max P & Q mismatch (p.u.)')
+        sys.stdout.write('\n----  ---------------------------')
+        sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+    if normF < tol:
+        converged = 1
+
+    ## do Newton iterations
+    while (not converged and i < max_it):
+        ## update iteration counter
+        i = i + 1
+
+        ## evaluate augmented Jacobian
+        dP_dV, dP_dlam = cpf_p_jac(parameterization, z, V, lam, Vprv, lamprv,
+                                   pv, pq)
+        J = jac.bordered(V, dF_dlam, dP_dV, dP_dlam)
+
+        ## compute update step
+        dx = -1 * spsolve(J, F)
+
+        ## update voltage and lambda
+        Va[pvpq] = Va[pvpq] + dx[:npvpq]
+        Vm[pq] = Vm[pq] + dx[npvpq:nj]
+        lam = lam + dx[nj]
+        V = Vm * exp(1j * Va)
+        Vm = abs(V)            ## update Vm and Va again in case
+        Va = angle(V)          ## we wrapped around with a negative Vm
+
+        ## evalute F(x, lam)
+        mis = V * conj(Ybus * V) - Sbusb - lam * Sxfr
+        F = r_[  mis[pvpq].real,
+                 mis[pq].imag,
+                 cpf_p(parameterization, step, z, V, lam, Vprv, lamprv,
+                       pv, pq)  ]
+
+        ## check for convergence
+        normF = linalg.norm(F, Inf)
+        if verbose > 1:
+            sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+        if normF < tol:
+            converged = 1
+
+    return V, converged, i, lam
@@ -0,0 +1,40 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Computes the value of the continuation power flow parameterization.
+"""
+
+from numpy import angle, r_, dot
+
+
+def cpf_p(parameterization, step, z, V, lam, Vprv, lamprv, pv, pq):
+    """Computes the value of the continuation power flow parameterization.
+
+    Returns the value of the parameterization function C{P} which is
+    appended to the power flow equations for the corrector, at the point
+    C{(V, lam)}, given the previous solution C{(Vprv, lamprv)}, the
+    normalized tangent C{z} at that solution (over C{Va[pvpq]}, C{Vm[pq]}
+    and C{lam}) and the continuation C{step}.
+        1. natural: C{lam - lamprv - step}
+        2. arc length: C{|x - xprv|^2 - step^2}
+        3. pseudo arc length: C{z . (x - xprv) - step}
+
+    where C{x = [Va[pvpq], Vm[pq], lam]}.
+
+    @see: L{cpf_p_jac}, L{runcpf}
+    """
+    if parameterization == 1:
+        return lam - lamprv - step
+
+    pvpq = r_[pv, pq]
+    d = r_[angle(V[pvpq]) - angle(Vprv[pvpq]), abs(V[pq]) - abs(Vprv[pq]),
+           lam - lamprv]
+
+    if parameterization == 2:
+        return dot(d, d) - step**2
+    elif parameterization == 3:
+        return dot(z, d) - step
+    else:
+        raise ValueError('cpf_p: unknown parameterization %d' %
+                         parameterization)
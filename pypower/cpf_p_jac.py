@@ -0,0 +1,36 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Computes partial derivatives of the CPF parameterization function.
+"""
+
+from numpy import angle, zeros, r_
+
+
+def cpf_p_jac(parameterization, z, V, lam, Vprv, lamprv, pv, pq):
+    """Computes partial derivatives of the CPF parameterization function.
+
+    Returns the derivatives of the parameterization function L{cpf_p}
+    with respect to C{[Va[pvpq], Vm[pq]]} (a vector) and to C{lam}, which
+    are the last row of the augmented Jacobian of the continuation power
+    flow. For the arc length parameterization at its first step, where
+    the two points coincide, the natural parameterization is used.
+
+    @see: L{cpf_p}, L{runcpf}
+    """
+    pvpq = r_[pv, pq]
+    nj = len(pvpq) + len(pq)
+
+    if parameterization == 1:
+        return zeros(nj), 1.0
+    elif parameterization == 2:
+        if lam == lamprv:
+            return zeros(nj), 1.0
+        d = r_[angle(V[pvpq]) - angle(Vprv[pvpq]), abs(V[pq]) - abs(Vprv[pq])]
+        return 2 * d, 2 * (lam - lamprv)
+    elif parameterization == 3:
+        return z[:nj], z[nj]
+    else:
+        raise ValueError('cpf_p_jac: unknown parameterization %d' %
+                         parameterization)
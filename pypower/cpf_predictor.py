@@ -0,0 +1,54 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Computes the tangent predictor of the continuation power flow.
+"""
+
+from numpy import angle, exp, zeros, r_, linalg
+
+from scipy.sparse.linalg import spsolve
+
+from pypower.cpf_p_jac import cpf_p_jac
+
+
+def cpf_predictor(V, lam, jac, Sxfr, pv, pq, step, z, Vprv, lamprv,
+                  parameterization):
+    """Computes the tangent predictor of the continuation power flow.
+
+    Computes the normalized tangent C{z} to the curve of solutions at the
+    current solution C{(V, lam)}, by solving the augmented Jacobian system
+    built from the power flow Jacobian (evaluated by the L{jac_builder}
+    C{jac}), the transfer direction C{Sxfr} (complex bus injections of
+    the target minus those of the base case, in p.u.) and the derivatives
+    of the parameterization function at the previous solution C{(Vprv,
+    lamprv)} with the previous tangent C{z}. Returns the predicted voltages
+    and C{lam} at a distance C{step} along the tangent, and the tangent.
+
+    @see: L{cpf_corrector}, L{runcpf}
+    """
+    pvpq = r_[pv, pq]
+    npvpq = len(pvpq)
+    nj = npvpq + len(pq)
+
+    ## augmented Jacobian
+    dF_dlam = -r_[Sxfr[pvpq].real, Sxfr[pq].imag]
+    dP_dV, dP_dlam = cpf_p_jac(parameterization, z, V, lam, Vprv, lamprv,
+                               pv, pq)
+    J = jac.bordered(V, dF_dlam, dP_dV, dP_dlam)
+
+    ## normalized tangent
+    s = zeros(nj + 1)
+    s[nj] = 1
+    z = spsolve(J, s)
+    z = z / linalg.norm(z)
+
+    ## prediction for next step
+    Va = angle(V)
+    Vm = abs(V)
+    Va[pvpq] = Va[pvpq] + step * z[:npvpq]
+    Vm[pq] = Vm[pq] + step * z[npvpq:nj]
+    lam0 = lam + step * z[nj]
+    V0 = Vm * exp(1j * Va)
+
+    return V0, lam0, z
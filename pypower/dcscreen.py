@@ -0,0 +1,140 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Screens branch outages for overloads on the DC model.
+"""
+
+from numpy import \
+    array, zeros, ones, arange, r_, c_, unique, searchsorted, nonzero
+from numpy import flatnonzero as find
+
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.lodf_model import lodf_model
+from pypower.makeBdc import makeBdc
+from pypower.makeSbus import makeSbus
+
+from pypower.idx_bus import GS
+from pypower.idx_brch import RATE_A
+
+
+def dcscreen(casedata, outages=None, pairs=None, rating=RATE_A, block=1000):
+    """Screens branch outages for overloads on the DC model.
+
+    Computes the DC power flow of the case C{casedata} (a case file name or
+    dict, see L{loadcase}) and the post-contingency flows of all branches
+    for the outage of each branch in C{outages} (rows of the C{branch}
+    matrix of the case as given, all in-service branches by default) and
+    of each pair of branches in the C{n x 2} array C{pairs}. Flows are
+    compared against the rating in column C{rating} of C{branch}
+    (C{RATE_A}, C{RATE_B} or C{RATE_C}), branches with a zero rating not
+    being monitored.
+
+    The line outage distribution factors are never formed as a dense
+    C{nl x nl} matrix. For C{block} outages (or pairs) at a time, the
+    columns of C{PTDF * Cft} for the outaged branches are obtained from an
+    L{lodf_model}, which caches up to C{block} of them, and the flows of
+    all branches after each of these outages as one matrix product, so
+    memory is C{O(nl * block)}. Double outages use the 2 x 2 system for the
+    compensating transfers across the two outaged branches.
+
+    Returns a dict of arrays with a row per violation: C{'outage'} and
+    C{'outage2'} (rows of the outaged branches, -1 in C{'outage2'} for a
+    single outage), C{'branch'} (row of the overloaded branch), C{'flow'}
+    (its post-contingency flow in MW) and C{'loading'} (in percent of its
+    rating), and C{'islanding'}, the C{n x 2} array of the outages (same
+    convention) which split the network and could not be screened.
+
+    Example::
+        res = dcscreen('case118', pairs=[[6, 8], [20, 21]], rating=RATE_B)
+
+    @see: L{lodf_model}, L{makeLODF}, L{runpf_n1}
+    """
+    ## read data and convert to internal indexing
+    ppc = ext2int(loadcase(casedata))
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    o = ppc["order"]
+    nb = bus.shape[0]
+    nl = branch.shape[0]
+    br_on = o["branch"]["status"]["on"]
+
+    ## outages, as internal indices
+    br_i = -ones(o["ext"]["branch"].shape[0], int)
+    br_i[br_on] = arange(nl)
+    if outages is None:
+        outages = br_on
+    outages = br_i[array(outages, int).reshape(-1)]
+    outages = outages[outages >= 0]         ## skip out-of-service ones
+    if pairs is None:
+        pairs = zeros((0, 2), int)
+    pairs = br_i[array(pairs, int).reshape(-1, 2)]
+    pairs = pairs[(pairs >= 0).all(1) & (pairs[:, 0] != pairs[:, 1])]
+
+    ## DC model, with factors of the reduced B matrix, and base case flows
+    lm = lodf_model(baseMVA, bus, branch, maxcols=block)
+    B, Bf, Pbusinj, Pfinj = makeBdc(baseMVA, bus, branch)
+    Pbus = makeSbus(baseMVA, bus, gen).real - Pbusinj - bus[:, GS] / baseMVA
+    Va = zeros(nb)
+    Va[lm.noslack] = lm.lu.solve(Pbus[lm.noslack])
+    f0 = Bf * Va + Pfinj
+
+    ## ratings
+    rate = branch[:, rating] / baseMVA
+    mon = find(rate > 0)
+
+    res = {k: [] for k in ['outage', 'outage2', 'branch', 'flow', 'loading']}
+    islanding = []
+
+    def check(F, k1, k2):
+        ## record the overloads of flows F, one column per outage
+        F[k1, arange(len(k1))] = 0
+        F[k2[k2 >= 0], find(k2 >= 0)] = 0
+        c, l = nonzero((abs(F[mon]) > rate[mon, None]).T)
+        res['outage'].append(k1[c])
+        res['outage2'].append(k2[c])
+        res['branch'].append(mon[l])
+        res['flow'].append(F[mon[l], c] * baseMVA)
+        res['loading'].append(100 * abs(F[mon[l], c]) / rate[mon[l]])
+
+    ## single outages
+    for i in range(0, len(outages), block):
+        ks = outages[i:i + block]
+        H = lm.transfer(ks)
+        d = 1 - H[ks, arange(len(ks))]
+        isl = abs(d) < 1e-5
+        islanding.append(c_[ks[isl], -ones(isl.sum(), int)])
+        ks, H, d = ks[~isl], H[:, ~isl], d[~isl]
+        check(f0[:, None] + H * (f0[ks] / d), ks, -ones(len(ks), int))
+
+    ## double outages
+    for i in range(0, len(pairs), block):
+        k, m = pairs[i:i + block].T
+        ks = unique(r_[k, m])
+        H = lm.transfer(ks)
+        a, b = searchsorted(ks, k), searchsorted(ks, m)
+
+        ## transfers tk, tm across the two branches which cancel their flows
+        ##   (1 - Hkk) tk - Hkm tm = f0k
+        ##   -Hmk tk + (1 - Hmm) tm = f0m
+        Hkk, Hkm, Hmk, Hmm = H[k, a], H[k, b], H[m, a], H[m, b]
+        det = (1 - Hkk) * (1 - Hmm) - Hkm * Hmk
+        isl = abs(det) < 1e-5
+        islanding.append(c_[k[isl], m[isl]])
+        ok = ~isl
+        k, m, a, b, det = k[ok], m[ok], a[ok], b[ok], det[ok]
+        Hkk, Hkm, Hmk, Hmm = Hkk[ok], Hkm[ok], Hmk[ok], Hmm[ok]
+        tk = ((1 - Hmm) * f0[k] + Hkm * f0[m]) / det
+        tm = (Hmk * f0[k] + (1 - Hkk) * f0[m]) / det
+        check(f0[:, None] + H[:, a] * tk + H[:, b] * tm, k, m)
+
+    ## back to external branch rows
+    for key in ['outage', 'outage2', 'branch']:
+        res[key] = r_[-1, br_on][r_[tuple([zeros(0, int)] + res[key])] + 1]
+    for key in ['flow', 'loading']:
+        res[key] = r_[tuple([zeros(0)] + res[key])]
+    islanding = r_[tuple([zeros((0, 2), int)] + islanding)]
+    res['islanding'] = r_[-1, br_on][islanding + 1]
+
+    return res
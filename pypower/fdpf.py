@@ -7,6 +7,8 @@
 
 import sys
 
+from time import time
+
 from numpy import array, angle, exp, linalg, conj, r_, Inf
 from scipy.sparse.linalg import splu
 
@@ -30,6 +32,15 @@ def fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt=None):
     final complex voltages, a flag which indicates whether it converged
     or not, and the number of iterations performed.
 
+    If the C{ITER_CALLBACK} option is set, it is called after each P and
+    each Q half iteration with a dict of the iteration number, its
+    C{'type'} (C{'P'} or C{'Q'}), the mismatch norms C{'normP'},
+    C{'normQ'} and C{'normF'} (the larger of the two), the norm of the
+    angle or magnitude update C{'step'}, the wall time of the half
+    iteration C{'time'} and of its solve with the factored B matrix
+    C{'solve_time'}, and the voltages C{'V'}. The iterations stop if it
+    returns a true value.
+
     @see: L{runpf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -41,6 +52,7 @@ def fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt=None):
     tol     = ppopt['PF_TOL']
     max_it  = ppopt['PF_MAX_IT_FD']
     verbose = ppopt['VERBOSE']
+    callback = ppopt['ITER_CALLBACK']
 
     ## initialize
     converged = 0
@@ -80,13 +92,24 @@ def fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt=None):
     Bp_solver = splu(Bp)
     Bpp_solver = splu(Bpp)
 
+    def stop(half, dx, t0, ts):
+        ## pass the progress of a half iteration to the callback
+        return callback is not None and \
+            callback({'solver': 'fdpf', 'iteration': i, 'type': half,
+                      'normP': normP, 'normQ': normQ,
+                      'normF': max(normP, normQ),
+                      'step': linalg.norm(dx, Inf) if len(dx) else 0.0,
+                      'time': time() - t0, 'solve_time': ts, 'V': V})
+
     ## do P and Q iterations
     while (not converged and i < max_it):
         ## update iteration counter
         i = i + 1
 
         ##-----  do P iteration, update Va  -----
+        t0 = time()
         dVa = -Bp_solver.solve(P)
+        ts = time() - t0
 
         ## update voltage
         Va[pvpq] = Va[pvpq] + dVa
@@ -103,15 +126,20 @@ def fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt=None):
         if verbose > 1:
             sys.stdout.write("\n  %s  %3d   %10.3e   %10.3e" %
                              (type,i, normP, normQ))
+        stopped = stop('P', dVa, t0, ts)
         if normP < tol and normQ < tol:
             converged = 1
             if verbose:
                 sys.stdout.write('\nFast-decoupled power flow converged in %d '
                     'P-iterations and %d Q-iterations.\n' % (i, i - 1))
             break
+        if stopped:
+            break
 
         ##-----  do Q iteration, update Vm  -----
+        t0 = time()
         dVm = -Bpp_solver.solve(Q)
+        ts = time() - t0
 
         ## update voltage
         Vm[pq] = Vm[pq] + dVm
@@ -127,12 +155,15 @@ def fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt=None):
         normQ = linalg.norm(Q, Inf)
         if verbose > 1:
             sys.stdout.write('\n  Q  %3d   %10.3e   %10.3e' % (i, normP, normQ))
+        stopped = stop('Q', dVm, t0, ts)
         if normP < tol and normQ < tol:
             converged = 1
             if verbose:
                 sys.stdout.write('\nFast-decoupled power flow converged in %d '
                     'P-iterations and %d Q-iterations.\n' % (i, i))
             break
+        if stopped:
+            break
 
     if verbose:
         if not converged:
@@ -0,0 +1,43 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Finds the islands of a network.
+"""
+
+from numpy import ones, argsort, cumsum, bincount, split
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+from scipy.sparse.csgraph import connected_components
+
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+
+
+def find_islands(bus, branch):
+    """Finds the islands of a network.
+
+    Returns a list of arrays of the bus indices of each island, i.e. each
+    set of buses connected to each other by in-service branches, in order
+    of their lowest bus index. Expects C{bus} and C{branch} to use internal
+    consecutive bus numbering, as after L{ext2int}. Buses without any
+    in-service branch form single bus islands.
+
+    Example::
+        groups = find_islands(ppc['bus'], ppc['branch'])
+
+    @see: L{runpf}
+    """
+    nb = bus.shape[0]
+    on = find(branch[:, BR_STATUS] > 0)
+    f = branch[on, F_BUS].astype(int)
+    t = branch[on, T_BUS].astype(int)
+    A = sparse((ones(len(on)), (f, t)), (nb, nb))
+
+    _, labels = connected_components(A, directed=False)
+
+    ## buses grouped by island, the labels being in order of lowest bus
+    order = argsort(labels, kind='mergesort')
+    counts = bincount(labels)
+
+    return split(order, cumsum(counts)[:-1])
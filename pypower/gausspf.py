@@ -7,7 +7,9 @@
 
 import sys
 
-from numpy import linalg, conj, r_, Inf, asscalar
+from time import time
+
+from numpy import array, linalg, conj, r_, Inf
 
 from pypower.ppoption import ppoption
 
@@ -29,6 +31,18 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     a flag which indicates whether it converged or not, and the number
     of iterations performed.
 
+    The sweeps walk the C{indptr}, C{indices} and C{data} arrays of C{Ybus}
+    in CSR form directly, using the precomputed inverse of its diagonal.
+    With C{PF_GS_JACOBI} set, Jacobi iterations are done instead, where
+    all PQ and then all PV buses are updated at once from the previous
+    voltages. They are fully vectorized but need more iterations.
+
+    If the C{ITER_CALLBACK} option is set, it is called after each
+    iteration with a dict of the iteration number, the mismatch norm
+    C{'normF'}, the largest voltage change C{'step'}, the wall time of the
+    iteration C{'time'} and the voltages C{'V'}. The iterations stop if it
+    returns a true value.
+
     @see: L{runpf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -42,17 +56,31 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     tol     = ppopt['PF_TOL']
     max_it  = ppopt['PF_MAX_IT_GS']
     verbose = ppopt['VERBOSE']
+    callback = ppopt['ITER_CALLBACK']
+    jacobi  = ppopt['PF_GS_JACOBI']
 
     ## initialize
     converged = 0
     i = 0
     V = V0.copy()
+    Sbus = Sbus.copy()          ## Q at PV buses is updated at each sweep
     #Va = angle(V)
     Vm = abs(V)
 
+    ## Ybus in CSR form, and inverse of its diagonal
+    Y = Ybus.tocsr()
+    dinv = 1 / Y.diagonal()
+    if jacobi:
+        Ypq, Ypv = Y[pq], Y[pv]
+    else:
+        ## the sweeps work on lists, scalar access to arrays is much slower
+        indptr, indices, data = \
+            Y.indptr.tolist(), Y.indices.tolist(), Y.data.tolist()
+        dinv = dinv.tolist()
+        pql, pvl = pq.tolist(), pv.tolist()
+
     ## set up indexing for updating V
     npv = len(pv)
-    npq = len(pq)
     pvpq = r_[pv, pq]
 
     ## evaluate F(x0)
@@ -75,22 +103,43 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     while (not converged and i < max_it):
         ## update iteration counter
         i = i + 1
+        if callback is not None:
+            t0 = time()
+            V1 = V.copy()
 
         ## update voltage
-        ## at PQ buses
-        for k in pq[list(range(npq))]:
-            tmp = (conj(Sbus[k] / V[k]) - Ybus[k, :] * V) / Ybus[k, k]
-            V[k] = V[k] + asscalar(tmp)
-
-        ## at PV buses
-        if npv:
-            for k in pv[list(range(npv))]:
-                tmp = (V[k] * conj(Ybus[k,:] * V)).imag
-                Sbus[k] = Sbus[k].real + 1j * asscalar(tmp)
-                tmp = (conj(Sbus[k] / V[k]) - Ybus[k, :] * V) / Ybus[k, k]
-                V[k] = V[k] + asscalar(tmp)
-#               V[k] = Vm[k] * V[k] / abs(V[k])
-            V[pv] = Vm[pv] * V[pv] / abs(V[pv])
+        if jacobi:
+            ## at PQ buses
+            V[pq] = V[pq] + (conj(Sbus[pq] / V[pq]) - Ypq * V) * dinv[pq]
+
+            ## at PV buses
+            if npv:
+                Sbus[pv] = Sbus[pv].real + 1j * (V[pv] * conj(Ypv * V)).imag
+                V[pv] = V[pv] + (conj(Sbus[pv] / V[pv]) - Ypv * V) * dinv[pv]
+                V[pv] = Vm[pv] * V[pv] / abs(V[pv])
+        else:
+            Vl = V.tolist()
+            Sl = Sbus.tolist()
+
+            ## at PQ buses
+            for k in pql:
+                I = 0j
+                for p in range(indptr[k], indptr[k + 1]):
+                    I += data[p] * Vl[indices[p]]
+                Vl[k] += ((Sl[k] / Vl[k]).conjugate() - I) * dinv[k]
+
+            ## at PV buses
+            for k in pvl:
+                I = 0j
+                for p in range(indptr[k], indptr[k + 1]):
+                    I += data[p] * Vl[indices[p]]
+                Sl[k] = Sl[k].real + 1j * (Vl[k] * I.conjugate()).imag
+                Vl[k] += ((Sl[k] / Vl[k]).conjugate() - I) * dinv[k]
+
+            V = array(Vl)
+            Sbus = array(Sl)
+            if npv:
+                V[pv] = Vm[pv] * V[pv] / abs(V[pv])
 
         ## evalute F(x)
         mis = V * conj(Ybus * V) - Sbus
@@ -108,6 +157,12 @@ def gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
                 sys.stdout.write('\nGauss-Seidel power flow converged in '
                                  '%d iterations.\n' % i)
 
+        if callback is not None and \
+                callback({'solver': 'gausspf', 'iteration': i, 'normF': normF,
+                          'step': abs(V - V1).max(), 'time': time() - t0,
+                          'V': V}):
+            break
+
     if verbose:
         if not converged:
             sys.stdout.write('Gauss-Seidel power did not converge in %d '
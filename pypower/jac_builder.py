@@ -0,0 +1,142 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Builds the Newton power flow Jacobian with a cached sparsity pattern.
+"""
+
+from numpy import \
+    arange, ones, zeros, r_, conj, repeat, diff, unique, bincount, cumsum
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix
+
+
+class jac_builder(object):
+    """Builds the Newton power flow Jacobian with a cached sparsity pattern.
+
+    The power flow Jacobian::
+
+        J = | dP/dVa[pvpq, pvpq]   dP/dVm[pvpq, pq] |
+            | dQ/dVa[pq,   pvpq]   dQ/dVm[pq,   pq] |
+
+    has a structure which depends only on the sparsity pattern of C{Ybus}
+    and on the lists of PV and PQ buses. The constructor computes the
+    structure of C{J} once, along with maps from the non-zeros of C{Ybus}
+    into the non-zeros of C{J}. Each call to L{build} then evaluates the
+    partial derivatives of L{dSbus_dV} only at the non-zeros of C{Ybus}
+    and refills the C{data} array of the same CSR matrix, with no fancy
+    indexing or stacking of sub-matrices.
+
+    C{Ybus} is kept as a CSR matrix in C{jac.Ybus} (not copied if it
+    already is one). Its values, but not its sparsity pattern, may be
+    changed in place between calls to L{build}. The
+    returned matrix is overwritten by the next call to L{build}, copy it
+    if it has to be kept.
+
+    L{bordered} likewise refills the Jacobian bordered by an extra row and
+    column, as used by the continuation power flow.
+
+    Example::
+        jac = jac_builder(Ybus, pv, pq)
+        J = jac.build(V)
+
+    @see: L{newtonpf}, L{dSbus_dV}
+    """
+
+    def __init__(self, Ybus, pv, pq):
+        Ybus = Ybus.tocsr()
+        if not Ybus.has_canonical_format:
+            Ybus.sum_duplicates()
+        self.Ybus = Ybus
+        self.pv = pv
+        self.pq = pq
+
+        nb = Ybus.shape[0]
+        npvpq = len(pv) + len(pq)
+        npq = len(pq)
+        nj = npvpq + npq
+
+        ## row and column of each non-zero of Ybus, followed by the diagonal
+        self.row = repeat(arange(nb), diff(Ybus.indptr))
+        self.col = Ybus.indices
+        nr = len(self.row) + nb
+        br = r_[self.row, arange(nb)]
+        bc = r_[self.col, arange(nb)]
+
+        ## row/column of J for angle (P) and magnitude (Q) of each bus
+        ia = -ones(nb, int)
+        ia[r_[pv, pq].astype(int)] = arange(npvpq)
+        im = -ones(nb, int)
+        im[pq.astype(int)] = npvpq + arange(npq)
+
+        ## contributions to each of the 4 blocks of J, as indices into the
+        ## stacked values [dVa.real, dVm.real, dVa.imag, dVm.imag]
+        k11 = find((ia[br] >= 0) & (ia[bc] >= 0))
+        k12 = find((ia[br] >= 0) & (im[bc] >= 0))
+        k21 = find((im[br] >= 0) & (ia[bc] >= 0))
+        k22 = find((im[br] >= 0) & (im[bc] >= 0))
+        self.src = r_[k11, nr + k12, 2 * nr + k21, 3 * nr + k22]
+        jr = r_[ia[br[k11]], ia[br[k12]], im[br[k21]], im[br[k22]]]
+        jc = r_[ia[bc[k11]], im[bc[k12]], ia[bc[k21]], im[bc[k22]]]
+
+        ## CSR structure of J and position of each contribution in J.data
+        keys, self.pos = unique(jr * nj + jc, return_inverse=True)
+        self.nnz = len(keys)
+        indptr = r_[0, cumsum(bincount(keys // nj, minlength=nj))]
+        self.J = csr_matrix((zeros(self.nnz), keys % nj, indptr), (nj, nj))
+        self.A = None
+
+    def build(self, V):
+        """Returns the Jacobian evaluated at the complex bus voltages C{V}.
+        """
+        Ybus, row, col = self.Ybus, self.row, self.col
+        Vm = abs(V)
+
+        ## off-diagonal terms at the non-zeros of Ybus ...
+        t = V[row] * conj(Ybus.data * V[col])
+        ## ... and diagonal terms from the bus power injections
+        S = V * conj(Ybus * V)
+
+        dVa = r_[-1j * t, 1j * S]
+        dVm = r_[t / Vm[col], S / Vm]
+        vals = r_[dVa.real, dVm.real, dVa.imag, dVm.imag][self.src]
+
+        self.J.data[:] = bincount(self.pos, vals, minlength=self.nnz)
+
+        return self.J
+
+    def bordered(self, V, b, c, d):
+        """Returns the Jacobian at C{V} bordered by a column, a row and a
+        corner element::
+
+            A = | J  b |
+                | c  d |
+
+        The last column is stored in full, the last row in full, and the
+        matrix is filled in place, as the Jacobian by L{build}.
+        """
+        J = self.build(V)
+        nj = J.shape[0]
+        if self.A is None:
+            ## row i of J followed by its element in the last column
+            nnz = self.nnz
+            rows = repeat(arange(nj), diff(J.indptr))
+            self.apos = arange(nnz) + rows
+            self.bpos = J.indptr[1:] + arange(nj)
+            self.cpos = arange(nnz + nj, nnz + 2 * nj + 1)
+            indices = zeros(nnz + 2 * nj + 1, int)
+            indices[self.apos] = J.indices
+            indices[self.bpos] = nj
+            indices[self.cpos] = arange(nj + 1)
+            indptr = r_[J.indptr + arange(nj + 1), nnz + 2 * nj + 1]
+            self.A = csr_matrix((zeros(len(indices)), indices, indptr),
+                                (nj + 1, nj + 1))
+
+        A = self.A
+        A.data[self.apos] = J.data
+        A.data[self.bpos] = b
+        A.data[self.cpos[:-1]] = c
+        A.data[self.cpos[-1]] = d
+
+        return A
@@ -16,6 +16,10 @@ from numpy import array, zeros, ones, c_
 from scipy.io import loadmat
 
 from pypower._compat import PY2
+from pypower.casebin import loadcase_bin
+from pypower.casem import loadcase_m
+from pypower.psse2ppc import psse2ppc
+from pypower.casecache import get_casecache
 from pypower.idx_gen import PMIN, MU_PMAX, MU_PMIN, MU_QMAX, MU_QMIN, APF
 from pypower.idx_brch import PF, QF, PT, QT, MU_SF, MU_ST, BR_STATUS
 
@@ -31,11 +35,12 @@ def loadcase(casefile,
 
     Here C{casefile} is either a dict containing the keys C{baseMVA}, C{bus},
     C{gen}, C{branch}, C{areas}, C{gencost}, or a string containing the name
-    of the file. If C{casefile} contains the extension '.mat' or '.py', then
-    the explicit file is searched. If C{casefile} containts no extension, then
-    L{loadcase} looks for a '.mat' file first, then for a '.py' file.  If the
-    file does not exist or doesn't define all matrices, the function returns
-    an exit code as follows:
+    of the file. If C{casefile} contains the extension '.mat', '.py', '.ppc',
+    '.m' or '.raw', then the explicit file is searched. If C{casefile}
+    containts no extension, then L{loadcase} looks for a '.mat' file first,
+    then for a '.py' file, then for a '.ppc' directory, then for a '.m' file,
+    then for a '.raw' file.  If the file does not exist or doesn't define all
+    matrices, the function returns an exit code as follows:
 
         0.  all variables successfully defined
         1.  input argument is not a string or dict
@@ -44,11 +49,27 @@ def loadcase(casefile,
         4.  specified .py file does not exist
         5.  specified file fails to define all matrices or contains syntax
             error
+        6.  specified .ppc directory does not exist
+        7.  specified .m file does not exist
+        8.  specified .raw file does not exist
 
     If the input data is not a dict containing a 'version' key, it is
     assumed to be a PYPOWER case file in version 1 format, and will be
     converted to version 2 format.
 
+    A '.ppc' directory is a case saved in binary format by L{savecase} (see
+    L{savecase_bin}). Its arrays are memory mapped copy-on-write rather than
+    read, so that loading even a very large case takes about the same time,
+    and the data is only read from disk as it is used.
+
+    A '.m' file is a MATPOWER case file, which is read by L{loadcase_m}
+    without MATLAB, and a '.raw' file a PSS/E RAW file, which is converted
+    by L{psse2ppc}.
+
+    Cases read from files other than '.ppc' directories are kept in the
+    L{casecache} set with L{set_casecache}, if any, and later loaded from
+    it while the file is unchanged.
+
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     @author: Ray Zimmerman (PSERC Cornell)
@@ -62,7 +83,7 @@ def loadcase(casefile,
     # read data into case object
     if isinstance(casefile, basestring):
         # check for explicit extension
-        if casefile.endswith(('.py', '.mat')):
+        if casefile.endswith(('.py', '.mat', '.ppc', '.m', '.raw')):
             rootname, extension = splitext(casefile)
             fname = basename(rootname)
         else:
@@ -72,14 +93,30 @@ def loadcase(casefile,
                 extension = '.mat'
             elif exists(casefile + '.py'):
                 extension = '.py'
+            elif exists(casefile + '.ppc'):
+                extension = '.ppc'
+            elif exists(casefile + '.m'):
+                extension = '.m'
+            elif exists(casefile + '.raw'):
+                extension = '.raw'
             else:
                 info = 2
             fname = basename(rootname)
 
         lasterr = ''
 
+        ## look for the parsed case in the cache, if one is set
+        cache, key, s = get_casecache(), None, None
+        if info == 0 and cache is not None and extension != '.ppc':
+            try:
+                key = cache.key(rootname + extension)
+                s = cache.get(key)
+                cached = s is not None
+            except (IOError, OSError):
+                key = None
+
         ## attempt to read file
-        if info == 0:
+        if info == 0 and s is None:
             if extension == '.mat':       ## from MAT file
                 try:
                     d = loadmat(rootname + extension, struct_as_record=True)
@@ -105,6 +142,33 @@ def loadcase(casefile,
                 except IOError as e:
                     info = 3
                     lasterr = str(e)
+            elif extension == '.ppc':     ## from binary case directory
+                if exists(rootname + extension):
+                    try:
+                        s = loadcase_bin(rootname + extension)
+                    except (IOError, ValueError, KeyError) as e:
+                        info = 5
+                        lasterr = err5 = str(e)
+                else:
+                    info = 6
+            elif extension == '.m':       ## from MATPOWER case file
+                try:
+                    s = loadcase_m(rootname + extension)
+                except IOError as e:
+                    info = 7
+                    lasterr = str(e)
+                except ValueError as e:
+                    info = 5
+                    lasterr = err5 = str(e)
+            elif extension == '.raw':     ## from PSS/E RAW file
+                try:
+                    s = psse2ppc(rootname + extension)
+                except IOError as e:
+                    info = 8
+                    lasterr = str(e)
+                except ValueError as e:
+                    info = 5
+                    lasterr = err5 = str(e)
             elif extension == '.py':      ## from Python file
                 try:
                     if PY2:
@@ -161,8 +225,10 @@ def loadcase(casefile,
 
     elif isinstance(casefile, dict):
         s = deepcopy(casefile)
+        key = None
     else:
         info = 1
+        key = None
 
     # check contents of dict
     if info == 0:
@@ -178,8 +244,8 @@ def loadcase(casefile,
             if hasattr(s, 'areas') and (len(s['areas']) == 0) and (not expect_areas):
                 del s['areas']
 
-            ## all fields present, copy to ppc
-            ppc = deepcopy(s)
+            ## all fields present, s is already a copy
+            ppc = s
             if not hasattr(ppc, 'version'):  ## hmm, struct with no 'version' field
                 if ppc['gen'].shape[1] < 21:    ## version 2 has 21 or 25 cols
                     ppc['version'] = '1'
@@ -192,6 +258,9 @@ def loadcase(casefile,
                 ppc['version'] = '2'
 
     if info == 0:  # no errors
+        if key is not None and not cached:
+            cache.put(key, ppc)
+
         if return_as_obj:
             return ppc
         else:
@@ -215,6 +284,12 @@ def loadcase(casefile,
         elif info == 5:
             sys.stderr.write('Syntax error or undefined data '
                              'matrix(ices) in the file\n')
+        elif info == 6:
+            sys.stderr.write('Specified binary case does not exist\n')
+        elif info == 7:
+            sys.stderr.write('Specified MATPOWER file does not exist\n')
+        elif info == 8:
+            sys.stderr.write('Specified PSS/E RAW file does not exist\n')
         else:
             sys.stderr.write('Unknown error encountered loading case.\n')
 
@@ -0,0 +1,40 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Loads the results of a time series power flow.
+"""
+
+import json
+
+from os.path import join
+
+from numpy import memmap, zeros
+
+
+def loadtspf(fname, mode='r'):
+    """Loads the results of a time series power flow.
+
+    Reads the directory C{fname} written by L{runtspf} and returns a dict
+    with the number of steps C{'nsteps'}, C{'baseMVA'}, the external bus
+    numbers C{'bus'} and, for each result column (C{'VM'}, C{'VA'},
+    C{'PF'}, C{'QF'}, C{'PT'}, C{'QT'}, C{'SUCCESS'} and C{'ITERATIONS'}),
+    an C{nsteps x n} (or C{nsteps}) array memory-mapped from its file with
+    the given C{mode}, so that only the parts which are accessed are read.
+
+    @see: L{runtspf}
+    """
+    with open(join(fname, 'header.json')) as fd:
+        header = json.load(fd)
+
+    nt = header['nsteps']
+    res = {'nsteps': nt, 'baseMVA': header['baseMVA'], 'bus': header['bus']}
+    for col in header['columns']:
+        shape = tuple([nt] + col['shape'])
+        if nt == 0:     ## empty files cannot be mapped
+            res[col['name']] = zeros(shape, col['dtype'])
+        else:
+            res[col['name']] = memmap(join(fname, col['name'] + '.bin'),
+                                      col['dtype'], mode, shape=shape)
+
+    return res
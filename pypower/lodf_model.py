@@ -0,0 +1,139 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Line outage distribution factors computed on demand.
+"""
+
+from collections import OrderedDict
+
+from numpy import \
+    array, zeros, ones, arange, r_, isscalar, dot, outer, nan, \
+    flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+from scipy.sparse.linalg import splu
+
+from pypower.makeBdc import makeBdc
+
+from pypower.idx_bus import BUS_TYPE, REF
+from pypower.idx_brch import F_BUS, T_BUS
+
+
+class lodf_model(object):
+    """Line outage distribution factors computed on demand.
+
+    Factors the C{B} matrix of the DC model of C{bus} and C{branch}
+    (internal consecutive bus numbering, as for L{makePTDF}) once, then
+    computes the columns of the line outage distribution factor matrix
+    returned by L{makeLODF} only for the outaged branches asked for, so
+    memory is O(nl) per outage instead of O(nl^2). The flows due to a
+    unit transfer across the terminals of each outaged branch, i.e.
+    C{PTDF * Cft} for that branch, are kept in an LRU cache of at most
+    C{maxcols} columns (available as C{lm.cache}).
+
+    The C{slack} (reference bus by default, a bus index or a vector of
+    weights, see L{makePTDF}) only matters for the PTDF rows used by
+    L{otdf}, LODFs do not depend on it.
+
+    Example::
+        lm = lodf_model(baseMVA, bus, branch)
+        L = lm.lodf([3, 7])             ## = makeLODF(branch, H)[:, [3, 7]]
+        O = lm.otdf(3, [0, 12])         ## flowgates 0 and 12, outage 3
+
+    @see: L{makeLODF}, L{makePTDF}, L{dcscreen}
+    """
+
+    def __init__(self, baseMVA, bus, branch, slack=None, maxcols=1000):
+        nb = bus.shape[0]
+        nl = branch.shape[0]
+        if slack is None:
+            slack = find(bus[:, BUS_TYPE] == REF)[0]
+        self.slack = slack
+        self.maxcols = maxcols
+        self.cache = OrderedDict()
+
+        ## factor B, reduced by the slack bus (bus 1 for distributed slack)
+        slack_bus = slack if isscalar(slack) else 0
+        self.noslack = find(arange(nb) != slack_bus)
+        B, self.Bf, _, _ = makeBdc(baseMVA, bus, branch)
+        self.lu = splu(B[self.noslack, :][:, self.noslack].tocsc())
+
+        ## branch-bus incidence matrix
+        f = branch[:, F_BUS].astype(int)
+        t = branch[:, T_BUS].astype(int)
+        self.Cft = sparse((r_[ones(nl), -ones(nl)],
+                           (r_[f, t], r_[arange(nl), arange(nl)])),
+                          (nb, nl)).tocsc()
+
+    def transfer(self, ks):
+        """Returns the flows due to unit transfers across branches C{ks}.
+
+        The C{nl x len(ks)} columns C{ks} of C{PTDF * Cft}, solving only
+        for those not in the cache.
+        """
+        ks = array(ks, int).reshape(-1)
+        new = [k for k in OrderedDict.fromkeys(ks) if k not in self.cache]
+        if new:
+            nb = self.Cft.shape[0]
+            X = zeros((nb, len(new)))
+            X[self.noslack] = \
+                self.lu.solve(self.Cft[self.noslack, :][:, new].toarray())
+            H = self.Bf * X
+            for i, k in enumerate(new):
+                self.cache[k] = H[:, i]
+
+        H = zeros((self.Bf.shape[0], len(ks)))
+        for i, k in enumerate(ks):
+            self.cache[k] = H[:, i] = self.cache.pop(k)     ## most recent
+        while len(self.cache) > self.maxcols:
+            self.cache.popitem(last=False)
+
+        return H
+
+    def lodf(self, ks, rows=None):
+        """Returns the LODF columns for the outage of branches C{ks}.
+
+        The change in flow in each branch, or in branches C{rows}, per unit
+        of pre-outage flow in each branch of C{ks}, with -1 for the outaged
+        branch itself, like the columns of L{makeLODF}. Outages which split
+        the network give columns of C{nan}.
+        """
+        ks = array(ks, int).reshape(-1)
+        H = self.transfer(ks)
+        d = 1 - H[ks, arange(len(ks))]
+        isl = abs(d) < 1e-5
+        d[isl] = 1
+        L = H / d
+        L[ks, arange(len(ks))] = -1
+        L[:, isl] = nan
+
+        return L if rows is None else L[array(rows, int).reshape(-1)]
+
+    def ptdf(self, rows):
+        """Returns the C{len(rows) x nb} rows C{rows} of the PTDF matrix.
+        """
+        rows = array(rows, int).reshape(-1)
+        nb = self.Cft.shape[0]
+        Z = zeros((len(rows), nb))
+        Z[:, self.noslack] = self.lu.solve(
+            self.Bf[rows, :][:, self.noslack].T.toarray(), trans='T').T
+        if not isscalar(self.slack):    ## distribute slack, rank-1 update
+            w = self.slack / sum(self.slack)
+            Z = Z - dot(Z, w)[:, None]
+
+        return Z
+
+    def otdf(self, k, rows, bus_idx=None):
+        """Returns outage transfer distribution factors for flowgates.
+
+        The sensitivities of the flows in branches C{rows} to injections at
+        each bus (or at buses C{bus_idx}) after the outage of branch C{k},
+        C{PTDF[rows] + LODF[rows, k] * PTDF[k]}, a C{len(rows) x nb}
+        matrix.
+        """
+        rows = array(rows, int).reshape(-1)
+        P = self.ptdf(r_[rows, k])
+        O = P[:-1] + outer(self.lodf(k, rows), P[-1])
+
+        return O if bus_idx is None else O[:, array(bus_idx, int)]
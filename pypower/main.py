@@ -10,17 +10,13 @@ from sys import stderr
 
 from optparse import OptionParser, OptionGroup, OptionValueError
 
-from pypower.api import \
-    ppver, ppoption, runpf, runopf, runuopf, runopf_w_res
-
-from pypower.api import \
-    case4gs, case6ww, case9, case9Q, case14, case24_ieee_rts, case30, \
-    case30Q, case30pwl, case39, case57, case118, case300, t_case30_userfcns
-
-from pypower.ppoption import \
+from pypower.ppver import ppver
+from pypower.ppoption import ppoption, \
     PF_OPTIONS, OPF_OPTIONS, OUTPUT_OPTIONS, PDIPM_OPTIONS
 
-from pypower.t.test_pypower import test_pf, test_opf
+## the solvers, cases and tests are imported when they are used, so that
+## e.g. --help does not have to import SciPy and the larger cases
+from pypower import api
 
 
 TYPE_MAP = {bool: 'choice', float: 'float', int: 'int'}
@@ -28,11 +24,13 @@ TYPE_MAP = {bool: 'choice', float: 'float', int: 'int'}
 AFFIRMATIVE = ('True', 'Yes', 'true', 'yes', '1', 'Y', 'y')
 NEGATIVE = ('False', 'No', 'false', 'no', '0', 'N', 'n')
 
-CASES = {'case4gs': case4gs, 'case6ww': case6ww, 'case9': case9,
-    'case9Q': case9Q, 'case14': case14, 'case24_ieee_rts': case24_ieee_rts,
-    'case30': case30, 'case30Q': case30Q, 'case30pwl': case30pwl,
-    'case39': case39, 'case57': case57, 'case118': case118, 'case300': case300,
-    'case30_userfcns': t_case30_userfcns}
+## function names of the built-in test cases, in pypower.api
+CASES = {'case4gs': 'case4gs', 'case6ww': 'case6ww', 'case9': 'case9',
+    'case9Q': 'case9Q', 'case14': 'case14',
+    'case24_ieee_rts': 'case24_ieee_rts', 'case30': 'case30',
+    'case30Q': 'case30Q', 'case30pwl': 'case30pwl', 'case39': 'case39',
+    'case57': 'case57', 'case118': 'case118', 'case300': 'case300',
+    'case30_userfcns': 't_case30_userfcns'}
 
 
 def option_callback(option, opt, value, parser, *args, **kw_args):
@@ -55,6 +53,8 @@ def option_callback(option, opt, value, parser, *args, **kw_args):
 
 def add_options(group, options, *callback_args, **callback_kwargs):
     for name, default_val, help in options:
+        if default_val is None:     ## function valued, e.g. ITER_CALLBACK
+            continue
         long_opt = '--%s' % name
 
         kw_args = {
@@ -152,7 +152,7 @@ heuristic""")
         casedata = args[0]
     else:
         try:
-            casedata = CASES[options.testcase]()
+            casedata = getattr(api, CASES[options.testcase])()
         except KeyError:
             stderr.write("Invalid case choice: %r (choose from %s)\n" % \
                 (options.testcase, list(CASES.keys())))
@@ -170,8 +170,9 @@ def pf(args=sys.argv[1:]):
     options, casedata, ppopt, fname, solvedcase = \
             parse_options(args, usage)
     if options.test:
+        from pypower.t.test_pypower import test_pf
         sys.exit(test_pf())
-    _, success = runpf(casedata, ppopt, fname, solvedcase)
+    _, success = api.runpf(casedata, ppopt, fname, solvedcase)
     exit(success)
 
 
@@ -181,16 +182,17 @@ def opf(args=sys.argv[1:]):
             parse_options(args, usage, True)
 
     if options.test:
+        from pypower.t.test_pypower import test_opf
         sys.exit(test_opf())
 
     if options.uopf:
         if options.w_res:
             stderr.write('uopf and opf_w_res are mutex\n')
-        r = runuopf(casedata, ppopt, fname, solvedcase)
+        r = api.runuopf(casedata, ppopt, fname, solvedcase)
     elif options.w_res:
-        r = runopf_w_res(casedata, ppopt, fname, solvedcase)
+        r = api.runopf_w_res(casedata, ppopt, fname, solvedcase)
     else:
-        r = runopf(casedata, ppopt, fname, solvedcase)
+        r = api.runopf(casedata, ppopt, fname, solvedcase)
     exit(r['success'])
 
 
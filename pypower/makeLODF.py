@@ -5,7 +5,7 @@
 """Builds the line outage distribution factor matrix.
 """
 
-from numpy import ones, diag, eye, r_, arange
+from numpy import ones, diag, r_, arange
 from scipy.sparse import csr_matrix as sparse
 
 from pypower.idx_brch import F_BUS, T_BUS
@@ -21,7 +21,10 @@ def makeLODF(branch, PTDF):
         H = makePTDF(baseMVA, bus, branch)
         LODF = makeLODF(branch, H)
 
-    @see: L{makePTDF}
+    For a large number of branches, L{lodf_model} computes only the
+    columns needed.
+
+    @see: L{makePTDF}, L{lodf_model}
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
@@ -33,7 +36,7 @@ def makeLODF(branch, PTDF):
 
     H = PTDF * Cft
     h = diag(H, 0)
-    LODF = H / (ones((nl, nl)) - ones((nl, 1)) * h.T)
-    LODF = LODF - diag(diag(LODF)) - eye(nl, nl)
+    LODF = H / (1 - h)
+    LODF[arange(nl), arange(nl)] = -1
 
     return LODF
@@ -7,15 +7,17 @@
 
 from sys import stderr
 
-from numpy import zeros, arange, isscalar, dot, ix_, flatnonzero as find
+from numpy import \
+    array, zeros, arange, isscalar, dot, outer, float64, flatnonzero as find
 
-from numpy.linalg import solve
+from scipy.sparse.linalg import splu, LinearOperator
 
 from pypower.idx_bus import BUS_TYPE, REF, BUS_I
 from pypower.makeBdc import makeBdc
 
 
-def makePTDF(baseMVA, bus, branch, slack=None):
+def makePTDF(baseMVA, bus, branch, slack=None, bus_idx=None, branch_idx=None,
+             dtype=float64, lazy=False):
     """Builds the DC PTDF matrix for a given choice of slack.
 
     Returns the DC PTDF matrix for a given choice of slack. The matrix is
@@ -29,6 +31,16 @@ def makePTDF(baseMVA, bus, branch, slack=None):
     column specifies how the slack should be handled for injections
     at that bus.
 
+    If C{bus_idx} and/or C{branch_idx} are given, only the columns for
+    those buses and the rows for those branches are computed. The PTDF is
+    computed with the sparse LU factors of the C{B} matrix reduced by the
+    slack bus, solving for the requested rows or columns, whichever are
+    fewer, a block at a time. Distributed slack is applied as a rank-1
+    update. The result is an array of type C{dtype} (e.g. C{float32} to
+    halve memory), or, if C{lazy} is true, a C{scipy.sparse.linalg}
+    C{LinearOperator} which computes products with the PTDF matrix by
+    forward and back substitutions, without forming it.
+
     @see: L{makeLODF}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -46,32 +58,78 @@ def makePTDF(baseMVA, bus, branch, slack=None):
 
     nb = bus.shape[0]
     nbr = branch.shape[0]
-    noref = arange(1, nb)      ## use bus 1 for voltage angle reference
     noslack = find(arange(nb) != slack_bus)
 
     ## check that bus numbers are equal to indices to bus (one set of bus numbers)
     if any(bus[:, BUS_I] != arange(nb)):
         stderr.write('makePTDF: buses must be numbered consecutively')
 
-    ## compute PTDF for single slack_bus
+    ## requested rows and columns
+    cols = arange(nb) if bus_idx is None else array(bus_idx, int).reshape(-1)
+    rows = arange(nbr) if branch_idx is None else \
+        array(branch_idx, int).reshape(-1)
+
+    ## factor B, reduced by the slack bus, which is also the angle reference
     Bbus, Bf, _, _ = makeBdc(baseMVA, bus, branch)
-    Bbus, Bf = Bbus.todense(), Bf.todense()
-    H = zeros((nbr, nb))
-    H[:, noslack] = solve( Bbus[ix_(noslack, noref)].T, Bf[:, noref].T ).T
-    #             = Bf[:, noref] * inv(Bbus[ix_(noslack, noref)])
+    lu = splu(Bbus[noslack, :][:, noslack].tocsc())
+    Bf = Bf[rows, :][:, noslack].tocsc()
+
+    def Hs(X):
+        ## flows in the requested branches for injections X, single slack_bus
+        return Bf * lu.solve(X[noslack])
+
+    def HsT(Y):
+        ## transpose of Hs, for flows Y in the requested branches
+        Z = zeros((nb, Y.shape[1]))
+        Z[noslack] = lu.solve(Bf.T * Y, trans='T')
+        return Z
 
     ## distribute slack, if requested
-    if not isscalar(slack):
-        if len(slack.shape) == 1:  ## slack is a vector of weights
-            slack = slack / sum(slack)   ## normalize weights
-
-            ## conceptually, we want to do ...
-            ##    H = H * (eye(nb, nb) - slack * ones((1, nb)))
-            ## ... we just do it more efficiently
-            v = dot(H, slack)
-            for k in range(nb):
-                H[:, k] = H[:, k] - v
-        else:
-            H = dot(H, slack)
+    ## conceptually, we want H = Hs * D, with D = eye(nb, nb) - w * ones((1, nb))
+    ## for a vector of weights w, D = slack for a matrix, or D = eye(nb, nb)
+    if isscalar(slack):
+        D = DT = lambda X: X
+        v = None
+    elif len(slack.shape) == 1:  ## slack is a vector of weights
+        w = slack / sum(slack)   ## normalize weights
+        D = lambda X: X - outer(w, X.sum(0))
+        DT = lambda Z: Z - dot(w, Z)
+        v = Hs(w.reshape(-1, 1))
+    else:
+        D = lambda X: dot(slack, X)
+        DT = lambda Z: dot(slack.T, Z)
+        v = None
+
+    if lazy:
+        def matmat(X):
+            Z = zeros((nb, X.shape[1]))
+            Z[cols] = X
+            return Hs(D(Z))
+
+        def rmatmat(Y):
+            return DT(HsT(Y))[cols]
+
+        return LinearOperator((len(rows), len(cols)), dtype=dtype,
+            matvec=lambda x: matmat(x.reshape(-1, 1)).ravel(),
+            rmatvec=lambda y: rmatmat(y.reshape(-1, 1)).ravel(),
+            matmat=matmat, rmatmat=rmatmat)
+
+    ## compute a block of rows or columns at a time
+    nblk = 128
+    H = zeros((len(rows), len(cols)), dtype)
+    if len(rows) < len(cols):
+        for i in range(0, len(rows), nblk):
+            Y = zeros((len(rows), min(nblk, len(rows) - i)))
+            Y[arange(i, i + Y.shape[1]), arange(Y.shape[1])] = 1
+            H[i:i + Y.shape[1]] = DT(HsT(Y))[cols].T
+    else:
+        for i in range(0, len(cols), nblk):
+            c = cols[i:i + nblk]
+            X = zeros((nb, len(c)))
+            X[c, arange(len(c))] = 1
+            if v is not None:   ## rank-1 update for distributed slack
+                H[:, i:i + len(c)] = Hs(X) - v
+            else:
+                H[:, i:i + len(c)] = Hs(D(X))
 
     return H
@@ -41,18 +41,7 @@ def makeYbus(baseMVA, bus, branch):
     ##      |    | = |          | * |    |
     ##      | It |   | Ytf  Ytt |   | Vt |
     ##
-    stat = branch[:, BR_STATUS]              ## ones at in-service branches
-    Ys = stat / (branch[:, BR_R] + 1j * branch[:, BR_X])  ## series admittance
-    Bc = stat * branch[:, BR_B]              ## line charging susceptance
-    tap = ones(nl)                           ## default tap ratio = 1
-    i = nonzero(branch[:, TAP])              ## indices of non-zero tap ratios
-    tap[i] = branch[i, TAP]                  ## assign non-zero tap ratios
-    tap = tap * exp(1j * pi / 180 * branch[:, SHIFT]) ## add phase shifters
-
-    Ytt = Ys + 1j * Bc / 2
-    Yff = Ytt / (tap * conj(tap))
-    Yft = - Ys / conj(tap)
-    Ytf = - Ys / tap
+    Yff, Yft, Ytf, Ytt = branch_admittances(branch)
 
     ## compute shunt admittance
     ## if Psh is the real power consumed by the shunt at V = 1.0 p.u.
@@ -84,3 +73,30 @@ def makeYbus(baseMVA, bus, branch):
         csr_matrix((Ysh, (range(nb), range(nb))), (nb, nb))
 
     return Ybus, Yf, Yt
+
+
+def branch_admittances(branch):
+    """Computes the elements of the branch admittance matrices.
+
+    Returns the vectors C{Yff}, C{Yft}, C{Ytf} and C{Ytt} of the 2 x 2
+    admittance matrix of each branch (zero for out-of-service branches),
+    as used by L{makeYbus}.
+
+    @see: L{makeYbus}
+    """
+    nl = branch.shape[0]
+
+    stat = branch[:, BR_STATUS]              ## ones at in-service branches
+    Ys = stat / (branch[:, BR_R] + 1j * branch[:, BR_X])  ## series admittance
+    Bc = stat * branch[:, BR_B]              ## line charging susceptance
+    tap = ones(nl)                           ## default tap ratio = 1
+    i = nonzero(branch[:, TAP])              ## indices of non-zero tap ratios
+    tap[i] = branch[i, TAP]                  ## assign non-zero tap ratios
+    tap = tap * exp(1j * pi / 180 * branch[:, SHIFT]) ## add phase shifters
+
+    Ytt = Ys + 1j * Bc / 2
+    Yff = Ytt / (tap * conj(tap))
+    Yft = - Ys / conj(tap)
+    Ytf = - Ys / tap
+
+    return Yff, Yft, Ytf, Ytt
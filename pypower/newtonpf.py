@@ -7,16 +7,21 @@
 
 import sys
 
-from numpy import array, angle, exp, linalg, conj, r_, Inf
+from time import time
 
-from scipy.sparse import hstack, vstack
-from scipy.sparse.linalg import spsolve
+from numpy import angle, exp, linalg, conj, r_, Inf, setdiff1d, union1d
+from numpy import flatnonzero as find
 
-from pypower.dSbus_dV import dSbus_dV
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import spsolve, splu
+
+from pypower.jac_builder import jac_builder
+from pypower.pptiming import timing_recorder
+from pypower.optimal_multiplier import optimal_multiplier
 from pypower.ppoption import ppoption
 
 
-def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
+def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None, Qlim=None):
     """Solves the power flow using a full Newton's method.
 
     Solves for bus voltages given the full system admittance matrix (for
@@ -33,6 +38,44 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     flag which indicates whether it converged or not, and the number of
     iterations performed.
 
+    With C{PF_NR_LU} set to 1, the fill-reducing column ordering of the
+    Jacobian is computed at the first iteration only and reused for the
+    following factorizations. With C{PF_NR_LU} set to 2, the LU factors
+    are also reused (chord Newton) as long as each iteration reduces the
+    mismatch by at least the factor C{PF_NR_CHORD_RATE}. Chord iterations
+    count towards C{PF_MAX_IT}.
+
+    With C{PF_NR_DAMPING} set to 1, each Newton step C{dx} is scaled by
+    the optimal multiplier of Iwamoto and Tamura, the root of a cubic
+    which minimizes the norm of a quadratic model of the mismatch along
+    C{dx}, built from the mismatches before and after the full step. With
+    C{PF_NR_DAMPING} set to 2, the step is halved until the 2-norm of the
+    mismatch decreases sufficiently (backtracking line search). Either
+    way heavily loaded or poorly initialized cases oscillate and diverge
+    less often, at the cost of extra mismatch evaluations only.
+
+    If C{Qlim} is given as a tuple C{(Qmin, Qmax)} of vectors (for all
+    buses) of lower and upper limits on the reactive power injection in
+    p.u., generator Q limits are enforced within the iterations. Each time
+    the mismatch converges, the PV buses whose reactive injection is
+    outside of its limits are converted to PQ buses with the injection
+    fixed at the violated limit, and the iterations continue from the
+    current voltages with the Jacobian structure of the new bus types.
+    C{Ybus} is never rebuilt and the reference bus is never converted.
+    The index vector of the converted buses is returned as a fourth
+    output.
+
+    With the C{TIMING} option set, the time of each iteration is recorded
+    in the phases C{'newtonpf.jacobian'} (or C{'newtonpf.factor'}, the
+    Jacobian and its factors, with C{PF_NR_LU}), C{'newtonpf.solve'} and
+    C{'newtonpf.update'}, see L{pptiming}.
+
+    If the C{ITER_CALLBACK} option is set, it is called after each
+    iteration with a dict of the iteration number, the mismatch norm
+    C{'normF'}, the norm of the Newton step C{'step'}, the wall time of the
+    iteration C{'time'} and of its linear solve C{'solve_time'}, and the
+    voltages C{'V'}. The iterations stop if it returns a true value.
+
     @see: L{runpf}
 
     @author: Ray Zimmerman (PSERC Cornell)
@@ -45,8 +88,17 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     tol     = ppopt['PF_TOL']
     max_it  = ppopt['PF_MAX_IT']
     verbose = ppopt['VERBOSE']
+    lu_mode = ppopt['PF_NR_LU']
+    rate    = ppopt['PF_NR_CHORD_RATE']
+    damping = ppopt['PF_NR_DAMPING']
+    tm      = timing_recorder(ppopt['TIMING'])
+    callback = ppopt['ITER_CALLBACK']
 
     ## initialize
+    if Qlim is not None:
+        Qmin, Qmax = Qlim
+        Sbus = Sbus.copy()      ## injections at limited buses are modified
+        limited = find([])      ## buses converted from PV to PQ
     converged = 0
     i = 0
     V = V0
@@ -54,13 +106,18 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
     Vm = abs(V)
 
     ## set up indexing for updating V
-    pvpq = r_[pv, pq]
     npv = len(pv)
     npq = len(pq)
     j1 = 0;         j2 = npv           ## j1:j2 - V angle of pv buses
     j3 = j2;        j4 = j2 + npq      ## j3:j4 - V angle of pq buses
     j5 = j4;        j6 = j4 + npq      ## j5:j6 - V mag of pq buses
 
+    ## Jacobian structure, computed once for all iterations
+    jac = jac_builder(Ybus, pv, pq)
+    lu = None                   ## current LU factors of J
+    perm_c = None               ## column ordering reused for later factors
+    refactor = True
+
     ## evaluate F(x0)
     mis = V * conj(Ybus * V) - Sbus
     F = r_[  mis[pv].real,
@@ -73,38 +130,20 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
         sys.stdout.write('\n it    max P & Q mismatch (p.u.)')
         sys.stdout.write('\n----  ---------------------------')
         sys.stdout.write('\n%3d        %10.3e' % (i, normF))
-    if normF < tol:
+    if normF < tol and Qlim is None:  ## Q limits are checked after iterating
         converged = 1
         if verbose > 1:
             sys.stdout.write('\nConverged!\n')
 
-    ## do Newton iterations
-    while (not converged and i < max_it):
-        ## update iteration counter
-        i = i + 1
-
-        ## evaluate Jacobian
-        dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
-
-        J11 = dS_dVa[array([pvpq]).T, pvpq].real
-        J12 = dS_dVm[array([pvpq]).T, pq].real
-        J21 = dS_dVa[array([pq]).T, pvpq].imag
-        J22 = dS_dVm[array([pq]).T, pq].imag
-
-        J = vstack([
-                hstack([J11, J12]),
-                hstack([J21, J22])
-            ], format="csr")
-
-        ## compute update step
-        dx = -1 * spsolve(J, F)
-
-        ## update voltage
+    def update(Va, Vm, dx, mu):
+        ## voltages and mismatch after a step of mu * dx
+        Va = Va.copy()
+        Vm = Vm.copy()
         if npv:
-            Va[pv] = Va[pv] + dx[j1:j2]
+            Va[pv] = Va[pv] + mu * dx[j1:j2]
         if npq:
-            Va[pq] = Va[pq] + dx[j3:j4]
-            Vm[pq] = Vm[pq] + dx[j5:j6]
+            Va[pq] = Va[pq] + mu * dx[j3:j4]
+            Vm[pq] = Vm[pq] + mu * dx[j5:j6]
         V = Vm * exp(1j * Va)
         Vm = abs(V)            ## update Vm and Va again in case
         Va = angle(V)          ## we wrapped around with a negative Vm
@@ -115,19 +154,130 @@ def newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt=None):
                  mis[pq].real,
                  mis[pq].imag  ]
 
+        return V, Va, Vm, mis, F
+
+    ## do Newton iterations
+    while (not converged and i < max_it):
+        ## update iteration counter
+        i = i + 1
+        F0 = F
+        t_it = time()
+        t = tm.tic()
+
+        if lu_mode:
+            if refactor:
+                ## evaluate Jacobian and factor it, reusing the column
+                ## ordering found by the first factorization
+                J = jac.build(V)
+                if perm_c is None:
+                    lu = splu(J.tocsc())
+                    perm_c = lu.perm_c
+                    reordered = False
+                else:
+                    J = csr_matrix((J.data, perm_c[J.indices], J.indptr),
+                                   J.shape).tocsc()
+                    lu = splu(J, permc_spec='NATURAL')
+                    reordered = True
+                t = tm.toc('newtonpf.factor', t)
+
+            ## compute update step
+            ts = time()
+            dx = -1 * lu.solve(F)
+            if reordered:
+                dx = dx[perm_c]
+        else:
+            ## evaluate Jacobian
+            J = jac.build(V)
+            t = tm.toc('newtonpf.jacobian', t)
+
+            ## compute update step
+            ts = time()
+            dx = -1 * spsolve(J, F)
+        ts = time() - ts
+        t = tm.toc('newtonpf.solve', t)
+
+        ## update voltage
+        V, Va1, Vm1, mis, F = update(Va, Vm, dx, 1)
+
+        ## shorten the step if the full step does not reduce the mismatch
+        if damping == 1:
+            ## optimal multiplier, minimizing the norm of the quadratic
+            ## model (1 - mu) * F0 + mu**2 * F1 of the mismatch along dx
+            mu = optimal_multiplier(F0, F)
+            if mu != 1:
+                V, Va1, Vm1, mis, F = update(Va, Vm, dx, mu)
+        elif damping == 2:
+            ## backtracking, halving the step until sufficient decrease
+            mu = 1.0
+            norm0 = linalg.norm(F0)
+            while linalg.norm(F) > (1 - 1e-4 * mu) * norm0 and mu > 1e-3:
+                mu = mu / 2
+                V, Va1, Vm1, mis, F = update(Va, Vm, dx, mu)
+        Va, Vm = Va1, Vm1
+        t = tm.toc('newtonpf.update', t)
+
         ## check for convergence
-        normF = linalg.norm(F, Inf)
+        normF, normF_prev = linalg.norm(F, Inf), normF
         if verbose > 1:
             sys.stdout.write('\n%3d        %10.3e' % (i, normF))
+
+        ## keep the factors while the chord steps still converge fast
+        refactor = lu_mode < 2 or normF > rate * normF_prev
         if normF < tol:
             converged = 1
-            if verbose:
+
+            if Qlim is not None:
+                ## convert PV buses with violated Q limits to PQ buses
+                Qg = mis[pv].imag + Sbus[pv].imag
+                mx = Qg > Qmax[pv]
+                mn = Qg < Qmin[pv]
+                if any(mx | mn):
+                    k = pv[mx | mn]
+                    Sbus[pv[mx]] = Sbus[pv[mx]].real + 1j * Qmax[pv[mx]]
+                    Sbus[pv[mn]] = Sbus[pv[mn]].real + 1j * Qmin[pv[mn]]
+                    if verbose:
+                        sys.stdout.write('\nconverting %d PV buses at Q '
+                                         'limits to PQ' % len(k))
+                    limited = r_[limited, k]
+                    pv = setdiff1d(pv, k)
+                    pq = union1d(pq, k)
+
+                    ## new bus types, same Ybus, start the factors over
+                    npv = len(pv)
+                    npq = len(pq)
+                    j1 = 0;         j2 = npv
+                    j3 = j2;        j4 = j2 + npq
+                    j5 = j4;        j6 = j4 + npq
+                    jac = jac_builder(Ybus, pv, pq)
+                    perm_c = None
+                    refactor = True
+
+                    mis = V * conj(Ybus * V) - Sbus
+                    F = r_[  mis[pv].real,
+                             mis[pq].real,
+                             mis[pq].imag  ]
+                    normF = linalg.norm(F, Inf)
+                    converged = int(normF < tol)
+
+            if converged and verbose:
                 sys.stdout.write("\nNewton's method power flow converged in "
                                  "%d iterations.\n" % i)
 
+        if callback is not None and \
+                callback({'solver': 'newtonpf', 'iteration': i,
+                          'normF': normF, 'step': linalg.norm(dx, Inf),
+                          'time': time() - t_it, 'solve_time': ts, 'V': V}):
+            if verbose and not converged:
+                sys.stdout.write("\nNewton's method power flow stopped by "
+                                 "the iteration callback.")
+            break
+
     if verbose:
         if not converged:
             sys.stdout.write("\nNewton's method power did not converge in %d "
                              "iterations.\n" % i)
 
+    if Qlim is not None:
+        return V, converged, i, limited
+
     return V, converged, i
@@ -18,6 +18,8 @@ from pypower.opf_args import opf_args2
 from pypower.opf_setup import opf_setup
 from pypower.opf_execute import opf_execute
 from pypower.int2ext import int2ext
+from pypower.ppoption import ppoption
+from pypower.pptiming import timing_recorder, NULL_TIMING
 
 
 def opf(*args):
@@ -136,6 +138,8 @@ def opf(*args):
                     - C{Pmis}, C{Pf}, C{Pf}, C{PQh}, C{PQl}, C{vl}, C{ycon},
                     - (other)
         - C{cost}       user defined cost values, by named block
+        - C{timing}     (only if the C{TIMING} option is set) wall time and
+                        number of calls of each phase, see L{pptiming}
 
     @see: L{runopf}, L{dcopf}, L{uopf}, L{caseformat}
 
@@ -148,6 +152,9 @@ def opf(*args):
 
     ## process input arguments
     ppc, ppopt = opf_args2(*args)
+    tm = timing_recorder(ppopt['TIMING'])
+    ppopt = ppoption(ppopt, TIMING=tm)  ## passed on to the solvers
+    t = tm.toc('opf_args', t0)
 
     ## add zero columns to bus, gen, branch for multipliers, etc if needed
     nb   = shape(ppc['bus'])[0]    ## number of buses
@@ -164,15 +171,19 @@ def opf(*args):
 
     ##-----  convert to internal numbering, remove out-of-service stuff  -----
     ppc = ext2int(ppc)
+    t = tm.toc('ext2int', t)
 
     ##-----  construct OPF model object  -----
     om = opf_setup(ppc, ppopt)
+    t = tm.toc('opf_setup', t)
 
     ##-----  execute the OPF  -----
     results, success, raw = opf_execute(om, ppopt)
+    t = tm.toc('opf_execute', t)
 
     ##-----  revert to original ordering, including out-of-service stuff  -----
     results = int2ext(results)
+    t = tm.toc('int2ext', t)
 
     ## zero out result fields of out-of-service gens & branches
     if len(results['order']['gen']['status']['off']) > 0:
@@ -187,5 +198,7 @@ def opf(*args):
     results['et'] = et
     results['success'] = success
     results['raw'] = raw
+    if tm is not NULL_TIMING:
+        results['timing'] = tm.summary()
 
     return results
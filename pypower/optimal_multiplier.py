@@ -0,0 +1,49 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Computes the optimal multiplier for a Newton power flow step.
+"""
+
+from numpy import dot, roots
+
+
+def optimal_multiplier(F0, F1):
+    """Computes the optimal multiplier for a Newton power flow step.
+
+    Given the mismatch C{F0} at the current point and C{F1} after the full
+    Newton step C{dx}, the mismatch along the step is modelled as::
+
+        F(mu) = (1 - mu) * F0 + mu**2 * F1
+
+    which is exact for the power flow equations in rectangular coordinates.
+    Returns the multiplier C{mu} which minimizes C{|F(mu)|^2}, i.e. the
+    real positive root of the cubic::
+
+        2 c.c mu^3 - 3 a.c mu^2 + (a.a + 2 a.c) mu - a.a = 0
+
+    (with C{a = F0} and C{c = F1}) with the smallest model value, or 1 if
+    there is none.
+
+    See S. Iwamoto, Y. Tamura, "A Load Flow Calculation Method for
+    Ill-Conditioned Power Systems", IEEE Trans. PAS, vol. 100, no. 4,
+    pp. 1736-1743, 1981.
+
+    @see: L{newtonpf}
+    """
+    aa = dot(F0, F0)
+    ac = dot(F0, F1)
+    cc = dot(F1, F1)
+    if aa == 0:
+        return 1.0
+
+    def model(mu):
+        F = (1 - mu) * F0 + mu**2 * F1
+        return dot(F, F)
+
+    mu = [r.real for r in roots([2 * cc, -3 * ac, aa + 2 * ac, -aa])
+          if abs(r.imag) <= 1e-10 * abs(r) and r.real > 0]
+    if not mu:
+        return 1.0
+
+    return min(mu, key=model)
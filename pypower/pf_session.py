@@ -0,0 +1,205 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Power flow session for repeated solves of a prepared network.
+"""
+
+from time import time
+
+from numpy import zeros, ones, arange, exp, pi, c_, atleast_1d
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.makeSbus import makeSbus
+from pypower.makeB import makeB
+from pypower.newtonpf import newtonpf
+from pypower.fdpf import fdpf
+from pypower.gausspf import gausspf
+from pypower.bfswpf import bfswpf
+from pypower.pfsoln import pfsoln
+from pypower.ybus_model import ybus_model
+
+from pypower.idx_bus import BUS_I, PD, QD, VM, VA
+from pypower.idx_brch import F_BUS, T_BUS, BR_STATUS, PF, QF, PT, QT
+from pypower.idx_gen import GEN_BUS, PG, QG, VG
+
+
+class pf_session(object):
+    """Power flow session for repeated solves of a prepared network.
+
+    Loads the case C{casedata} (a case file name or dict, see L{loadcase})
+    and prepares it once, as L{runpf} does for each run: the data are
+    converted to internal indexing, the bus types are found and the
+    admittance matrices are built as a L{ybus_model}. Loads, generator
+    dispatch and branch status can then be changed with L{set_load},
+    L{set_gen} and L{set_branch_status}, which update only the affected
+    data, and L{solve} runs the AC power flow with the C{PF_ALG} of
+    C{ppopt}, warm started from the last solution.
+
+    Branches out of service in the case are kept in the internal data, so
+    they can be switched back in. Generators out of service, or at
+    isolated buses, cannot be dispatched. Generator reactive power limits
+    are not enforced.
+
+    Example::
+        pfs = pf_session('case118')
+        for pd in profile:
+            pfs.set_load(59, Pd=pd)
+            results, success = pfs.solve()
+
+    @see: L{runpf}, L{ybus_model}
+    """
+
+    def __init__(self, casedata, ppopt=None):
+        self.ppopt = ppoption(ppopt)
+
+        ## read data, keeping all branches for switching
+        ppc = loadcase(casedata)
+        if ppc["branch"].shape[1] < QT:
+            ppc["branch"] = c_[ppc["branch"],
+                               zeros((ppc["branch"].shape[0],
+                                      QT - ppc["branch"].shape[1] + 1))]
+        status = ppc["branch"][:, BR_STATUS].copy()
+        ppc["branch"][:, BR_STATUS] = 1
+
+        ## convert to internal indexing
+        ppc = ext2int(ppc)
+        o = ppc["order"]
+        o["ext"]["branch"][:, BR_STATUS] = status
+        self.ppc = ppc
+        self.baseMVA = ppc["baseMVA"]
+        self.bus, self.gen = ppc["bus"], ppc["gen"]
+
+        ## mappings between external and internal rows
+        self.bus_on = o["bus"]["status"]["on"]
+        self.gen_on = o["gen"]["status"]["on"][o["gen"]["e2i"]]
+        self.br_on = o["branch"]["status"]["on"]
+        self.bus_i = -ones(len(o["bus"]["e2i"]), int)
+        self.bus_i[o["bus"]["i2e"].astype(int)] = arange(len(o["bus"]["i2e"]))
+        self.gen_i = -ones(o["ext"]["gen"].shape[0], int)
+        self.gen_i[self.gen_on] = arange(len(self.gen_on))
+        self.br_i = -ones(o["ext"]["branch"].shape[0], int)
+        self.br_i[self.br_on] = arange(len(self.br_on))
+
+        ## admittance matrices, bus types and generator buses
+        ppc["branch"][:, BR_STATUS] = status[self.br_on]
+        self.ym = ybus_model(self.baseMVA, self.bus, ppc["branch"])
+        self.ref, self.pv, self.pq = bustypes(self.bus, self.gen)
+        self.gbus = self.gen[:, GEN_BUS].astype(int)
+
+        self.V = None           ## last solution
+        self.B = {}             ## fast-decoupled B matrices, by PF_ALG
+
+    @property
+    def branch(self):
+        """Branch data, in internal indexing."""
+        return self.ym.branch
+
+    def _rows(self, idx, rows_i, name):
+        ## internal rows for external rows idx, -1 for those not found
+        idx = atleast_1d(idx).astype(int)
+        k = -ones(len(idx), int)
+        found = (idx >= 0) & (idx < len(rows_i))
+        k[found] = rows_i[idx[found]]
+        if (k < 0).any():
+            raise ValueError('pf_session: %s %s not in the prepared network'
+                             % (name, atleast_1d(idx)[k < 0]))
+        return k
+
+    def set_load(self, bus, Pd=None, Qd=None):
+        """Sets the real and/or reactive load (MW, MVAr) at buses C{bus}.
+
+        C{bus} holds external bus numbers.
+        """
+        k = self._rows(bus, self.bus_i, 'buses')
+        if Pd is not None:
+            self.bus[k, PD] = Pd
+        if Qd is not None:
+            self.bus[k, QD] = Qd
+
+    def set_gen(self, gen, Pg=None, Vg=None):
+        """Sets the real power output (MW) and/or voltage setpoint (p.u.)
+        of generators C{gen} (rows of the C{gen} matrix of the case).
+        """
+        k = self._rows(gen, self.gen_i, 'generators')
+        if Pg is not None:
+            self.gen[k, PG] = Pg
+        if Vg is not None:
+            self.gen[k, VG] = Vg
+
+    def set_branch_status(self, branch, status):
+        """Switches branches C{branch} (rows of the C{branch} matrix of the
+        case) in (C{status} 1) or out (C{status} 0) of service.
+        """
+        k = self._rows(branch, self.br_i, 'branches')
+        self.ym.update(k, BR_STATUS, status)
+        self.B = {}
+
+    def solve(self):
+        """Runs the power flow with the current data.
+
+        Returns the results, in external indexing as returned by L{runpf},
+        and a flag which is C{True} if the power flow converged.
+        """
+        t0 = time()
+        ppopt = self.ppopt
+        baseMVA, bus, gen, branch = \
+            self.baseMVA, self.bus, self.gen, self.ym.branch
+        Ybus, Yf, Yt = self.ym.Ybus, self.ym.Yf, self.ym.Yt
+        ref, pv, pq = self.ref, self.pv, self.pq
+
+        ## initial state, the last solution with current voltage setpoints
+        if self.V is None:
+            V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+        else:
+            V0 = self.V.copy()
+        V0[self.gbus] = gen[:, VG] / abs(V0[self.gbus]) * V0[self.gbus]
+
+        ## run the power flow
+        Sbus = makeSbus(baseMVA, bus, gen)
+        alg = ppopt["PF_ALG"]
+        if alg == 2 or alg == 3:
+            if alg not in self.B:
+                self.B[alg] = makeB(baseMVA, bus, branch, alg)
+            Bp, Bpp = self.B[alg]
+            V, success, _ = fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt)
+        elif alg == 4:
+            V, success, _ = gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+        elif alg == 5:
+            V, success, _ = bfswpf(Ybus, Sbus, V0, Yf, Yt, branch,
+                                   ref, pv, pq, ppopt)
+        else:
+            V, success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+        self.V = V if success else None
+
+        ## update copies of the data matrices with solution, so that a
+        ## failed run does not become the initial state of the next one
+        bus, gen, branch = pfsoln(baseMVA, bus.copy(), gen.copy(),
+                                  branch.copy(), Ybus, Yf, Yt, V, ref, pv, pq)
+
+        ## back to external indexing, like int2ext, with the rows and
+        ## numbering worked out once
+        o = self.ppc["order"]
+        i2e = o["bus"]["i2e"]
+        results = dict((k, v) for k, v in self.ppc.items() if k != 'order')
+        results["bus"] = o["ext"]["bus"].copy()
+        results["bus"][self.bus_on] = bus
+        results["bus"][self.bus_on, BUS_I] = i2e
+        results["gen"] = o["ext"]["gen"].copy()
+        results["gen"][:, [PG, QG]] = 0
+        results["gen"][self.gen_on] = gen
+        results["gen"][self.gen_on, GEN_BUS] = i2e[self.gbus]
+        results["branch"] = o["ext"]["branch"].copy()
+        results["branch"][:, [PF, QF, PT, QT]] = 0
+        results["branch"][self.br_on] = branch
+        results["branch"][self.br_on, F_BUS] = \
+            i2e[branch[:, F_BUS].astype(int)]
+        results["branch"][self.br_on, T_BUS] = \
+            i2e[branch[:, T_BUS].astype(int)]
+        results["et"] = time() - t0
+        results["success"] = success
+
+        return results, success
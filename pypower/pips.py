@@ -5,6 +5,8 @@
 """Python Interior Point Solver (PIPS).
 """
 
+from time import time
+
 from numpy import array, Inf, any, isnan, ones, r_, finfo, \
     zeros, dot, absolute, log, flatnonzero as find
 
@@ -14,6 +16,7 @@ from scipy.sparse import vstack, hstack, eye, csr_matrix as sparse
 from scipy.sparse.linalg import spsolve
 
 from pypower.pipsver import pipsver
+from pypower.pptiming import timing_recorder
 
 
 EPS = finfo(float).eps
@@ -140,6 +143,16 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
                     value is also passed as the 3rd argument to the Hessian
                     evaluation function so that it can appropriately scale the
                     objective function term in the Hessian of the Lagrangian.
+                  - C{timing} (None) - L{pptiming} recorder for the time of
+                    each iteration, in phases C{'pips.hessian'},
+                    C{'pips.solve'} (Newton system) and C{'pips.evaluate'}
+                    (cost, constraints and their derivatives)
+                  - C{callback} (None) - function called after each
+                    iteration with a dict of the solver name
+                    (C{'solver'}, C{'pips'}), the iteration number
+                    (C{'iteration'}), the values saved in C{hist}, the wall
+                    time of the iteration (C{'time'}) and the current
+                    M{x}, the iterations stop if it returns a true value
     @type opt: dict
 
     @rtype: dict
@@ -217,6 +230,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         opt["cost_mult"] = 1
     if "verbose" not in opt:
         opt["verbose"] = 0
+    tm = timing_recorder(opt.get("timing"))
+    callback = opt.get("callback")
 
     # initialize history
     hist = []
@@ -234,6 +249,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
     i = 0                       # iteration counter
     converged = False           # flag
     eflag = False               # exit flag
+    stopped = False             # stopped by callback
 
     # add var limits to linear constraints
     eyex = eye(nx, nx, format="csr")
@@ -360,6 +376,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
     while (not converged) and (i < opt["max_it"]):
         # update iteration counter
         i += 1
+        t = tm.tic()
+        t_it = time()
 
         # compute update step
         lmbda = {"eqnonlin": lam[range(neqnln)],
@@ -373,6 +391,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         else:
             _, _, d2f = f_fcn(x, True)      # cost
             Lxx = d2f * opt["cost_mult"]
+        t = tm.toc('pips.hessian', t)
         rz = range(len(z))
         zinvdiag = sparse((1.0 / z, (rz, rz))) if len(z) else None
         rmu = range(len(mu))
@@ -388,6 +407,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         bb = r_[-N, -g]
 
         dxdlam = spsolve(Ab.tocsr(), bb)
+        t = tm.toc('pips.solve', t)
 
         if any(isnan(dxdlam)):
             if opt["verbose"]:
@@ -503,6 +523,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
             gamma = sigma * dot(z, mu) / niq
 
         # evaluate cost, constraints, derivatives
+        t = tm.tic()
         f, df = f_fcn(x)             # cost
         f = f * opt["cost_mult"]
         df = df * opt["cost_mult"]
@@ -538,6 +559,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         Lx = df
         Lx = Lx + dg * lam if dg is not None else Lx
         Lx = Lx + dh * mu  if dh is not None else Lx
+        t = tm.toc('pips.evaluate', t)
 
         if len(h) == 0:
             maxh = zeros(1)
@@ -582,6 +604,12 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
             if opt["step_control"]:
                 L = f + dot(lam, g) + dot(mu, (h + z)) - gamma * sum(log(z))
 
+        if callback is not None and \
+                callback(dict(hist[-1], solver='pips', iteration=i,
+                              time=time() - t_it, x=x)):
+            stopped = not converged
+            break
+
     if opt["verbose"]:
         if not converged:
             print("Did not converge in %d iterations." % i)
@@ -598,6 +626,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         message = 'Numerically failed'
     else:
         raise
+    if stopped:
+        message = 'Stopped by callback'
 
     output = {"iterations": i, "hist": hist, "message": message}
 
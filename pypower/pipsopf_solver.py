@@ -84,7 +84,9 @@ def pipsopf_solver(om, ppopt, out_opt=None):
              'max_red': max_red,
              'step_control': step_control,
              'cost_mult': 1e-4,
-             'verbose': verbose  }
+             'verbose': verbose,
+             'timing': ppopt['TIMING'],
+             'callback': ppopt['ITER_CALLBACK']  }
 
     ## unpack data
     ppc = om.get_ppc()
@@ -5,7 +5,8 @@
 """Used to set and retrieve a PYPOWER options vector.
 """
 
-from numpy import Inf
+## not numpy.Inf, so that the command line parser does not import NumPy
+Inf = float('inf')
 
 
 PF_OPTIONS = [
@@ -13,7 +14,8 @@ PF_OPTIONS = [
 1 - Newton's method,
 2 - Fast-Decoupled (XB version),
 3 - Fast-Decoupled (BX version),
-4 - Gauss Seidel'''),
+4 - Gauss Seidel,
+5 - backward/forward sweep (radial networks, others use Newton)'''),
 
     ('pf_tol', 1e-8, 'termination tolerance on per unit P & Q mismatch'),
 
@@ -25,14 +27,72 @@ PF_OPTIONS = [
     ('pf_max_it_gs', 1000, 'maximum number of iterations for '
      'Gauss-Seidel method'),
 
-    ('enforce_q_lims', False, 'enforce gen reactive power limits, at '
-     'expense of |V|'),
+    ('pf_max_it_bfsw', 100, 'maximum number of iterations for '
+     'backward/forward sweep method'),
+
+    ('pf_gs_jacobi', False, 'use Jacobi instead of Gauss-Seidel sweeps '
+     'for PF_ALG = 4, updating all buses at once from the previous iterate'),
+
+    ('pf_nr_lu', 0, '''factorization of the Jacobian in Newton's method:
+0 - factor from scratch at each iteration,
+1 - compute the column ordering once and reuse it,
+2 - same as 1, and also reuse the LU factors for several
+    iterations (chord Newton) while convergence is good'''),
+
+    ('pf_nr_chord_rate', 0.25, 'with PF_NR_LU = 2, refactor the Jacobian '
+     'when the P & Q mismatch falls by less than this factor in an '
+     'iteration'),
+
+    ('pf_nr_damping', 0, '''step length control in Newton's method:
+0 - full Newton steps,
+1 - Iwamoto optimal multiplier,
+2 - backtracking line search on the mismatch norm'''),
+
+    ('enforce_q_lims', 0, '''enforce gen reactive power limits, at
+expense of |V|:
+0 - do not enforce limits,
+1 - re-run power flow with all violating gens converted to PQ,
+2 - same, converting the largest violation only at each run,
+3 - convert violating buses to PQ within the Newton iterations
+    (Newton's method only, other algorithms use 1)'''),
+
+    ('pf_nproc', 1, 'number of processes for solving the power flow of '
+     'the islands of a network in parallel'),
 
     ('pf_dc', False, '''use DC power flow formulation, for power flow and OPF:
 False - use AC formulation & corresponding algorithm opts,
 True  - use DC formulation, ignore AC algorithm options''')
 ]
 
+CPF_OPTIONS = [
+    ('cpf_parameterization', 3, '''parameterization of the continuation
+power flow curve:
+1 - natural (lambda),
+2 - arc length,
+3 - pseudo arc length'''),
+
+    ('cpf_stop_at', 'NOSE', '''where to stop the continuation power flow:
+'NOSE' - stop at the nose point (maximum loadability),
+'FULL' - trace the full curve, back to lambda = 0,
+<lam> - stop at lambda = <lam>, or at the nose if it comes first'''),
+
+    ('cpf_step', 0.05, 'continuation power flow step size'),
+
+    ('cpf_adapt_step', True, 'adapt the continuation power flow step '
+     'size to the predictor error'),
+
+    ('cpf_error_tol', 1e-2, 'tolerance on the predictor error for adaptive '
+     'step size'),
+
+    ('cpf_step_min', 1e-4, 'minimum continuation power flow step size, '
+     'also the resolution of the nose point'),
+
+    ('cpf_step_max', 2.0, 'maximum continuation power flow step size'),
+
+    ('cpf_max_steps', 1000, 'maximum number of continuation power flow '
+     'steps'),
+]
+
 OPF_OPTIONS = [
     ('opf_alg', 0, '''algorithm to use for OPF:
 0 - choose best default solver available in the
@@ -120,7 +180,17 @@ OUTPUT_OPTIONS = [
 #    ('out_raw', False, 'print raw data'),
 
     ('return_raw_der', 0, '''return constraint and derivative info
-in results['raw'] (in keys g, dg, df, d2f))''')
+in results['raw'] (in keys g, dg, df, d2f))'''),
+
+    ('timing', False, '''record the wall time and number of calls of each
+phase of runpf, runopf and their solvers in results['timing']
+(a pptiming recorder given as value accumulates over runs)'''),
+
+    ('iter_callback', None, '''function called after each iteration of
+the power flow solvers and of PIPS for the AC OPF with a dict of the
+solver name ('solver'), the iteration number ('iteration') and solver
+specific progress values, such as mismatch and step norms and times,
+the iterations stop if it returns True (not a command line option)''')
 ]
 
 PDIPM_OPTIONS = [
@@ -175,7 +245,8 @@ def ppoption(ppopt=None, **kw_args):
 
     default_ppopt = {}
 
-    options = PF_OPTIONS + OPF_OPTIONS + OUTPUT_OPTIONS + PDIPM_OPTIONS
+    options = PF_OPTIONS + CPF_OPTIONS + OPF_OPTIONS + OUTPUT_OPTIONS + \
+        PDIPM_OPTIONS
 
     for name, default, _ in options:
         default_ppopt[name.upper()] = default
@@ -0,0 +1,96 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Wall time and call count recorder for the phases of a run.
+"""
+
+from time import time
+
+
+class pptiming(object):
+    """Wall time and call count recorder for the phases of a run.
+
+    Used by L{runpf}, L{runopf}, L{opf}, L{newtonpf} and L{pips} when the
+    C{TIMING} option is set, see L{timing_recorder}. Each phase is timed
+    by taking the start time with L{tic} and adding the time elapsed since
+    with L{toc}, which returns the current time, so that consecutive
+    phases need a single clock reading each::
+
+        t = tm.tic()
+        ppc = ext2int(ppc)
+        t = tm.toc('ext2int', t)
+        Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+        t = tm.toc('makeYbus', t)
+
+    L{summary} returns a dict with, for each phase name, a dict of the
+    total C{'time'} in seconds and the C{'count'} of calls, e.g. the
+    number of Newton iterations for C{'newtonpf.solve'}.
+
+    The same recorder can be given as the value of C{TIMING} to several
+    runs to accumulate their timings, and those of runs in other processes
+    are added with L{add}.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    def tic(self):
+        """Returns the start time of a phase."""
+        return time()
+
+    def toc(self, name, t0):
+        """Adds the time since C{t0} to phase C{name}, returns the time."""
+        t = time()
+        p = self.phases.get(name)
+        if p is None:
+            self.phases[name] = [t - t0, 1]
+        else:
+            p[0] += t - t0
+            p[1] += 1
+        return t
+
+    def summary(self):
+        """Returns the time and number of calls of each phase."""
+        return dict((name, {'time': t, 'count': n})
+                    for name, (t, n) in self.phases.items())
+
+    def add(self, summary):
+        """Adds the times and calls of a L{summary}, e.g. of another
+        process."""
+        for name, p in summary.items():
+            q = self.phases.setdefault(name, [0, 0])
+            q[0] += p['time']
+            q[1] += p['count']
+
+
+class _null_timing(object):
+    """Recorder which records nothing, used when timing is off."""
+
+    def tic(self):
+        return 0
+
+    def toc(self, name, t0):
+        return 0
+
+    def summary(self):
+        return {}
+
+    def add(self, summary):
+        pass
+
+
+NULL_TIMING = _null_timing()
+
+
+def timing_recorder(timing):
+    """Returns the recorder for a value of the C{TIMING} option.
+
+    C{timing} itself if it is a L{pptiming}, a new L{pptiming} if it is
+    otherwise true, and a recorder which does nothing if it is false.
+    """
+    if isinstance(timing, (pptiming, _null_timing)):
+        return timing
+    if timing:
+        return pptiming()
+    return NULL_TIMING
@@ -0,0 +1,285 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Converts a PSS/E RAW file to a PYPOWER case.
+"""
+
+import re
+
+from sys import stderr
+from warnings import catch_warnings, simplefilter
+
+from numpy import array, zeros, full, arange, repeat, cumsum, bincount, \
+    where, isnan, sqrt, maximum, errstate, fromstring, nan, r_, c_
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, GS, BS, BUS_AREA, VM, \
+    VA, BASE_KV, ZONE, VMAX, VMIN
+from pypower.idx_gen import GEN_BUS, PG, QG, QMAX, QMIN, VG, MBASE, \
+    GEN_STATUS, PMAX, PMIN, APF
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, \
+    RATE_B, RATE_C, TAP, SHIFT, BR_STATUS, ANGMIN, ANGMAX
+
+
+## quoted strings, comments, empty fields and the end of sections and file
+_QUOTED = re.compile(r"'[^'\n]*'|\"[^\"\n]*\"")
+_COMMENT = re.compile(r'/[^\n]*')
+_EMPTY = re.compile(r',(?=[ \t]*,)')
+_END_SECTION = re.compile(r'^[ \t]*0[ \t]*(?:/[^\n]*)?$\n?', re.M)
+_END_FILE = re.compile(r'^[ \t]*Q[ \t]*$', re.M)
+
+## sections up to the two-winding transformers, in the order of each version
+SECTIONS = {
+    33: ['bus', 'load', 'fixed shunt', 'generator', 'branch', 'transformer'],
+    34: ['bus', 'load', 'fixed shunt', 'generator', 'branch',
+         'switching device', 'transformer'],
+}
+
+
+def psse2ppc(rawfile):
+    """Converts a PSS/E RAW file to a PYPOWER case.
+
+    Reads the PSS/E RAW file C{rawfile} of version 33 or 34 and returns a
+    version 2 case dict (see L{caseformat}) with C{baseMVA}, C{bus},
+    C{gen}, C{branch} and C{bus_name}, with the PSS/E bus numbers. The
+    bus, load, fixed shunt, generator, non-transformer branch and
+    two-winding transformer data are used:
+
+        - loads are added to the C{PD}, C{QD} of their bus, with their
+          constant current and admittance parts at 1 p.u. voltage
+        - fixed shunts, and the line shunts and magnetizing admittance of
+          branches and transformers, are added to the C{GS}, C{BS} of
+          their bus
+        - transformer impedances given on the winding base (C{CZ} = 2, 3)
+          and winding voltages given in kV or relative to the nominal
+          winding voltage (C{CW} = 2, 3) are converted to the system base,
+          and the off-nominal ratio of winding 2 is moved into the
+          impedance and C{TAP}
+
+    Only records of in-service loads and shunts are used. Three-winding
+    transformers, switched shunts, DC lines, FACTS devices and the other
+    sections are skipped, with a warning for three-winding transformers.
+    The case has no C{gencost}, so it can be used for power flows only.
+
+    Each section is read as a whole: quoted strings and comments are
+    removed with regular expressions, the numbers converted by a single
+    call to C{numpy.fromstring} and the records converted column by column,
+    so that files of tens of thousands of buses take a few seconds. Fields
+    left empty or omitted at the end of a record take their PSS/E default
+    values.
+
+    Raises C{ValueError} if the file is of another version or a record has
+    non numeric fields other than quoted strings.
+
+    @see: L{loadcase}
+    """
+    with open(rawfile) as fd:
+        text = fd.read()
+
+    ## header
+    parts = text.split('\n', 3)
+    if len(parts) < 4:
+        raise ValueError('psse2ppc: %s is not a PSS/E RAW file' % rawfile)
+    header = _COMMENT.sub('', parts[0]).replace(',', ' ').split()
+    baseMVA = float(header[1]) if len(header) > 1 else 100.0
+    rev = int(float(header[2])) if len(header) > 2 else 33
+    if rev not in SECTIONS:
+        raise ValueError('psse2ppc: PSS/E RAW version %d is not supported, '
+                         'only versions %s' % (rev, sorted(SECTIONS)))
+
+    body = _END_FILE.split(parts[3], 1)[0]
+    sections = dict(zip(SECTIONS[rev], _END_SECTION.split(body)))
+
+    def records(name):
+        return _records(sections.get(name, ''))
+
+    ##-----  buses  -----
+    ## I, NAME, BASKV, IDE, AREA, ZONE, OWNER, VM, VA, NVHI, NVLO
+    b = _table(records('bus'), 'bus',
+               [nan, 0, 0, 1, 1, 1, 1, 1, 0, 1.1, 0.9])
+    nb = b.shape[0]
+    bus = zeros((nb, VMIN + 1))
+    bus[:, [BUS_I, BASE_KV, BUS_TYPE, BUS_AREA, ZONE, VM, VA, VMAX, VMIN]] = \
+        b[:, [0, 2, 3, 4, 5, 7, 8, 9, 10]]
+    bus_name = [s[1:-1].strip() for s in
+                _QUOTED.findall(sections.get('bus', ''))]
+
+    ## bus indices of bus numbers
+    e2i = zeros(int(bus[:, BUS_I].max()) + 1 if nb else 1, int)
+    e2i[bus[:, BUS_I].astype(int)] = arange(nb)
+
+    def add(col, i, v):
+        bus[:, col] += bincount(i, weights=v, minlength=nb)
+
+    ##-----  loads  -----
+    ## I, ID, STATUS, AREA, ZONE, PL, QL, IP, IQ, YP, YQ
+    d = _table(records('load'), 'load', [nan, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0])
+    d = d[d[:, 2] != 0]
+    i = e2i[d[:, 0].astype(int)]
+    add(PD, i, d[:, 5] + d[:, 7] + d[:, 9])
+    add(QD, i, d[:, 6] + d[:, 8] - d[:, 10])
+
+    ##-----  fixed shunts  -----
+    ## I, ID, STATUS, GL, BL
+    d = _table(records('fixed shunt'), 'fixed shunt', [nan, 0, 1, 0, 0])
+    d = d[d[:, 2] != 0]
+    i = e2i[d[:, 0].astype(int)]
+    add(GS, i, d[:, 3])
+    add(BS, i, d[:, 4])
+
+    ##-----  generators  -----
+    ## I, ID, PG, QG, QT, QB, VS, IREG, MBASE, ZR, ZX, RT, XT, GTAP, STAT,
+    ## RMPCT, PT, PB
+    d = _table(records('generator'), 'generator', [nan, 0, 0, 0, 9999,
+        -9999, 1, 0, baseMVA, 0, 1, 0, 0, 1, 1, 100, 9999, -9999])
+    gen = zeros((d.shape[0], APF + 1))
+    gen[:, [GEN_BUS, PG, QG, QMAX, QMIN, VG, MBASE, GEN_STATUS, PMAX, PMIN]] \
+        = d[:, [0, 2, 3, 4, 5, 6, 8, 14, 16, 17]]
+
+    ##-----  branches  -----
+    ## I, J, CKT, R, X, B, RATEA, RATEB, RATEC, GI, BI, GJ, BJ, ST
+    ## with NAME and 12 ratings after B in version 34
+    if rev == 33:
+        d = _table(records('branch'), 'branch',
+                   [nan, nan, 0, 0, nan, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+    else:
+        d = _table(records('branch'), 'branch',
+                   [nan, nan, 0, 0, nan, 0, 0] + [0] * 12 + [0, 0, 0, 0, 1])
+        d = d[:, [0, 1, 2, 3, 4, 5, 7, 8, 9, 19, 20, 21, 22, 23]]
+    d[:, 1] = abs(d[:, 1])                  ## negative for the metered end
+    lines = zeros((d.shape[0], ANGMAX + 1))
+    lines[:, [F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, RATE_B, RATE_C]] = \
+        d[:, [0, 1, 3, 4, 5, 6, 7, 8]]
+    lines[:, BR_STATUS] = d[:, 13] != 0
+    on = d[:, 13] != 0
+    for j, k in [(0, 9), (1, 11)]:          ## line shunts at each end
+        i = e2i[d[on, j].astype(int)]
+        add(GS, i, d[on, k] * baseMVA)
+        add(BS, i, d[on, k + 1] * baseMVA)
+
+    ##-----  two-winding transformers  -----
+    xf = _transformers(records('transformer'), baseMVA, bus, e2i, add)
+
+    branch = r_[lines, xf]
+    branch[:, ANGMIN] = -360
+    branch[:, ANGMAX] = 360
+
+    ppc = {'version': '2', 'baseMVA': baseMVA, 'bus': bus, 'gen': gen,
+           'branch': branch}
+    if len(bus_name) == nb:
+        ppc['bus_name'] = bus_name
+
+    return ppc
+
+
+def _transformers(recs, baseMVA, bus, e2i, add):
+    ## converts the two-winding transformers to branches
+
+    ## records have 4 lines, or 5 for three-winding transformers (K != 0)
+    first, n3, k = [], 0, 0
+    while k < len(recs):
+        if float(recs[k].split()[2]) == 0:
+            first.append(k)
+            k += 4
+        else:
+            n3 += 1
+            k += 5
+    if n3:
+        stderr.write('psse2ppc: %d three-winding transformers skipped\n' % n3)
+    first = array(first, int)
+
+    def part(j, defaults):
+        return _table([recs[k] for k in first + j], 'transformer', defaults)
+
+    ## I, J, K, CKT, CW, CZ, CM, MAG1, MAG2, NMETR, NAME, STAT
+    d1 = part(0, [nan, nan, 0, 0, 1, 1, 1, 0, 0, 2, 0, 1])
+    ## R1-2, X1-2, SBASE1-2
+    d2 = part(1, [0, nan, baseMVA])
+    ## WINDV1, NOMV1, ANG1, RATA1, RATB1, RATC1 (RATE1-1 to 3 in version 34)
+    d3 = part(2, [nan, 0, 0, 0, 0, 0])
+    ## WINDV2, NOMV2
+    d4 = part(3, [nan, 0])
+
+    fbus, tbus = d1[:, 0], abs(d1[:, 1])
+    cw, cz, cm = d1[:, 4], d1[:, 5], d1[:, 6]
+    kvf = bus[e2i[fbus.astype(int)], BASE_KV]
+    kvt = bus[e2i[tbus.astype(int)], BASE_KV]
+    nomv1 = where(d3[:, 1] == 0, kvf, d3[:, 1])
+    nomv2 = where(d4[:, 1] == 0, kvt, d4[:, 1])
+
+    with errstate(divide='ignore', invalid='ignore'):
+        ## winding voltages in p.u. of the bus base voltages
+        def windv(v, nomv, kv):
+            v = where(isnan(v), where(cw == 2, kv, 1), v)
+            v = where(cw == 2, v / kv, where(cw == 3, v * nomv / kv, v))
+            return where(isnan(v) | (v == 0), 1, v)
+        w1 = windv(d3[:, 0], nomv1, kvf)
+        w2 = windv(d4[:, 0], nomv2, kvt)
+
+        ## impedance on the system base
+        sbase = d2[:, 2]
+        r, x = d2[:, 0].copy(), d2[:, 1].copy()
+        loss = cz == 3                  ## load loss in W and |Z|
+        r[loss] = r[loss] / (1e6 * sbase[loss])
+        x[loss] = sqrt(maximum(x[loss]**2 - r[loss]**2, 0))
+        scale = where(cz == 1, 1, baseMVA / sbase *
+                      where(kvf > 0, (nomv1 / kvf)**2, 1))
+        r, x = r * scale * w2**2, x * scale * w2**2
+
+        ## magnetizing admittance, in p.u. on the system base
+        g, b = d1[:, 7].copy(), d1[:, 8].copy()
+        loss = cm == 2                  ## no load loss in W and |I|
+        g[loss] = d1[loss, 7] / (1e6 * baseMVA)
+        b[loss] = -sqrt(maximum((d1[loss, 8] * sbase[loss] / baseMVA)**2 -
+                                g[loss]**2, 0))
+
+    on = d1[:, 11] != 0
+    i = e2i[fbus[on].astype(int)]
+    add(GS, i, g[on] * baseMVA)
+    add(BS, i, b[on] * baseMVA)
+
+    xf = zeros((len(first), ANGMAX + 1))
+    xf[:, F_BUS], xf[:, T_BUS] = fbus, tbus
+    xf[:, BR_R], xf[:, BR_X] = r, x
+    xf[:, [RATE_A, RATE_B, RATE_C]] = d3[:, 3:6]
+    xf[:, TAP] = w1 / w2
+    xf[:, SHIFT] = d3[:, 2]
+    xf[:, BR_STATUS] = on
+
+    return xf
+
+
+def _records(text):
+    ## lines of the records of a section, with quoted strings replaced by 0,
+    ## empty fields by nan and without comments and commas
+    text = _QUOTED.sub(' 0 ', text)
+    text = _COMMENT.sub('', text)
+    text = _EMPTY.sub(', nan', text).replace(',', ' ')
+    return [l for l in text.split('\n') if l.strip()]
+
+
+def _table(recs, name, defaults):
+    ## converts record lines to an array with a column for each default
+    n, ncols = len(recs), len(defaults)
+    if n == 0:
+        return zeros((0, ncols))
+
+    counts = array([len(l.split()) for l in recs])
+    with catch_warnings():              ## stops at non numeric fields
+        simplefilter('ignore', DeprecationWarning)
+        a = fromstring(' '.join(recs), sep=' ')
+    if a.size != counts.sum():
+        raise ValueError('psse2ppc: invalid %s data' % name)
+
+    if (counts == counts[0]).all():
+        t = a.reshape((n, counts[0]))
+    else:                               ## records of different lengths
+        t = full((n, counts.max()), nan)
+        t[repeat(arange(n), counts),
+          arange(a.size) - repeat(cumsum(counts) - counts, counts)] = a
+
+    if t.shape[1] < ncols:
+        t = c_[t, full((n, ncols - t.shape[1]), nan)]
+    t = t[:, :ncols]
+
+    return where(isnan(t), array(defaults, float), t)
@@ -0,0 +1,359 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a continuation power flow.
+"""
+
+from sys import stdout, stderr
+
+from time import time
+
+from numpy import angle, array, zeros, exp, pi, r_, c_, ix_, dot, linalg, Inf
+from numpy import flatnonzero as find
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.makeSbus import makeSbus
+from pypower.makeYbus import makeYbus
+from pypower.jac_builder import jac_builder
+from pypower.newtonpf import newtonpf
+from pypower.cpf_predictor import cpf_predictor
+from pypower.cpf_corrector import cpf_corrector
+from pypower.pfsoln import pfsoln
+from pypower.printpf import printpf
+from pypower.savecase import savecase
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_brch import PF, PT, QF, QT
+from pypower.idx_gen import PG, QG, VG, GEN_BUS, GEN_STATUS
+
+
+def runcpf(basecasedata, targetcasedata, ppopt=None, fname='', solvedcase=''):
+    """Runs a continuation power flow.
+
+    Traces the curve of power flow solutions as the bus injections vary
+    from those of the base case C{basecasedata} (C{lam = 0}) towards those
+    of the target case C{targetcasedata} (C{lam = 1}), using a tangent
+    predictor and a Newton corrector on the power flow equations augmented
+    with a parameterization of the curve (see L{cpf_p}). The two cases
+    (file names or dicts, see L{loadcase}) must have the same buses,
+    branches and generators, and may differ only by their loads and
+    generator real power outputs. Q limits are not enforced.
+
+    The C{CPF_*} options select the parameterization, the step size and its
+    adaptation, and where to stop (see L{ppoption}). By default the step
+    size follows the predictor error, growing while the corrector
+    converges in at most 2 iterations, and is halved when the corrector
+    fails. With the default C{CPF_STOP_AT = 'NOSE'}, once a step goes past
+    the nose of the curve, where C{lam} decreases along the tangent, the
+    nose is located between the last two points by secant steps, so that
+    the loadability margin C{max_lam} is found to C{CPF_STEP_MIN}. With
+    the natural parameterization, which cannot go past the nose, the step
+    is halved down to C{CPF_STEP_MIN} instead. The power flow options
+    C{PF_TOL} and C{PF_MAX_IT} are used for the base case solution and for
+    the corrector.
+
+    Returns the solved case at the last point of the curve, with the loads
+    and generation at that point, and a flag which is C{True} if the base
+    case was solved. The results also have a C{'cpf'} key, a dict with:
+        - C{V} - C{npts x nb} array of complex bus voltages at each point
+        of the curve (external bus ordering, zero at isolated buses)
+        - C{lam} - vector of C{lam} at each point
+        - C{max_lam} - maximum value of C{lam} (loadability margin)
+        - C{steps} - number of continuation steps taken
+        - C{iterations} - total number of Jacobian factorizations
+
+    The printed output and the solved case, if C{fname} and C{solvedcase}
+    are given, are those of the last point, as for L{runpf}.
+
+    Example::
+        results, success = runcpf(base, target)
+        margin = results['cpf']['max_lam']
+
+    @see: L{runpf}, L{cpf_predictor}, L{cpf_corrector}
+    """
+    ppopt = ppoption(ppopt)
+
+    ## options
+    verbose = ppopt['VERBOSE']
+    parameterization = ppopt['CPF_PARAMETERIZATION']
+    stop_at   = ppopt['CPF_STOP_AT']
+    step      = ppopt['CPF_STEP']
+    adapt     = ppopt['CPF_ADAPT_STEP']
+    error_tol = ppopt['CPF_ERROR_TOL']
+    step_min  = ppopt['CPF_STEP_MIN']
+    step_max  = ppopt['CPF_STEP_MAX']
+    max_steps = ppopt['CPF_MAX_STEPS']
+    ppopt_pf = ppoption(ppopt, VERBOSE=0)
+
+    if isinstance(stop_at, str) and stop_at.upper() not in ('NOSE', 'FULL'):
+        raise ValueError("runcpf: CPF_STOP_AT must be 'NOSE', 'FULL' or a "
+                         "value of lambda.")
+    lam_stop = None if isinstance(stop_at, str) else stop_at
+    full = isinstance(stop_at, str) and stop_at.upper() == 'FULL'
+
+    t0 = time()
+
+    ## read base and target cases and convert to internal indexing
+    ppcb = loadcase(basecasedata)
+    ppct = ext2int(loadcase(targetcasedata))
+
+    ## add zero columns to branch for flows if needed
+    if ppcb["branch"].shape[1] < QT:
+        ppcb["branch"] = c_[ppcb["branch"],
+                            zeros((ppcb["branch"].shape[0],
+                                   QT - ppcb["branch"].shape[1] + 1))]
+
+    ppcb = ext2int(ppcb)
+    baseMVA, bus, gen, branch = \
+        ppcb["baseMVA"], ppcb["bus"], ppcb["gen"], ppcb["branch"]
+    bust, gent = ppct["bus"], ppct["gen"]
+    if bust.shape[0] != bus.shape[0] or gent.shape[0] != gen.shape[0] or \
+            ppct["branch"].shape[0] != branch.shape[0]:
+        raise ValueError('runcpf: base and target cases must have the same '
+                         'buses, branches and generators.')
+
+    o = ppcb["order"]
+    nb0 = o["ext"]["bus"].shape[0]
+    bus_on = o["bus"]["status"]["on"]
+
+    ## get bus index lists of each type of bus
+    ref, pv, pq = bustypes(bus, gen)
+
+    ## generator info
+    on = find(gen[:, GEN_STATUS] > 0)      ## which generators are on?
+    gbus = gen[on, GEN_BUS].astype(int)    ## what buses are they at?
+
+    ## network, base injections and transfer direction
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    jac = jac_builder(Ybus, pv, pq)
+    Sbusb = makeSbus(baseMVA, bus, gen)
+    Sxfr = makeSbus(baseMVA, bust, gent) - Sbusb
+
+    ## initial state
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
+
+    ## base case power flow
+    V, success, iterations = newtonpf(Ybus, Sbusb, V0, ref, pv, pq, ppopt_pf)
+    if not success and verbose:
+        stderr.write('runcpf: base case power flow did not converge\n')
+
+    pvpq = r_[pv, pq]
+    def state(V, lam):
+        return r_[angle(V[pvpq]), abs(V[pq]), lam]
+
+    ## trace the curve, starting along increasing lam
+    lam = 0.0
+    z = zeros(len(pvpq) + len(pq) + 1)
+    z[-1] = 1
+    Vprv, lamprv = V, lam
+    Vs, lams = [V], [lam]
+    steps = 0
+    prvstep = step
+    continuation = success
+    while continuation and steps < max_steps:
+        ## tangent at the current point and prediction for next step
+        V0, lam0, z0 = cpf_predictor(V, lam, jac, Sxfr, pv, pq, step, z,
+                                     Vprv, lamprv, parameterization)
+        iterations = iterations + 1
+
+        ## the last step went past the nose if lam decreases along the
+        ## tangent, locate the nose between the last two points
+        if z0[-1] < 0 and steps > 0 and not full:
+            V, lam, it = _cpf_nose(jac, Sbusb, ref, pv, pq, Sxfr,
+                                   Vprv, lamprv, z, V, lam, z0, prvstep,
+                                   step_min, ppopt_pf)
+            iterations = iterations + it
+            Vs[-1], lams[-1] = V, lam
+            break
+
+        ## correction, at lam_stop exactly if the prediction goes past it
+        if lam_stop is not None and lam0 > lam_stop:
+            Vc, ok, it, lamc = cpf_corrector(jac, Sbusb, V0, ref, pv, pq,
+                                             lam_stop, Sxfr, V, lam, z0,
+                                             lam_stop - lam, 1, ppopt_pf)
+            continuation = not ok
+        else:
+            Vc, ok, it, lamc = cpf_corrector(jac, Sbusb, V0, ref, pv, pq,
+                                             lam0, Sxfr, V, lam, z0, step,
+                                             parameterization, ppopt_pf)
+        iterations = iterations + it
+
+        ## not converged, retry with a smaller step, or stop at the
+        ## current point (the nose for the natural parameterization)
+        if not ok:
+            if step > step_min:
+                step = max(step / 2, step_min)
+                continuation = True
+            else:
+                continuation = False
+            continue
+
+        ## accept the new point
+        Vprv, lamprv, z = V, lam, z0
+        V, lam = Vc, lamc
+        Vs.append(V)
+        lams.append(lam)
+        steps = steps + 1
+        prvstep = step
+        if verbose > 1:
+            stdout.write('step %3d : lambda = %.6f, %2d corrector '
+                         'iterations\n' % (steps, lam, it))
+
+        ## back to lam = 0 on the lower part of the curve
+        if full and lam < 0:
+            V, ok, it, lam = cpf_corrector(jac, Sbusb, V, ref, pv, pq, 0.0,
+                                           Sxfr, Vprv, lamprv, z, -lamprv, 1,
+                                           ppopt_pf)
+            iterations = iterations + it
+            Vs[-1], lams[-1] = V, lam
+            break
+
+        ## adapt step size to the predictor error, growing it back while
+        ## the corrector converges quickly
+        if adapt:
+            err = linalg.norm(state(V, lam) - state(V0, lam0), Inf)
+            new = step * error_tol / err if err > 0 else step_max
+            if it > 2:
+                new = min(new, step)
+            step = min(max(new, step_min), step_max)
+        elif it <= 2:
+            step = min(2 * step, ppopt['CPF_STEP'])
+
+    if verbose:
+        stdout.write('\nContinuation power flow: %d steps, max lambda = %g, '
+                     '%.2f seconds.\n' % (steps, max(lams), time() - t0))
+
+    ## loads and generation at the last point
+    bus[:, [PD, QD]] = bus[:, [PD, QD]] + \
+        lam * (bust[:, [PD, QD]] - bus[:, [PD, QD]])
+    gen[:, PG] = gen[:, PG] + lam * (gent[:, PG] - gen[:, PG])
+
+    ## update data matrices with solution
+    bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V,
+                              ref, pv, pq)
+
+    ppcb["et"] = time() - t0
+    ppcb["success"] = success
+
+    ##-----  output results  -----
+    ## convert back to original bus numbering & print results
+    ppcb["bus"], ppcb["gen"], ppcb["branch"] = bus, gen, branch
+    results = int2ext(ppcb)
+
+    ## zero out result fields of out-of-service gens & branches
+    if len(results["order"]["gen"]["status"]["off"]) > 0:
+        results["gen"][ix_(results["order"]["gen"]["status"]["off"], [PG, QG])] = 0
+
+    if len(results["order"]["branch"]["status"]["off"]) > 0:
+        results["branch"][ix_(results["order"]["branch"]["status"]["off"], [PF, QF, PT, QT])] = 0
+
+    ## points of the curve, in external bus ordering
+    Vext = zeros((len(Vs), nb0), complex)
+    Vext[:, bus_on] = array(Vs)
+    results["cpf"] = {
+        'V': Vext,
+        'lam': array(lams),
+        'max_lam': max(lams),
+        'steps': steps,
+        'iterations': iterations,
+    }
+
+    if fname:
+        fd = None
+        try:
+            fd = open(fname, "a")
+        except Exception as detail:
+            stderr.write("Error opening %s: %s.\n" % (fname, detail))
+        finally:
+            if fd is not None:
+                printpf(results, fd, ppopt)
+                fd.close()
+    else:
+        printpf(results, stdout, ppopt)
+
+    ## save solved case
+    if solvedcase:
+        savecase(solvedcase, results)
+
+    return results, success
+
+
+def _cpf_nose(jac, Sbusb, ref, pv, pq, Sxfr, Va, lama, za, Vb, lamb, zb, s,
+              tol, ppopt):
+    """Locates the nose of the continuation power flow curve.
+
+    The solutions C{(Va, lama)} and C{(Vb, lamb)}, with tangents C{za} and
+    C{zb}, are on either side of the nose, at a pseudo arc length C{s}
+    along C{za} from each other. The nose is where the derivative of
+    C{lam} along the curve is zero. It is located by secant (Illinois)
+    steps on that derivative, each one a corrector at a given pseudo arc
+    length from C{(Va, lama)}, until C{lam} is estimated to be within
+    C{tol} of its maximum. Returns the voltages and C{lam} of the solution
+    found with the largest C{lam}, and the number of Jacobian
+    factorizations.
+    """
+    pvpq = r_[pv, pq]
+    npvpq = len(pvpq)
+
+    def x(V, lam):
+        return r_[angle(V[pvpq]), abs(V[pq]), lam]
+
+    ## derivative of lam with respect to the pseudo arc length along za
+    def slope(z):
+        return z[-1] / dot(z, za)
+
+    ## ends of the bracket, position along za and slope, with the weights
+    ## of their slopes in the secant steps
+    ends = [(Va, lama, 0.0, za[-1]), (Vb, lamb, s, slope(zb))]
+    w = [1.0, 1.0]
+    best = max(ends, key=lambda e: e[1])
+    last = None
+    iterations = 0
+    for _ in range(ppopt['PF_MAX_IT']):
+        (V1, lam1, s1, g1), (V2, lam2, s2, g2) = ends
+        f = w[0] * g1 / (w[0] * g1 - w[1] * g2)
+
+        ## initial guess on the chord between the two ends
+        x0 = x(V1, lam1) + f * (x(V2, lam2) - x(V1, lam1))
+        Vm = abs(V1)
+        Vm[pq] = x0[npvpq:-1]
+        Vang = angle(V1)
+        Vang[pvpq] = x0[:npvpq]
+        V, ok, it, lam = cpf_corrector(jac, Sbusb, Vm * exp(1j * Vang), ref,
+                                       pv, pq, x0[-1], Sxfr, Va, lama, za,
+                                       s1 + f * (s2 - s1), 3, ppopt)
+        iterations = iterations + it
+        if not ok:
+            break
+        _, _, z = cpf_predictor(V, lam, jac, Sxfr, pv, pq, 0, za, Va, lama, 3)
+        iterations = iterations + 1
+        g = slope(z)
+
+        ## replace the end on the same side, halving the weight of the
+        ## other one if it is kept twice in a row
+        k = 0 if g > 0 else 1
+        _, _, sk, gk = ends[k]
+        ends[k] = (V, lam, s1 + f * (s2 - s1), g)
+        w[k] = 1.0
+        if k == last:
+            w[1 - k] = w[1 - k] / 2
+        last = k
+        if lam > best[1]:
+            best = ends[k]
+
+        ## distance to the nose, for lam quadratic in the arc length, with
+        ## the smaller of the rates of change of the slope across the
+        ## bracket and on the side of the new point
+        kappa = (ends[0][3] - ends[1][3]) / (ends[1][2] - ends[0][2])
+        if (gk - g) * (ends[k][2] - sk) > 0:
+            kappa = min(kappa, (gk - g) / (ends[k][2] - sk))
+        if g * g / (2 * kappa) < tol:
+            break
+
+    return best[0], best[1], iterations
@@ -13,6 +13,7 @@ from pypower.ppoption import ppoption
 from pypower.opf import opf
 from pypower.printpf import printpf
 from pypower.savecase import savecase
+from pypower.pptiming import timing_recorder, NULL_TIMING
 
 
 def runopf(casedata=None, ppopt=None, fname='', solvedcase=''):
@@ -26,9 +27,12 @@ def runopf(casedata=None, ppopt=None, fname='', solvedcase=''):
     if casedata is None:
         casedata = join(dirname(__file__), 'case9')
     ppopt = ppoption(ppopt)
+    tm = timing_recorder(ppopt['TIMING'])
+    ppopt['TIMING'] = tm
 
     ##-----  run the optimal power flow  -----
     r = opf(casedata, ppopt)
+    t = tm.tic()
 
     ##-----  output results  -----
     if fname:
@@ -44,10 +48,15 @@ def runopf(casedata=None, ppopt=None, fname='', solvedcase=''):
 
     else:
         printpf(r, stdout, ppopt)
+    t = tm.toc('printpf', t)
 
     ## save solved case
     if solvedcase:
         savecase(solvedcase, r)
+        t = tm.toc('savecase', t)
+
+    if tm is not NULL_TIMING:
+        r['timing'] = tm.summary()
 
     return r
 
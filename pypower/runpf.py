@@ -11,11 +11,18 @@ from os.path import dirname, join
 
 from time import time
 
-from numpy import r_, c_, ix_, zeros, pi, ones, exp, argmax
+from multiprocessing import Pool
+
+from numpy import \
+    r_, c_, ix_, zeros, pi, ones, exp, argmax, setdiff1d, union1d, isin, \
+    unique
 from numpy import flatnonzero as find
 
+from scipy.sparse import csr_matrix as sparse
+
 from pypower.bustypes import bustypes
 from pypower.ext2int import ext2int
+from pypower.find_islands import find_islands
 from pypower.loadcase import loadcase
 from pypower.ppoption import ppoption
 from pypower.ppver import ppver
@@ -26,14 +33,16 @@ from pypower.makeYbus import makeYbus
 from pypower.newtonpf import newtonpf
 from pypower.fdpf import fdpf
 from pypower.gausspf import gausspf
+from pypower.bfswpf import bfswpf
 from pypower.makeB import makeB
 from pypower.pfsoln import pfsoln
 from pypower.printpf import printpf
 from pypower.savecase import savecase
 from pypower.int2ext import int2ext
+from pypower.pptiming import timing_recorder, NULL_TIMING
 
-from pypower.idx_bus import PD, QD, VM, VA, GS, BUS_TYPE, PQ, REF
-from pypower.idx_brch import PF, PT, QF, QT
+from pypower.idx_bus import PD, QD, VM, VA, GS, BUS_TYPE, PV, PQ, REF
+from pypower.idx_brch import F_BUS, PF, PT, QF, QT
 from pypower.idx_gen import PG, QG, VG, QMAX, QMIN, GEN_BUS, GEN_STATUS
 
 
@@ -56,7 +65,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     ends with '.mat' it saves the case as a MAT-file otherwise it saves it
     as a Python-file.
 
-    If the C{ENFORCE_Q_LIMS} options is set to C{True} [default is false] then
+    If the C{ENFORCE_Q_LIMS} option is set [default is 0] then
     if any generator reactive power limit is violated after running the AC
     power flow, the corresponding bus is converted to a PQ bus, with Qg at
     the limit, and the case is re-run. The voltage magnitude at the bus
@@ -69,12 +78,29 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     Enforcing of generator Q limits inspired by contributions from Mu Lin,
     Lincoln University, New Zealand (1/14/05).
 
+    If the in-service branches split the network into several islands (see
+    L{find_islands}), the power flow of each island with in-service
+    generators is solved separately, in parallel if the C{PF_NPROC} option
+    is greater than 1. In an island without a reference bus, the first PV
+    bus becomes the reference, as when the reference bus is shut down, and
+    its type is C{REF} in the results. The islands without generation are
+    de-energized, with zero voltages, generator outputs and branch flows.
+    C{success} is then C{True} if all energized islands converged.
+
+    If the C{TIMING} option is set, the wall time and number of calls of
+    each phase (C{loadcase}, C{ext2int}, C{makeYbus}, the solver and its
+    iterations, C{pfsoln}, C{int2ext}, C{printpf}, ...) are returned in
+    C{results['timing']}, see L{pptiming}.
+
     @author: Ray Zimmerman (PSERC Cornell)
     """
     ## default arguments
     if casedata is None:
         casedata = join(dirname(__file__), 'case9')
     ppopt = ppoption(ppopt)
+    tm = timing_recorder(ppopt["TIMING"])
+    ppopt["TIMING"] = tm                ## passed on to the solvers
+    t = tm.tic()
 
     ## options
     verbose = ppopt["VERBOSE"]
@@ -89,9 +115,11 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
         ppc["branch"] = c_[ppc["branch"],
                            zeros((ppc["branch"].shape[0],
                                   QT - ppc["branch"].shape[1] + 1))]
+    t = tm.toc('loadcase', t)
 
     ## convert to internal indexing
     ppc = ext2int(ppc)
+    t = tm.toc('ext2int', t)
     baseMVA, bus, gen, branch = \
         ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
 
@@ -104,11 +132,18 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
 
     ##-----  run the power flow  -----
     t0 = time()
+    t = tm.tic()
     if verbose > 0:
         v = ppver('all')
         stdout.write('PYPOWER Version %s, %s' % (v["Version"], v["Date"]))
 
-    if dc:                               # DC formulation
+    islands = find_islands(bus, branch)
+    if len(islands) > 1:                 ## solve islands separately
+        if verbose:
+            stdout.write(' -- %d islands\n' % len(islands))
+        success = _runpf_islands(baseMVA, bus, gen, branch, islands, ppopt)
+        t = tm.toc('islands', t)
+    elif dc:                             # DC formulation
         if verbose:
             stdout.write(' -- DC Power Flow\n')
 
@@ -140,6 +175,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
             temp = find(gbus == ref[k])
             refgen[k] = on[temp[0]]
         gen[refgen, PG] = gen[refgen, PG] + (B[ref, :] * Va - Pbus[ref]) * baseMVA
+        t = tm.toc('dcpf', t)
 
         success = 1
     else:                                ## AC formulation
@@ -153,6 +189,8 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 solver = 'fast-decoupled, BX'
             elif alg == 4:
                 solver = 'Gauss-Seidel'
+            elif alg == 5:
+                solver = 'backward/forward sweep'
             else:
                 solver = 'unknown'
             print(' -- AC Power Flow (%s)\n' % solver)
@@ -162,6 +200,13 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
         V0  = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
         V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
 
+        ## Newton's method can enforce Q limits within its iterations
+        qlim_nr = qlim == 3 and alg == 1
+        if qlim_nr:
+            qlim = 0
+            Cg = sparse((ones(len(on)), (gbus, range(len(on)))),
+                        (bus.shape[0], len(on)))
+
         if qlim:
             ref0 = ref                         ## save index and angle of
             Varef0 = bus[ref0, VA]             ##   original reference bus(es)
@@ -171,27 +216,48 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
         repeat = True
         while repeat:
             ## build admittance matrices
+            t = tm.tic()
             Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+            t = tm.toc('makeYbus', t)
 
             ## compute complex bus power injections [generation - load]
             Sbus = makeSbus(baseMVA, bus, gen)
+            t = tm.toc('makeSbus', t)
 
             ## run the power flow
             alg = ppopt["PF_ALG"]
-            if alg == 1:
+            if alg == 1 and qlim_nr:
+                ## bus reactive injection limits, in p.u.
+                Qmin = (Cg * gen[on, QMIN] - bus[:, QD]) / baseMVA
+                Qmax = (Cg * gen[on, QMAX] - bus[:, QD]) / baseMVA
+                V, success, _, limited = newtonpf(Ybus, Sbus, V0, ref, pv, pq,
+                                                  ppopt, (Qmin, Qmax))
+                bus[limited, BUS_TYPE] = PQ
+                pv = setdiff1d(pv, limited)
+                pq = union1d(pq, limited)
+                t = tm.toc('newtonpf', t)
+            elif alg == 1:
                 V, success, _ = newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+                t = tm.toc('newtonpf', t)
             elif alg == 2 or alg == 3:
                 Bp, Bpp = makeB(baseMVA, bus, branch, alg)
                 V, success, _ = fdpf(Ybus, Sbus, V0, Bp, Bpp, ref, pv, pq, ppopt)
+                t = tm.toc('fdpf', t)
             elif alg == 4:
                 V, success, _ = gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+                t = tm.toc('gausspf', t)
+            elif alg == 5:
+                V, success, _ = bfswpf(Ybus, Sbus, V0, Yf, Yt, branch,
+                                       ref, pv, pq, ppopt)
+                t = tm.toc('bfswpf', t)
             else:
-                stderr.write('Only Newton''s method, fast-decoupled, and '
-                             'Gauss-Seidel power flow algorithms currently '
-                             'implemented.\n')
+                stderr.write('Only Newton''s method, fast-decoupled, '
+                             'Gauss-Seidel and backward/forward sweep power '
+                             'flow algorithms currently implemented.\n')
 
             ## update data matrices with solution
             bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, pv, pq)
+            t = tm.toc('pfsoln', t)
 
             if qlim:             ## enforce generator Q limits
                 ## find gens with violated Q constraints
@@ -282,6 +348,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
     ##-----  output results  -----
     ## convert back to original bus numbering & print results
     ppc["bus"], ppc["gen"], ppc["branch"] = bus, gen, branch
+    t = tm.tic()
     results = int2ext(ppc)
 
     ## zero out result fields of out-of-service gens & branches
@@ -290,6 +357,7 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
 
     if len(results["order"]["branch"]["status"]["off"]) > 0:
         results["branch"][ix_(results["order"]["branch"]["status"]["off"], [PF, QF, PT, QT])] = 0
+    t = tm.toc('int2ext', t)
 
     if fname:
         fd = None
@@ -303,13 +371,103 @@ def runpf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 fd.close()
     else:
         printpf(results, stdout, ppopt)
+    t = tm.toc('printpf', t)
 
     ## save solved case
     if solvedcase:
         savecase(solvedcase, results)
+        t = tm.toc('savecase', t)
+
+    if tm is not NULL_TIMING:
+        results["timing"] = tm.summary()
 
     return results, success
 
 
+def _runpf_islands(baseMVA, bus, gen, branch, islands, ppopt):
+    """Solves the power flow of each island, updating the data in place.
+
+    Islands with in-service generators are solved as separate cases by
+    L{runpf}, in C{PF_NPROC} processes, the others are de-energized. In
+    an island without a reference bus, the first PV bus becomes one. If the
+    C{ITER_CALLBACK} option is set, the islands are solved in this process,
+    one after the other, so that it is called. The timings of the other
+    processes are added to the C{TIMING} recorder. Returns C{True} if all
+    solved islands converged.
+    """
+    gbus = gen[:, GEN_BUS].astype(int)
+    fbus = branch[:, F_BUS].astype(int)
+    on = gen[:, GEN_STATUS] > 0
+    pfopt = ppoption(ppopt, VERBOSE=0, OUT_ALL=0)
+
+    cases, rows = [], []
+    for ib in islands:
+        ig = find(isin(gbus, ib))
+        il = find(isin(fbus, ib))
+        gb = unique(gbus[ig[on[ig]]])       ## buses of in-service gens
+        if len(gb) > 0:
+            if not any(bus[ib, BUS_TYPE] == REF):
+                ## pick a new reference bus, as bustypes does
+                pv = gb[bus[gb, BUS_TYPE] == PV]
+                ref = pv[0] if len(pv) > 0 else gb[0]
+                if ppopt['VERBOSE']:
+                    stdout.write('Island of %d buses without reference bus, '
+                                 'using a PV bus\n' % len(ib))
+                bus[ref, BUS_TYPE] = REF
+            ## bus numbers stay the internal ones of the whole network
+            cases.append({'version': '2', 'baseMVA': baseMVA,
+                          'bus': bus[ib], 'gen': gen[ig], 'branch': branch[il]})
+            rows.append((ib, ig, il))
+        else:
+            if ppopt['VERBOSE']:
+                stdout.write('De-energizing island of %d buses without '
+                             'generation\n' % len(ib))
+            bus[ib, VM] = 0
+            bus[ib, VA] = 0
+            gen[ig, PG] = 0
+            gen[ig, QG] = 0
+            branch[ix_(il, [PF, QF, PT, QT])] = 0
+
+    nproc = min(ppopt['PF_NPROC'], len(cases))
+    if ppopt['ITER_CALLBACK'] is not None:
+        nproc = 1           ## solved here, so that the callback is called
+    tm = ppopt['TIMING']
+    if nproc > 1:
+        ## functions cannot be sent to the other processes
+        for k, v in pfopt.items():
+            if callable(v):
+                pfopt[k] = None
+        ## timings of the other processes are added to this recorder
+        pfopt['TIMING'] = tm is not NULL_TIMING
+
+    args = [(ppc, pfopt) for ppc in cases]
+    if nproc > 1:
+        pool = Pool(nproc)
+        try:
+            out = pool.map(_runpf_island, args)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        out = [_runpf_island(arg) for arg in args]
+
+    for (ib, ig, il), (r, success) in zip(rows, out):
+        bus[ib], gen[ig], branch[il] = r['bus'], r['gen'], r['branch']
+        if nproc > 1:
+            tm.add(r['timing'])
+
+    return len(out) > 0 and all(success for _, success in out)
+
+
+def _runpf_island(args):
+    """Runs the power flow of one island, without output.
+    """
+    ppc, ppopt = args
+    r, success = runpf(ppc, ppopt)
+
+    return {'bus': r['bus'], 'gen': r['gen'], 'branch': r['branch'],
+            'timing': r.get('timing', {})}, success
+
+
 if __name__ == '__main__':
     runpf()
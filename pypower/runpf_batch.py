@@ -0,0 +1,176 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a batch of Newton power flows on a common network.
+"""
+
+from sys import stdout
+
+from time import time
+
+from numpy import atleast_2d, zeros, ones, angle, exp, conj, pi, c_
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+from scipy.sparse.linalg import spsolve
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.makeYbus import makeYbus
+from pypower.jac_builder import jac_builder
+
+from pypower.idx_bus import PD as PD_COL, QD as QD_COL, VM, VA
+from pypower.idx_gen import PG as PG_COL, QG, VG, GEN_BUS, GEN_STATUS
+
+
+def runpf_batch(casedata, ppopt=None, Sbus=None, PD=None, QD=None, PG=None):
+    """Runs a batch of Newton power flows on a common network.
+
+    Solves the AC power flow of the case C{casedata} (a case file name or
+    dict, see L{loadcase}) for C{ns} load/generation scenarios at once.
+    The case is loaded, converted to internal indexing and its C{Ybus}
+    built only once. Mismatches for all scenarios are evaluated together
+    with one sparse matrix product per iteration, so that the per scenario
+    cost is dominated by the Jacobian factorization.
+
+    The scenarios are given either as an C{ns x nb} array C{Sbus} of
+    complex bus power injections (generation - load) in p.u., or by any
+    combination of the C{ns x nb} arrays C{PD}, C{QD} of bus real and
+    reactive demand in MW/MVAr and the C{ns x ng} array C{PG} of generator
+    real power output in MW. Columns follow the rows of the C{bus} and
+    C{gen} matrices of the case as given (external ordering). Quantities
+    not given are taken from the case. If C{Sbus} is given, C{PD}, C{QD}
+    and C{PG} are ignored. A 1-d array is treated as a single scenario.
+
+    Voltages are initialized from the case, with generator set points
+    applied, for every scenario. The options C{PF_TOL}, C{PF_MAX_IT} and
+    C{VERBOSE} from C{ppopt} are used; C{PF_ALG} is ignored.
+
+    Returns the C{ns x nb} array of complex bus voltages (in external bus
+    ordering, zero at isolated buses), a vector of flags which are C{True}
+    for the scenarios that converged and a vector with the number of
+    iterations performed for each scenario.
+
+    Example::
+        V, success, iterations = runpf_batch('case30', PD=PD, QD=QD)
+
+    @see: L{runpf}, L{newtonpf}
+    """
+    ppopt = ppoption(ppopt)
+
+    ## options
+    tol     = ppopt['PF_TOL']
+    max_it  = ppopt['PF_MAX_IT']
+    verbose = ppopt['VERBOSE']
+
+    t0 = time()
+
+    ## read data and convert to internal indexing
+    ppc = ext2int(loadcase(casedata))
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    o = ppc["order"]
+    nb = bus.shape[0]
+    nb0 = o["ext"]["bus"].shape[0]
+    bus_on = o["bus"]["status"]["on"]
+    gen_on = o["gen"]["status"]["on"][o["gen"]["e2i"]] ## ext row of int gen
+
+    ## get bus index lists of each type of bus
+    ref, pv, pq = bustypes(bus, gen)
+
+    ## generator info
+    on = find(gen[:, GEN_STATUS] > 0)      ## which generators are on?
+    gbus = gen[on, GEN_BUS].astype(int)    ## what buses are they at?
+    ngon = len(on)
+    Cg = sparse((ones(ngon), (gbus, range(ngon))), (nb, ngon))
+
+    ## stack of complex bus power injections, one scenario per row
+    if Sbus is not None:
+        S = atleast_2d(Sbus)[:, bus_on].astype(complex)
+    else:
+        ns = max([atleast_2d(x).shape[0]
+                  for x in (PD, QD, PG) if x is not None] or [1])
+        Pd = bus[:, PD_COL] * ones((ns, 1))
+        Qd = bus[:, QD_COL] * ones((ns, 1))
+        Pg = gen[on, PG_COL] * ones((ns, 1))
+        if PD is not None:
+            Pd = atleast_2d(PD)[:, bus_on] * ones((ns, 1))
+        if QD is not None:
+            Qd = atleast_2d(QD)[:, bus_on] * ones((ns, 1))
+        if PG is not None:
+            Pg = atleast_2d(PG)[:, gen_on[on]] * ones((ns, 1))
+        Sg = (Cg * (Pg + 1j * gen[on, QG]).T).T
+        S = (Sg - (Pd + 1j * Qd)) / baseMVA
+    ns = S.shape[0]
+
+    ## build admittance matrix, once for all scenarios
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+
+    ## initial state
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
+    V = V0 * ones((ns, 1))
+    Va = angle(V)
+    Vm = abs(V)
+
+    ## set up indexing for updating V
+    npv = len(pv)
+    npq = len(pq)
+    j1 = 0;         j2 = npv           ## j1:j2 - V angle of pv buses
+    j3 = j2;        j4 = j2 + npq      ## j3:j4 - V angle of pq buses
+    j5 = j4;        j6 = j4 + npq      ## j5:j6 - V mag of pq buses
+
+    ## Jacobian structure, shared by all scenarios
+    jac = jac_builder(Ybus, pv, pq)
+
+    def mismatch(V, S):
+        mis = V * conj((Ybus * V.T).T) - S
+        F = c_[mis[:, pv].real, mis[:, pq].real, mis[:, pq].imag]
+        normF = abs(F).max(1) if F.shape[1] else zeros(F.shape[0])
+        return F, normF
+
+    ## evaluate F(x0) for all scenarios
+    F, normF = mismatch(V, S)
+    converged = normF < tol
+    iterations = zeros(ns, int)
+
+    ## do Newton iterations on the scenarios which have not converged yet
+    i = 0
+    while not converged.all() and i < max_it:
+        ## update iteration counter
+        i = i + 1
+        act = find(~converged)
+
+        ## compute update steps, one Jacobian per scenario
+        dx = zeros((len(act), j6))
+        for k, s in enumerate(act):
+            J = jac.build(V[s])
+            dx[k] = -1 * spsolve(J, F[s])
+
+        ## update voltages
+        Va_act, Vm_act = Va[act], Vm[act]
+        Va_act[:, pv] = Va_act[:, pv] + dx[:, j1:j2]
+        Va_act[:, pq] = Va_act[:, pq] + dx[:, j3:j4]
+        Vm_act[:, pq] = Vm_act[:, pq] + dx[:, j5:j6]
+        V[act] = Vm_act * exp(1j * Va_act)
+        Vm[act] = abs(V[act])       ## update Vm and Va again in case
+        Va[act] = angle(V[act])     ## we wrapped around with a negative Vm
+
+        ## evaluate F(x) and check for convergence
+        F[act], normF[act] = mismatch(V[act], S[act])
+        converged[act] = normF[act] < tol
+        iterations[act] = i
+
+    if verbose:
+        stdout.write('\nBatch Newton power flow: %d of %d scenarios '
+                     'converged in %.2f seconds.\n' %
+                     (converged.sum(), ns, time() - t0))
+
+    ## return voltages in external bus ordering
+    Vext = zeros((ns, nb0), complex)
+    Vext[:, bus_on] = V
+
+    return Vext, converged, iterations
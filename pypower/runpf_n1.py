@@ -0,0 +1,280 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs an AC N-1 contingency analysis in parallel.
+"""
+
+from sys import stderr
+
+from warnings import catch_warnings, simplefilter
+
+from multiprocessing import Pool, cpu_count
+
+from numpy import \
+    ndarray, array, zeros, ones, exp, conj, pi, argmin, argmax, maximum, \
+    errstate
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.find_islands import find_islands
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+from pypower.ybus_model import ybus_model
+
+from pypower.idx_bus import BUS_I, VM, VA, VMAX, VMIN
+from pypower.idx_brch import F_BUS, T_BUS, RATE_A, BR_STATUS
+from pypower.idx_gen import GEN_BUS, GEN_STATUS, VG
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None    ## Python < 3.8, contingencies are run serially
+
+
+## columns of the contingency summary, and their types
+N1_FIELDS = [
+    ('success', bool),          ## power flow converged
+    ('status', 'U9'),           ## 'solved', 'diverged' or 'islanded'
+    ('iterations', int),        ## Newton iterations
+    ('vmin', float),            ## lowest bus voltage (p.u.)
+    ('vmin_bus', int),          ## external number of that bus
+    ('vmax', float),            ## highest bus voltage (p.u.)
+    ('vmax_bus', int),          ## external number of that bus
+    ('nvviol', int),            ## number of buses outside [VMIN, VMAX]
+    ('max_loading', float),     ## highest branch flow, % of RATE_A
+    ('max_loading_branch', int),## external row of that branch
+    ('noverload', int),         ## number of branches above RATE_A
+]
+
+## violation summary of the contingencies which are not solved
+_N1_NONE = (0.0, -1, 0.0, -1, 0, 0.0, -1, 0)
+
+## network data of the worker processes, set by _n1_setup
+_n1 = {}
+
+
+def runpf_n1(casedata, ppopt=None, branches=None, gens=None, nproc=None):
+    """Runs an AC N-1 contingency analysis in parallel.
+
+    Solves the base case power flow of C{casedata} (a case file name or
+    dict, see L{loadcase}), then the power flow with each of the branches
+    C{branches} and each of the generators C{gens} (rows of the C{branch}
+    and C{gen} matrices of the case as given, all in-service ones by
+    default) taken out of service, one at a time, by Newton's method
+    warm started from the base case voltages.
+
+    The contingencies are spread over C{nproc} worker processes (all CPUs
+    by default). The base case C{bus}, C{branch} and C{gen} matrices,
+    C{Ybus} and voltages are placed in shared memory instead of being
+    pickled for each task, and each worker builds a L{ybus_model} once,
+    which it updates and reverts for each branch outage. With C{nproc}
+    equal to 1, or without C{multiprocessing.shared_memory} (Python
+    before 3.8), the contingencies are run in the calling process.
+
+    Returns a dict and a flag which is C{True} if the base case converged.
+    The dict has, for each contingency, in order of the branches then the
+    generators, C{'type'} ('branch' or 'gen'), C{'idx'} (row of the
+    element) and the violation summary: C{'success'}, C{'status'},
+    C{'iterations'}, C{'vmin'}, C{'vmin_bus'}, C{'vmax'}, C{'vmax_bus'}
+    (voltage extremes and their external bus numbers), C{'nvviol'} (number
+    of buses outside their voltage limits), C{'max_loading'},
+    C{'max_loading_branch'} (highest MVA flow in percent of C{RATE_A}, and
+    its branch row) and C{'noverload'} (number of branches above
+    C{RATE_A}), all as arrays. Branches without a rating are not checked.
+
+    C{'status'} is 'solved' if the power flow converged, 'diverged' if it
+    did not, and 'islanded' for the branch outages which split the network
+    into more islands (see L{find_islands}), which are not solved. The
+    voltage and loading fields are only set for solved contingencies, and
+    are zero, with C{-1} for the bus numbers and branch rows, otherwise.
+
+    Example::
+        res, success = runpf_n1('case118')
+        bad = res['idx'][(res['noverload'] > 0) | ~res['success']]
+
+    @see: L{runpf}, L{ybus_model}
+    """
+    ppopt = ppoption(ppopt, VERBOSE=0)
+    if nproc is None:
+        nproc = cpu_count()
+
+    ## read data and convert to internal indexing
+    ppc = ext2int(loadcase(casedata))
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    o = ppc["order"]
+    br_on = o["branch"]["status"]["on"]
+    gen_on = o["gen"]["status"]["on"][o["gen"]["e2i"]] ## ext row of int gen
+
+    ## contingencies, as internal indices
+    nl0 = o["ext"]["branch"].shape[0]
+    ng0 = o["ext"]["gen"].shape[0]
+    br_i = -ones(nl0, int)
+    br_i[br_on] = range(len(br_on))
+    gen_i = -ones(ng0, int)
+    gen_i[gen_on] = range(len(gen_on))
+    if branches is None:
+        branches = br_on
+    if gens is None:
+        gens = gen_on
+    branches = array(branches, int).reshape(-1)
+    gens = array(gens, int).reshape(-1)
+    branches = branches[br_i[branches] >= 0]   ## skip out-of-service ones
+    gens = gens[gen_i[gens] >= 0]
+    tasks = [(0, k) for k in br_i[branches]] + [(1, k) for k in gen_i[gens]]
+
+    ## base case power flow
+    ym = ybus_model(baseMVA, bus, branch)
+    ref, pv, pq = bustypes(bus, gen)
+    on = find(gen[:, GEN_STATUS] > 0)
+    gbus = gen[on, GEN_BUS].astype(int)
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V, success, _ = newtonpf(ym.Ybus, Sbus, V0, ref, pv, pq, ppopt)
+
+    res = {
+        'type': array(['branch'] * len(branches) + ['gen'] * len(gens)),
+        'idx': array(list(branches) + list(gens), int),
+    }
+    for name, dtype in N1_FIELDS:
+        res[name] = zeros(len(tasks), dtype)
+    if not success:
+        stderr.write('runpf_n1: base case power flow did not converge\n')
+        res['type'], res['idx'] = res['type'][:0], res['idx'][:0]
+        for name, dtype in N1_FIELDS:
+            res[name] = res[name][:0]
+        return res, success
+
+    arrays = {
+        'bus': bus, 'branch': branch, 'gen': gen, 'V': V,
+        'Ydata': ym.Ybus.data, 'Yindices': ym.Ybus.indices,
+        'Yindptr': ym.Ybus.indptr, 'ext_bus': o["ext"]["bus"][:, BUS_I],
+        'br_ext': br_on.astype(int),
+    }
+    if nproc > 1 and shared_memory is not None and len(tasks) > 1:
+        shms = []
+        try:
+            ## copy the network data to shared memory blocks
+            spec = {}
+            for name, a in arrays.items():
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(a.nbytes, 1))
+                shms.append(shm)
+                ndarray(a.shape, a.dtype, buffer=shm.buf)[...] = a
+                spec[name] = (shm.name, a.shape, a.dtype.str)
+
+            pool = Pool(min(nproc, len(tasks)), _n1_init,
+                        (spec, baseMVA, ppopt))
+            try:
+                chunksize = max(1, len(tasks) // (4 * nproc))
+                out = pool.map(_n1_run, tasks, chunksize)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+    else:
+        _n1_setup(arrays, baseMVA, ppopt)
+        out = [_n1_run(task) for task in tasks]
+        _n1.clear()
+
+    for k, row in enumerate(out):
+        for (name, _), val in zip(N1_FIELDS, row):
+            res[name][k] = val
+
+    return res, success
+
+
+def _n1_init(spec, baseMVA, ppopt):
+    """Attaches a worker process to the shared network data.
+    """
+    shms, arrays = [], {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shms.append(shm)                ## keep the blocks open
+        arrays[name] = ndarray(shape, dtype, buffer=shm.buf)
+    _n1_setup(arrays, baseMVA, ppopt)
+    _n1['shms'] = shms
+
+
+def _n1_setup(arrays, baseMVA, ppopt):
+    """Builds the data used by L{_n1_run} in the current process.
+    """
+    bus, branch = arrays['bus'], arrays['branch']
+    nb = bus.shape[0]
+    _n1.update(arrays)
+    _n1['baseMVA'] = baseMVA
+    _n1['ppopt'] = ppopt
+    _n1['Ybus'] = csr_matrix((arrays['Ydata'], arrays['Yindices'],
+                              arrays['Yindptr']), (nb, nb))
+    _n1['ym'] = ybus_model(baseMVA, bus, branch)
+    _n1['nislands'] = len(find_islands(bus, branch))
+    _n1['f'] = branch[:, F_BUS].astype(int)
+    _n1['t'] = branch[:, T_BUS].astype(int)
+    rated = find(branch[:, RATE_A] > 0)
+    _n1['rated'] = rated
+    _n1['rate'] = branch[rated, RATE_A] / baseMVA
+
+
+def _n1_run(task):
+    """Solves one contingency and returns its violation summary.
+    """
+    kind, k = task
+    bus, gen, V0 = _n1['bus'], _n1['gen'], _n1['V']
+    ym = _n1['ym']
+    ppopt = _n1['ppopt']
+
+    if kind == 0:                   ## branch outage
+        ym.update(k, BR_STATUS, 0)
+        Ybus = ym.Ybus
+    else:                           ## generator outage
+        gen = gen.copy()
+        gen[k, GEN_STATUS] = 0
+        Ybus = _n1['Ybus']
+    try:
+        ## outages which split the network have a singular Jacobian
+        if kind == 0 and len(find_islands(bus, ym.branch)) > _n1['nislands']:
+            return (False, 'islanded', 0) + _N1_NONE
+
+        ref, pv, pq = bustypes(bus, gen)
+        Sbus = makeSbus(_n1['baseMVA'], bus, gen)
+        ## diverging outages are reported in the summary, not by
+        ## numerical warnings
+        with errstate(all='ignore'), catch_warnings():
+            simplefilter('ignore')
+            V, success, iterations = \
+                newtonpf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+        if not success:
+            return (False, 'diverged', iterations) + _N1_NONE
+
+        ## MVA flows of the rated branches (zero for an outaged branch)
+        rated = _n1['rated']
+        Sf = V[_n1['f'][rated]] * conj((ym.Yf * V)[rated])
+        St = V[_n1['t'][rated]] * conj((ym.Yt * V)[rated])
+    finally:
+        if kind == 0:
+            ym.revert()
+
+    Vm = abs(V)
+    loading = 100 * maximum(abs(Sf), abs(St)) / _n1['rate']
+    ext_bus = _n1['ext_bus']
+    imin, imax = argmin(Vm), argmax(Vm)
+    nvviol = ((Vm < bus[:, VMIN]) | (Vm > bus[:, VMAX])).sum()
+    if len(rated):
+        il = argmax(loading)
+        max_loading, max_branch = loading[il], _n1['br_ext'][rated[il]]
+    else:
+        max_loading, max_branch = 0.0, -1
+
+    return (True, 'solved', iterations, Vm[imin], int(ext_bus[imin]),
+            Vm[imax], int(ext_bus[imax]), int(nvviol), max_loading,
+            int(max_branch), int((loading > 100).sum()))
@@ -0,0 +1,225 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Runs a time series of power flows with warm starts.
+"""
+
+import json
+
+from sys import stdout
+
+from os import makedirs
+from os.path import isdir, join
+
+from time import time
+
+from numpy import atleast_2d, zeros, ones, exp, conj, angle, pi
+from numpy import flatnonzero as find
+
+from scipy.sparse import csr_matrix as sparse
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.makeYbus import makeYbus
+from pypower.makeB import makeB
+from pypower.newtonpf import newtonpf
+from pypower.fdpf import fdpf
+
+from pypower.idx_bus import BUS_I, PD, QD, VM, VA
+from pypower.idx_brch import F_BUS, T_BUS
+from pypower.idx_gen import PG, QG, VG, GEN_BUS, GEN_STATUS
+
+
+## output columns: name, dtype and the case table whose rows they follow
+TSPF_COLUMNS = [
+    ('VM', '<f8', 'bus'),
+    ('VA', '<f8', 'bus'),
+    ('PF', '<f8', 'branch'),
+    ('QF', '<f8', 'branch'),
+    ('PT', '<f8', 'branch'),
+    ('QT', '<f8', 'branch'),
+    ('SUCCESS', '|i1', None),
+    ('ITERATIONS', '<i4', None),
+]
+
+
+def runtspf(casedata, profiles, fname, ppopt=None, chunk=1000):
+    """Runs a time series of power flows with warm starts.
+
+    Solves the AC power flow of the case C{casedata} (a case file name or
+    dict, see L{loadcase}) for each step of a time series of loads and
+    generation. The case is loaded, converted to internal indexing and its
+    admittance matrices built only once, and each step is solved with
+    L{newtonpf} (C{PF_ALG} = 1) or L{fdpf} (C{PF_ALG} = 2 or 3), starting
+    from the voltages of the previous step. Steps which fail to converge
+    are reported and the next step starts from the case voltages again.
+
+    C{profiles} is a dict with any of the keys C{'PD'}, C{'QD'} (C{nt x nb}
+    arrays of bus real and reactive demand in MW/MVAr) and C{'PG'} (C{nt x
+    ng} array of generator real power output in MW), with columns
+    following the rows of the C{bus} and C{gen} matrices of the case as
+    given, as for L{runpf_batch}. Quantities not given are taken from the
+    case. It may also be any iterable (e.g. a generator) of such dicts,
+    each holding a chunk of consecutive steps, so that the whole horizon
+    never has to be in memory.
+
+    Results are written, C{chunk} steps at a time, to the directory
+    C{fname}, with one raw binary file per column (bus C{VM} and C{VA} in
+    p.u. and degrees, branch C{PF}, C{QF}, C{PT} and C{QT} in MW/MVAr,
+    C{SUCCESS} and C{ITERATIONS}), one row per step, and a C{header.json}
+    file describing them. Out-of-service buses and branches are zero.
+    Memory use does not depend on the number of steps. Use L{loadtspf} to
+    read the results.
+
+    Returns the number of steps solved and the number of steps which
+    converged.
+
+    Example::
+        nt, nconv = runtspf('case30', {'PD': PD, 'QD': QD}, 'year')
+        res = loadtspf('year')
+
+    @see: L{loadtspf}, L{runpf_batch}
+    """
+    ppopt = ppoption(ppopt)
+
+    ## options
+    alg     = ppopt['PF_ALG']
+    verbose = ppopt['VERBOSE']
+    ppopt_step = ppoption(ppopt, VERBOSE=0)
+
+    if alg not in (1, 2, 3):
+        raise ValueError('runtspf: only Newton\'s method and fast-decoupled '
+                         'power flow (PF_ALG = 1, 2 or 3) are supported.')
+
+    t0 = time()
+
+    ## read data and convert to internal indexing
+    ppc = ext2int(loadcase(casedata))
+    baseMVA, bus, gen, branch = \
+        ppc["baseMVA"], ppc["bus"], ppc["gen"], ppc["branch"]
+    o = ppc["order"]
+    nb = bus.shape[0]
+    nb0 = o["ext"]["bus"].shape[0]
+    nl0 = o["ext"]["branch"].shape[0]
+    bus_on = o["bus"]["status"]["on"]
+    br_on = o["branch"]["status"]["on"]
+    gen_on = o["gen"]["status"]["on"][o["gen"]["e2i"]] ## ext row of int gen
+
+    ## get bus index lists of each type of bus
+    ref, pv, pq = bustypes(bus, gen)
+
+    ## generator info
+    on = find(gen[:, GEN_STATUS] > 0)      ## which generators are on?
+    gbus = gen[on, GEN_BUS].astype(int)    ## what buses are they at?
+    ngon = len(on)
+    Cg = sparse((ones(ngon), (gbus, range(ngon))), (nb, ngon))
+
+    ## network matrices, once for all steps
+    Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+    if alg in (2, 3):
+        Bp, Bpp = makeB(baseMVA, bus, branch, alg)
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+
+    ## initial state
+    V0 = bus[:, VM] * exp(1j * pi/180 * bus[:, VA])
+    V0[gbus] = gen[on, VG] / abs(V0[gbus]) * V0[gbus]
+
+    ## split a dict of full profiles into chunks
+    if isinstance(profiles, dict):
+        full = profiles
+        nt = max([atleast_2d(x).shape[0] for x in full.values()] or [1])
+        profiles = ({k: atleast_2d(x)[i:i + chunk] for k, x in full.items()}
+                    for i in range(0, nt, chunk))
+
+    ## output files
+    if not isdir(fname):
+        makedirs(fname)
+    header = {
+        'version': 1,
+        'nsteps': 0,
+        'baseMVA': float(baseMVA),
+        'bus': o["ext"]["bus"][:, BUS_I].astype(int).tolist(),
+        'nbranch': nl0,
+        'columns': [],
+    }
+    shape = {'bus': [nb0], 'branch': [nl0], None: []}
+    out = {}
+    for name, dtype, table in TSPF_COLUMNS:
+        header['columns'].append({'name': name, 'dtype': dtype,
+                                  'shape': shape[table]})
+        out[name] = open(join(fname, name + '.bin'), 'wb')
+
+    nsteps = 0
+    nconv = 0
+    V = V0
+    try:
+        for prof in profiles:
+            ## complex bus power injections of the steps in this chunk
+            nc = max([atleast_2d(x).shape[0] for x in prof.values()] or [1])
+            Pd = bus[:, PD] * ones((nc, 1))
+            Qd = bus[:, QD] * ones((nc, 1))
+            Pg = gen[on, PG] * ones((nc, 1))
+            if 'PD' in prof:
+                Pd = atleast_2d(prof['PD'])[:, bus_on] * ones((nc, 1))
+            if 'QD' in prof:
+                Qd = atleast_2d(prof['QD'])[:, bus_on] * ones((nc, 1))
+            if 'PG' in prof:
+                Pg = atleast_2d(prof['PG'])[:, gen_on[on]] * ones((nc, 1))
+            S = ((Cg * (Pg + 1j * gen[on, QG]).T).T - (Pd + 1j * Qd)) / baseMVA
+
+            ## solve each step, warm started from the previous one
+            Vc = zeros((nc, nb), complex)
+            success = zeros(nc, bool)
+            iterations = zeros(nc, int)
+            for k in range(nc):
+                if alg == 1:
+                    V, success[k], iterations[k] = \
+                        newtonpf(Ybus, S[k], V, ref, pv, pq, ppopt_step)
+                else:
+                    V, success[k], iterations[k] = \
+                        fdpf(Ybus, S[k], V, Bp, Bpp, ref, pv, pq, ppopt_step)
+                Vc[k] = V
+                if not success[k]:
+                    if verbose:
+                        stdout.write('runtspf: step %d did not converge\n' %
+                                     (nsteps + k))
+                    V = V0
+
+            ## bus and branch results in external ordering
+            Sf = Vc[:, f] * conj((Yf * Vc.T).T) * baseMVA
+            St = Vc[:, t] * conj((Yt * Vc.T).T) * baseMVA
+            res = {
+                'VM': (abs(Vc), bus_on, nb0),
+                'VA': (angle(Vc) * 180 / pi, bus_on, nb0),
+                'PF': (Sf.real, br_on, nl0),
+                'QF': (Sf.imag, br_on, nl0),
+                'PT': (St.real, br_on, nl0),
+                'QT': (St.imag, br_on, nl0),
+            }
+            for name, dtype, table in TSPF_COLUMNS:
+                if table is None:
+                    x = success if name == 'SUCCESS' else iterations
+                else:
+                    val, idx, n = res[name]
+                    x = zeros((nc, n))
+                    x[:, idx] = val
+                x.astype(dtype).tofile(out[name])
+
+            nsteps = nsteps + nc
+            nconv = nconv + success.sum()
+    finally:
+        for fd in out.values():
+            fd.close()
+        header['nsteps'] = nsteps
+        with open(join(fname, 'header.json'), 'w') as fd:
+            json.dump(header, fd, indent=1)
+
+    if verbose:
+        stdout.write('\nTime series power flow: %d of %d steps converged '
+                     'in %.2f seconds.\n' % (nconv, nsteps, time() - t0))
+
+    return nsteps, int(nconv)
@@ -5,7 +5,7 @@
 """Runs an optimal power flow with unit-decommitment heuristic.
 """
 
-from sys import stderr
+from sys import stdout, stderr
 
 from os.path import dirname, join
 
@@ -43,7 +43,7 @@ def runuopf(casedata=None, ppopt=None, fname='', solvedcase=''):
                 fd.close()
 
     else:
-        printpf(r, stdout, ppopt=ppopt)
+        printpf(r, stdout, ppopt)
 
     ## save solved case
     if solvedcase:
@@ -14,6 +14,7 @@ from scipy.io import savemat
 
 from pypower._compat import PY2
 from pypower.run_userfcn import run_userfcn
+from pypower.casebin import savecase_bin
 
 from pypower.idx_bus import MU_VMIN, VMIN
 from pypower.idx_gen import PMIN, MU_PMAX, MU_PMIN, MU_QMIN, MU_QMAX, APF
@@ -41,6 +42,10 @@ def savecase(fname, ppc, comment=None, version='2'):
     optional C{version} argument is '1' it will modify the data matrices to
     version 1 format before saving.
 
+    If C{fname} ends with '.ppc', the case is saved to a directory in the
+    binary format of L{savecase_bin}, with all its values, which
+    L{loadcase} loads memory mapped.
+
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
     Autonoma de Manizales)
     @author: Ray Zimmerman (PSERC Cornell)
@@ -87,6 +92,9 @@ def savecase(fname, ppc, comment=None, version='2'):
             if fname[-4:] == ".mat":
                 rootname = fname[:-4]
                 extension = ".mat"
+            elif fname[-4:] == ".ppc":
+                rootname = fname[:-4]
+                extension = ".ppc"
 
     if not rootname:
         rootname = fname
@@ -97,7 +105,9 @@ def savecase(fname, ppc, comment=None, version='2'):
     indent2 = indent + indent
 
     ## open and write the file
-    if extension == ".mat":     ## MAT-file
+    if extension == ".ppc":     ## binary case directory
+        savecase_bin(fname, ppc)
+    elif extension == ".mat":     ## MAT-file
         ppc_mat = {}
         ppc_mat['version'] = ppc_ver
         ppc_mat['baseMVA'] = baseMVA
@@ -0,0 +1,133 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Builds a large synthetic case from copies of a smaller one.
+"""
+
+from os.path import dirname, join
+
+from numpy import arange, repeat, tile, ceil, sqrt, log10, zeros, r_, c_
+from numpy.random import RandomState
+
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, PD, QD, BUS_AREA, VM, VA, \
+    REF, PV
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, \
+    RATE_B, RATE_C, TAP, BR_STATUS, ANGMIN, ANGMAX
+from pypower.idx_gen import GEN_BUS, PG
+from pypower.idx_cost import MODEL, COST, POLYNOMIAL
+
+
+def synthcase(nb, seed=0, base='case118', nties=3, spread=0.1):
+    """Builds a large synthetic case from copies of a smaller one.
+
+    Returns a case dict (version 2, see L{caseformat}) with at least C{nb}
+    buses, made of as many copies of the case C{base} (a case file name,
+    by default the bundled C{case118}, or dict, see L{loadcase}) as needed.
+    The copies are laid out on a square grid and each one is connected to
+    its right and lower neighbors by C{nties} tie lines, each between the
+    copies of a randomly chosen bus, with the impedances of short high
+    voltage lines (r = 0.001 to 0.003, x = 10 r, b = 0.02 p.u.) and no
+    flow limit.
+
+    Bus numbers of copy C{k} (from 0) are those of C{base} plus C{k} times
+    the power of 10 above the largest one, and C{k + 1} is its area. Only
+    the reference bus of the first copy is kept as such, the others are
+    made PV buses. Voltages and generator dispatch are taken from the
+    power flow solution of C{base}, so that each copy supplies its own
+    losses. To make the copies differ, branch impedances, bus loads and
+    the coefficients of polynomial generator costs are multiplied by
+    random factors in M{[1 - spread, 1 + spread]}, and the generator
+    dispatch of each copy is scaled with its total load.
+
+    The random factors are drawn from a C{numpy.random.RandomState} seeded
+    with C{seed}, so the same arguments always give the same case.
+
+    Example::
+        ppc = synthcase(10000, seed=1)      ## 85 copies of case118
+        results, success = runpf(ppc)
+
+    @see: L{loadcase}
+    """
+    if isinstance(base, str) and dirname(base) == '' and \
+            base.startswith('case'):
+        base = join(dirname(__file__), base)    ## a bundled case
+    ppc0 = loadcase(base)
+
+    ## start from the solved power flow of base, so that each copy has
+    ## the dispatch, including its losses, and voltages to balance itself
+    r, success = runpf(ppc0, ppoption(VERBOSE=0, OUT_ALL=0))
+    if success:
+        ppc0['bus'][:, [VM, VA]] = r['bus'][:, [VM, VA]]
+        ppc0['gen'][:, PG] = r['gen'][:, PG]
+    bus0, gen0, branch0 = ppc0['bus'], ppc0['gen'], ppc0['branch']
+    nb0, ng0, nl0 = bus0.shape[0], gen0.shape[0], branch0.shape[0]
+    rng = RandomState(seed)
+
+    ## copies on a grid of nr x nc
+    n = int(ceil(float(nb) / nb0))
+    nc = int(ceil(sqrt(n)))
+    k = arange(n)
+    off = 10 ** ceil(log10(bus0[:, BUS_I].max() + 1))
+
+    ## buses
+    bus = tile(bus0.astype(float), (n, 1))
+    bus[:, BUS_I] += repeat(k * off, nb0)
+    bus[:, BUS_AREA] = repeat(k + 1, nb0)
+    ref = bus[:, BUS_TYPE] == REF
+    ref[:nb0] = False
+    bus[ref, BUS_TYPE] = PV
+    f = 1 + spread * (2 * rng.random_sample(n * nb0) - 1)
+    bus[:, PD] *= f
+    bus[:, QD] *= f
+
+    ## generators, dispatch follows the load of each copy
+    gen = tile(gen0.astype(float), (n, 1))
+    gen[:, GEN_BUS] += repeat(k * off, ng0)
+    load0 = bus0[:, PD].sum()
+    if load0 > 0:
+        gen[:, PG] *= repeat(bus[:, PD].reshape(n, nb0).sum(1) / load0, ng0)
+
+    ## branches
+    branch = tile(branch0.astype(float), (n, 1))
+    branch[:, [F_BUS, T_BUS]] += repeat(k * off, nl0)[:, None]
+    branch[:, [BR_R, BR_X]] *= \
+        1 + spread * (2 * rng.random_sample((n * nl0, 1)) - 1)
+
+    ## tie lines to the right and lower neighbors on the grid
+    right = k[(k % nc < nc - 1) & (k + 1 < n)]
+    down = k[k + nc < n]
+    a = r_[right, down].repeat(nties)
+    b = r_[right + 1, down + nc].repeat(nties)
+    nt = len(a)
+    tie = zeros((nt, branch.shape[1]))
+    i = bus0[rng.randint(nb0, size=nt), BUS_I]
+    tie[:, F_BUS] = a * off + i
+    tie[:, T_BUS] = b * off + i
+    tie[:, BR_R] = 0.001 + 0.002 * rng.random_sample(nt)
+    tie[:, BR_X] = 10 * tie[:, BR_R]
+    tie[:, BR_B] = 0.02
+    tie[:, [RATE_A, RATE_B, RATE_C, TAP]] = 0
+    tie[:, BR_STATUS] = 1
+    tie[:, ANGMIN] = -360
+    tie[:, ANGMAX] = 360
+
+    ppc = {'version': '2', 'baseMVA': ppc0['baseMVA'],
+           'bus': bus, 'gen': gen, 'branch': r_[branch, tie]}
+
+    ## generator costs
+    if 'gencost' in ppc0:
+        gc = ppc0['gencost'].astype(float)
+        gencost = tile(gc[:ng0], (n, 1))
+        if gc.shape[0] > ng0:                   ## reactive power costs
+            gencost = r_[gencost, tile(gc[ng0:], (n, 1))]
+        poly = gencost[:, MODEL] == POLYNOMIAL
+        gencost[poly, COST:] *= \
+            c_[1 + spread * (2 * rng.random_sample(poly.sum()) - 1)]
+        ppc['gencost'] = gencost
+
+    return ppc
@@ -0,0 +1,71 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the lazy imports of pypower.api and pypower.main.
+"""
+
+import os
+import sys
+
+from os.path import dirname
+from subprocess import check_output
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_skip import t_skip
+from pypower.t.t_end import t_end
+
+
+def _modules(code):
+    ## modules imported by a new interpreter after running code
+    env = dict(os.environ, PYTHONPATH=dirname(dirname(dirname(__file__))))
+    out = check_output([sys.executable, '-c', code +
+                        '\nimport sys\nprint(" ".join(sys.modules))'],
+                       env=env)
+    return out.decode().split('\n')[-2].split()
+
+
+def t_api(quiet=False):
+    """Tests for the lazy imports of pypower.api and pypower.main.
+    """
+    t_begin(8, quiet)
+
+    from pypower import api
+    from pypower.runpf import runpf
+    from pypower.case9 import case9
+
+    t = 'pypower.api : '
+    t_ok(api.runpf is runpf and api.case9 is case9, [t, 'functions'])
+    t_ok(all(callable(getattr(api, name)) for name in api.__all__),
+         [t, 'all names'])
+    t_ok('runpf' in dir(api) and 'test_pypower' in dir(api), [t, 'dir'])
+    try:
+        api.not_a_function
+        t_ok(False, [t, 'AttributeError'])
+    except AttributeError:
+        t_ok(True, [t, 'AttributeError'])
+
+    if sys.version_info < (3, 7):
+        t_skip(2, 'no module __getattr__ before Python 3.7')
+    else:
+        modules = _modules('import pypower.api')
+        t_ok('numpy' not in modules and 'pypower.case300' not in modules,
+             [t, 'import imports nothing'])
+        modules = _modules('from pypower.api import runpf')
+        t_ok('pypower.runpf' in modules and 'pypower.case300' not in modules,
+             [t, 'import of a function'])
+
+    t = 'pypower.main : '
+    modules = _modules('import pypower.main')
+    t_ok('numpy' not in modules and 'pypower.t.test_pypower' not in modules,
+         [t, 'import'])
+    modules = _modules("from pypower.main import pf\n"
+                       "try:\n    pf(['--help'])\nexcept SystemExit:\n    pass")
+    t_ok('scipy' not in modules, [t, 'pf --help'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_api(quiet=False)
@@ -0,0 +1,66 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the benchmark of power flow, OPF and sensitivity functions.
+"""
+
+import json
+
+from os import close, remove
+from os.path import exists
+from tempfile import mkstemp
+
+from pypower.benchmark import benchmark
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_benchmark(quiet=False):
+    """Tests for the benchmark of power flow, OPF and sensitivity functions.
+    """
+    t_begin(10, quiet)
+
+    fd, fname = mkstemp(suffix='.json')
+    cases = ['case9', 'case9x3']
+    solvers = ['runpf_nr', 'rundcopf', 'makeLODF']
+
+    t = 'benchmark : '
+    bm = benchmark(cases, solvers, repeat=2, fname=fname, quiet=True,
+                   imports=False)
+    res = bm['results']
+    t_ok(len(res) == 6 and [(r['case'], r['solver']) for r in res[:3]] ==
+         [('case9', s) for s in solvers], [t, 'cases and functions'])
+    t_ok([r['nb'] for r in res] == [9] * 3 + [27] * 3, [t, 'tiled case'])
+    t_ok(all(r['success'] for r in res), [t, 'success'])
+    t_ok(all(len(r['times']) == 2 and r['time'] == min(r['times'])
+             for r in res), [t, 'times'])
+    t_ok(res[0]['phases']['newtonpf']['count'] == 2 and
+         'makeLODF' in res[2]['phases'], [t, 'phases'])
+    t_ok(all(r['peak_mem'] > 0 for r in res), [t, 'peak memory'])
+    t_ok('numpy' in bm['info'] and 'pypower' in bm['info'], [t, 'info'])
+
+    t = 'baseline : '
+    with open(fname) as f:
+        saved = json.load(f)
+    t_ok(saved['results'] == json.loads(json.dumps(res)), [t, 'saved'])
+    bm = benchmark(['case9'], ['runpf_nr'], repeat=1, memory=False,
+                   baseline=fname, quiet=True)
+    t_ok([r['solver'] for r in bm['results'] if r['case'] == 'import'] ==
+         ['python', 'pypower.api', 'pypower.main', 'pf --help', 'runpf'],
+         [t, 'import times'])
+    r = bm['results'][-1]
+    t_ok('peak_mem' not in r and
+         abs(r['ratio'] - r['time'] / res[0]['time']) < 1e-12, [t, 'ratio'])
+
+    close(fd)
+    if exists(fname):
+        remove(fname)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_benchmark(quiet=False)
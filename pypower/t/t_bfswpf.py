@@ -0,0 +1,108 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for backward/forward sweep power flow.
+"""
+
+from numpy import zeros, arange, where, r_
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+
+from pypower.idx_bus import \
+    BUS_I, BUS_TYPE, PD, QD, BS, BUS_AREA, VM, VA, BASE_KV, ZONE, VMAX, VMIN, \
+    PQ, REF
+from pypower.idx_brch import \
+    F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, PF, QT
+from pypower.idx_gen import \
+    GEN_BUS, PG, QG, VG, MBASE, GEN_STATUS, PMAX, QMAX, QMIN
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def feeder(nb=60):
+    """Radial test feeder with high R/X, a transformer and a shunt.
+    """
+    k = arange(1, nb)
+    parent = where(k % 5 == 0, k // 2, k - 1)
+
+    bus = zeros((nb, 13))
+    bus[:, BUS_I] = arange(1, nb + 1)
+    bus[:, BUS_TYPE] = PQ
+    bus[0, BUS_TYPE] = REF
+    bus[1:, PD] = 1.5 + 0.9 * (k % 4)
+    bus[1:, QD] = 0.5 * bus[1:, PD]
+    bus[5, BS] = 0.2
+    bus[:, [BUS_AREA, VM, ZONE]] = 1
+    bus[:, BASE_KV] = 12.66
+    bus[:, VMAX] = 1.1
+    bus[:, VMIN] = 0.9
+
+    gen = zeros((1, 21))
+    gen[0, [GEN_BUS, VG, MBASE, GEN_STATUS, PMAX, QMAX, QMIN]] = \
+        [1, 1.02, 100, 1, 100, 100, -100]
+
+    branch = zeros((nb - 1, 13))
+    branch[:, F_BUS] = parent + 1
+    branch[:, T_BUS] = k + 1
+    branch[3, [F_BUS, T_BUS]] = branch[3, [T_BUS, F_BUS]]  ## child to parent
+    branch[:, BR_R] = 0.004 + 0.002 * (k % 3)
+    branch[:, BR_X] = 0.5 * branch[:, BR_R]
+    branch[:, BR_B] = 1e-4
+    branch[0, TAP] = 0.98
+    branch[0, SHIFT] = 1.0
+    branch[:, BR_STATUS] = 1
+
+    return {'version': '2', 'baseMVA': 100.0,
+            'bus': bus, 'gen': gen, 'branch': branch}
+
+
+def t_bfswpf(quiet=False):
+    """Tests for backward/forward sweep power flow.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    bfopt = ppoption(ppopt, PF_ALG=5)
+
+    t = 'radial feeder : '
+    rn, _ = runpf(feeder(), ppopt)
+    r, success = runpf(feeder(), bfopt)
+    t_ok(success, [t, 'success'])
+    t_ok(r['bus'][:, VM].min() < 0.99, [t, 'voltage drop'])
+    t_is(r['bus'][:, VM], rn['bus'][:, VM], 8, [t, 'VM'])
+    t_is(r['bus'][:, VA], rn['bus'][:, VA], 6, [t, 'VA'])
+    t_is(r['gen'][:, [PG, QG]], rn['gen'][:, [PG, QG]], 4, [t, 'PG, QG'])
+    t_is(r['branch'][:, PF:QT + 1], rn['branch'][:, PF:QT + 1], 4,
+         [t, 'branch flows'])
+
+    t = 'not converged : '
+    r, success = runpf(feeder(), ppoption(bfopt, PF_MAX_IT_BFSW=1))
+    t_ok(not success, [t, 'success = 0'])
+
+    t = 'meshed, Newton fallback : '
+    ppc = feeder()
+    ppc['branch'] = r_[ppc['branch'], ppc['branch'][-1:]]
+    ppc['branch'][-1, [F_BUS, T_BUS]] = [10, 40]
+    rn, _ = runpf(ppc, ppopt)
+    r, success = runpf(ppc, bfopt)
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, VM], rn['bus'][:, VM], 12, [t, 'VM'])
+
+    t = 'PV buses, Newton fallback : '
+    rn, _ = runpf(case30(), ppopt)
+    r, success = runpf(case30(), bfopt)
+    t_ok(success, [t, 'success'])
+    t_is(r['bus'][:, VM], rn['bus'][:, VM], 12, [t, 'VM'])
+    t_is(r['bus'][:, VA], rn['bus'][:, VA], 12, [t, 'VA'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_bfswpf(quiet=False)
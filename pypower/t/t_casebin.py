@@ -0,0 +1,101 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the binary case format.
+"""
+
+from os.path import join, isdir
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import memmap, array_equal
+
+from scipy.sparse import csr_matrix
+
+from pypower.case30 import case30
+from pypower.casebin import savecase_bin, loadcase_bin
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.runopf import runopf
+from pypower.runpf import runpf
+from pypower.savecase import savecase
+from pypower.toggle_reserves import toggle_reserves
+from pypower.idx_bus import PD, VM
+
+from pypower.t.t_case30_userfcns import t_case30_userfcns
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_casebin(quiet=False):
+    """Tests for the binary case format.
+    """
+    t_begin(15, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    tmpdir = mkdtemp()
+    try:
+        t = 'savecase : '
+        ppc0 = case30()
+        fname = savecase(join(tmpdir, 'c30.ppc'), case30())
+        t_ok(fname == join(tmpdir, 'c30.ppc') and isdir(fname), [t, 'dir'])
+
+        t = 'loadcase : '
+        ppc = loadcase(fname)
+        t_ok(all(array_equal(ppc[k], ppc0[k])
+                 for k in ['bus', 'gen', 'branch', 'gencost', 'areas']),
+             [t, 'arrays'])
+        t_ok(ppc['baseMVA'] == ppc0['baseMVA'] and ppc['version'] == '2',
+             [t, 'baseMVA, version'])
+        t_ok(isinstance(ppc['bus'], memmap), [t, 'memory mapped'])
+        ppc['bus'][:, PD] *= 2
+        t_is(loadcase(fname)['bus'][:, PD], ppc0['bus'][:, PD], 12,
+             [t, 'copy-on-write'])
+        ppc = loadcase(join(tmpdir, 'c30'))
+        t_ok(array_equal(ppc['bus'], ppc0['bus']), [t, 'without extension'])
+        t_ok(loadcase(join(tmpdir, 'none.ppc')) == 6, [t, 'missing'])
+
+        t = 'runpf : '
+        r0, _ = runpf(ppc0, ppopt)
+        r, success = runpf(ppc, ppopt)
+        t_ok(success, [t, 'success'])
+        t_is(r['bus'][:, VM], r0['bus'][:, VM], 12, [t, 'voltages'])
+
+        t = 'solved case : '
+        r = runopf(case30(), ppopt)
+        del r['om']
+        savecase_bin(join(tmpdir, 'r30.ppc'), r)
+        r1 = loadcase_bin(join(tmpdir, 'r30.ppc'), mmap_mode=None)
+        t_is(r1['mu']['var']['l'], r['mu']['var']['l'], 12, [t, 'nested'])
+        t_ok(r1['f'] == r['f'] and r1['success'] == r['success'] and
+             r1['raw']['output']['message'] == r['raw']['output']['message'],
+             [t, 'scalars'])
+
+        t = 'sparse : '
+        A = csr_matrix(([1.0, 2.0], ([0, 1], [2, 0])), shape=(2, 3))
+        savecase_bin(join(tmpdir, 'A.ppc'), {'A': A, 'l': [], 'x': None})
+        ppc = loadcase_bin(join(tmpdir, 'A.ppc'))
+        t_is(ppc['A'].toarray(), A.toarray(), 12, [t, 'matrix'])
+        t_ok(ppc['l'] == [] and ppc['x'] is None, [t, 'empty values'])
+
+        t = 'userfcn : '
+        ppc = toggle_reserves(t_case30_userfcns(), 'on')
+        savecase(join(tmpdir, 'res.ppc'), ppc)
+        ppc1 = loadcase(join(tmpdir, 'res.ppc'))
+        t_ok([u['fcn'] for u in ppc1['userfcn']['formulation']] ==
+             [u['fcn'] for u in ppc['userfcn']['formulation']],
+             [t, 'functions'])
+        r = runopf(ppc, ppopt)
+        r1 = runopf(ppc1, ppopt)
+        t_is(r1['f'], r['f'], 8, [t, 'runopf with reserves'])
+    finally:
+        rmtree(tmpdir)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_casebin(quiet=False)
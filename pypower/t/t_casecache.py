@@ -0,0 +1,113 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the cache of parsed case files.
+"""
+
+import os
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import memmap, array_equal
+
+from pypower.case9 import case9
+from pypower.case30 import case30
+from pypower.casecache import casecache, set_casecache, get_casecache
+from pypower.loadcase import loadcase
+from pypower.savecase import savecase
+from pypower.idx_bus import PD
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_casecache(quiet=False):
+    """Tests for the cache of parsed case files.
+    """
+    t_begin(13, quiet)
+
+    tmpdir = mkdtemp()
+    cachedir = join(tmpdir, 'cache')
+    old = set_casecache(None)
+    try:
+        ppc0 = case30()
+        fname = savecase(join(tmpdir, 'c30.py'), case30())
+
+        t = 'memory : '
+        cache = casecache(maxsize=2, cachedir=cachedir)
+        t_ok(set_casecache(cache) is None and get_casecache() is cache,
+             [t, 'set_casecache'])
+        ppc = loadcase(fname)
+        t_ok(cache.misses == 1 and cache.hits == 0 and len(cache.cases) == 1,
+             [t, 'miss'])
+        ppc['bus'][:, PD] = 0
+        ppc = loadcase(join(tmpdir, 'c30'))
+        t_ok(cache.hits == 1 and array_equal(ppc['bus'], ppc0['bus']),
+             [t, 'hit, copy'])
+
+        t = 'changed file : '
+        ppc1 = case30()
+        ppc1['bus'][:, PD] *= 2
+        st = os.stat(fname)
+        savecase(fname, ppc1)
+        os.utime(fname, (st.st_atime, st.st_mtime))     ## same mtime
+        ppc = loadcase(fname)
+        t_ok(cache.misses == 2 and array_equal(ppc['bus'], ppc1['bus']),
+             [t, 'read again'])
+
+        t = 'disk : '
+        t_ok(len([f for f in os.listdir(cachedir) if f.endswith('.ppc')])
+             == 2, [t, 'saved'])
+        cache = casecache(maxsize=2, cachedir=cachedir)     ## new process
+        set_casecache(cache)
+        ppc = loadcase(fname)
+        t_ok(cache.hits == 1 and cache.misses == 0 and
+             array_equal(ppc['bus'], ppc1['bus']), [t, 'hit'])
+        t_ok(isinstance(cache.cases[cache.key(fname)]['bus'], memmap),
+             [t, 'memory mapped'])
+
+        t = 'LRU : '
+        f9 = savecase(join(tmpdir, 'c9.py'), case9())
+        f9b = savecase(join(tmpdir, 'c9b.py'), case9())
+        loadcase(f9)
+        loadcase(fname)
+        loadcase(f9b)
+        keys = list(cache.cases)
+        t_ok(keys == [cache.key(fname), cache.key(f9b)], [t, 'memory'])
+
+        cache.clear()
+        cache = casecache(maxsize=0, cachedir=cachedir, maxbytes=1)
+        set_casecache(cache)
+        loadcase(f9)
+        loadcase(fname)
+        entries = [f for f in os.listdir(cachedir) if f.endswith('.ppc')]
+        t_ok(len(cache.cases) == 0 and entries == [cache.key(fname) + '.ppc'],
+             [t, 'disk, newest kept'])
+        loadcase(fname)
+        t_ok(cache.hits == 1 and cache.misses == 2, [t, 'hit without memory'])
+        cache.clear()
+        t_ok(os.listdir(cachedir) == [], [t, 'clear'])
+
+        t = 'not cached : '
+        cache = casecache()
+        set_casecache(cache)
+        loadcase(case30())
+        loadcase(savecase(join(tmpdir, 'c30.ppc'), case30()))
+        t_ok(cache.hits == 0 and cache.misses == 0, [t, 'dict, .ppc'])
+
+        set_casecache(None)
+        loadcase(fname)
+        t_ok(cache.misses == 0, [t, 'no cache set'])
+    finally:
+        set_casecache(old)
+        rmtree(tmpdir)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_casecache(quiet=False)
@@ -0,0 +1,151 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for loading MATPOWER case files.
+"""
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import array, inf, array_equal
+
+from pypower.case30 import case30
+from pypower.casem import loadcase_m
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+CASE = """function mpc = t_case
+%T_CASE  a MATPOWER case, with comments, commas and continuations
+
+%% MATPOWER Case Format : Version 2
+mpc.version = '2';
+
+%%-----  Power Flow Data  -----%%
+%% system MVA base
+mpc.baseMVA = 100;
+
+%% bus data
+%	bus_i	type	Pd	Qd	Gs	Bs	area	Vm	Va	baseKV	zone	Vmax	Vmin
+mpc.bus = [
+	1	3	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	2, 2, 0, 0, 0, 0, 1, 1, 0, 345, 1, 1.1, 0.9;	% commas
+	3	1	90	30	0	0	1	1	0	345	1	1.1	0.9
+	4	1	100	35	0	0	1	1 ...
+		0	345	1	1.1	0.9;
+];
+
+%% generator data
+mpc.gen = [
+	1	0	0	300	-300	1	100	1	250	10	0	0	0	0	0	0	0	0	0	0	0;
+	2	163	0	300	-300	1	100	1	Inf	10	0	0	0	0	0	0	0	0	0	0	0;
+];
+
+mpc.branch = [
+	1	2	0	0.0576	0	250	250	250	0	0	1	-360	360;
+	2	3	0.017	0.092	0.158	250	250	250	0	0	1	-360	360;
+	3	4	0.039	0.17	0.358	150	150	150	0	0	1	-360	360;
+	4	1	0.01	0.085	0.176	250	250	250	0	0	1	-Inf	Inf;
+];
+
+mpc.areas = [1 1];
+mpc.gen(:, 2) = 2 * mpc.gen(:, 2);
+mpc.reserves.zones = [1 1];
+mpc.bus_name = {
+	'one';
+	'two';
+};
+"""
+
+CASE1 = """function [baseMVA, bus, gen, branch] = t_case1
+baseMVA = 100;
+bus = [ 1 3 0 0 0 0 1 1 0 345 1 1.1 0.9; 2 1 10 0 0 0 1 1 0 345 1 1.1 0.9 ];
+gen = [ 1 0 0 300 -300 1 100 1 250 10 ];
+branch = [ 1 2 0 0.1 0 250 250 250 0 0 1 ];
+"""
+
+
+def t_casem(quiet=False):
+    """Tests for loading MATPOWER case files.
+    """
+    t_begin(16, quiet)
+
+    tmpdir = mkdtemp()
+    try:
+        t = 'loadcase_m : '
+        fname = join(tmpdir, 't_case.m')
+        with open(fname, 'w') as fd:
+            fd.write(CASE)
+        s = loadcase_m(fname)
+        t_ok(s['version'] == '2' and s['baseMVA'] == 100, [t, 'scalars'])
+        t_ok(s['bus'].shape == (4, 13), [t, 'bus size'])
+        t_is(s['bus'][:, 2], array([0, 0, 90, 100]), 12,
+             [t, 'commas, continuations'])
+        t_ok(s['gen'][1, 8] == inf and s['branch'][3, 11] == -inf,
+             [t, 'Inf'])
+        t_is(s['gen'][:, 1], array([0, 163]), 12, [t, 'expressions ignored'])
+        t_is(s['areas'], array([[1, 1]]), 12, [t, 'row vector'])
+        t_is(s['reserves']['zones'], array([[1, 1]]), 12, [t, 'nested'])
+        t_ok(s['bus_name'] == ['one', 'two'], [t, 'cell array'])
+
+        t = 'loadcase : '
+        ppc = loadcase(join(tmpdir, 't_case'))
+        r, success = runpf(ppc, ppoption(VERBOSE=0, OUT_ALL=0))
+        t_ok(success, [t, 'runpf'])
+
+        fname = join(tmpdir, 't_case1.m')
+        with open(fname, 'w') as fd:
+            fd.write(CASE1)
+        ppc = loadcase(fname)
+        t_ok(ppc['version'] == '2' and ppc['gen'].shape[1] == 21 and
+             ppc['branch'].shape[1] == 13, [t, 'version 1'])
+
+        with open(join(tmpdir, 'bad.m'), 'w') as fd:
+            fd.write("mpc.bus = [1 2 3; 4 5];\n")
+        t_ok(loadcase(join(tmpdir, 'bad.m')) == 5, [t, 'invalid matrix'])
+        with open(join(tmpdir, 'ragged.m'), 'w') as fd:
+            fd.write("mpc.bus = [1 2 3; 4 5; 6];\n")
+        t_ok(loadcase(join(tmpdir, 'ragged.m')) == 5, [t, 'ragged rows'])
+        fname = join(tmpdir, 'spaces.m')
+        with open(fname, 'w') as fd:
+            fd.write("function mpc = spaces\nmpc.bus = [\n\t1 3 0 0 ;\n"
+                     "\t2 1 0 0;\n\t3 1 0 0 ;\n];\n")
+        t_is(loadcase_m(fname)['bus'], array([[1, 3, 0, 0], [2, 1, 0, 0],
+                                              [3, 1, 0, 0]]), 12,
+             [t, 'space before ;'])
+        t_ok(loadcase(join(tmpdir, 'none.m')) == 7, [t, 'missing'])
+
+        ## case30 written as a MATPOWER file
+        t = 'case30 : '
+        ppc0 = case30()
+        fname = join(tmpdir, 'c30.m')
+        with open(fname, 'w') as fd:
+            fd.write('function mpc = c30\nmpc.version = %r;\n'
+                     'mpc.baseMVA = %g;\n' %
+                     (ppc0['version'], ppc0['baseMVA']))
+            for k in ['bus', 'gen', 'branch', 'areas', 'gencost']:
+                fd.write('mpc.%s = [\n' % k)
+                for row in ppc0[k]:
+                    fd.write('\t%s;\n' % '\t'.join('%.17g' % x for x in row))
+                fd.write('];\n\n')
+        ppc = loadcase(fname)
+        t_ok(all(array_equal(ppc[k], ppc0[k])
+                 for k in ['bus', 'gen', 'branch', 'areas', 'gencost']),
+             [t, 'arrays'])
+        t_ok(ppc['baseMVA'] == ppc0['baseMVA'], [t, 'baseMVA'])
+    finally:
+        rmtree(tmpdir)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_casem(quiet=False)
@@ -0,0 +1,97 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for DC contingency screening.
+"""
+
+from numpy import arange, flatnonzero as find
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.rundcpf import rundcpf
+from pypower.dcscreen import dcscreen
+
+from pypower.idx_brch import PF, RATE_A, RATE_C, BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_dcscreen(quiet=False):
+    """Tests for DC contingency screening.
+    """
+    t_begin(12, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## ratings which give overloads, without ties at the limit
+    ppc = case30()
+    ppc['branch'][:, RATE_A] = 0.8 * ppc['branch'][:, RATE_A] + 0.1
+    nl = ppc['branch'].shape[0]
+    radial = [12, 15, 33]
+    pairs = [[0, 2], [5, 8], [10, 20], [12, 2]]
+
+    def reference(outaged):
+        ## overloaded branches and flows, from a DC power flow
+        p = case30()
+        p['branch'][:, RATE_A] = ppc['branch'][:, RATE_A]
+        p['branch'][outaged, BR_STATUS] = 0
+        r, _ = rundcpf(p, ppopt)
+        rate = p['branch'][:, RATE_A]
+        l = find((abs(r['branch'][:, PF]) > rate) & (rate > 0) &
+                 (p['branch'][:, BR_STATUS] > 0))
+        return l, r['branch'][l, PF]
+
+    def found(res, k, m=-1):
+        sel = (res['outage'] == k) & (res['outage2'] == m)
+        return res['branch'][sel], res['flow'][sel]
+
+    t = 'single outages : '
+    res = dcscreen(ppc, block=7)
+    ok_l, ok_f = True, True
+    for k in set(range(nl)) - set(radial):
+        l, f = reference([k])
+        lk, fk = found(res, k)
+        ok_l = ok_l and list(lk) == list(l)
+        ok_f = ok_f and abs(fk - f).max(initial=0) < 1e-8
+    t_ok(len(res['outage']) > 0, [t, 'overloads found'])
+    t_ok(ok_l, [t, 'overloaded branches'])
+    t_ok(ok_f, [t, 'flows'])
+    t_is(res['loading'],
+         100 * abs(res['flow']) / ppc['branch'][res['branch'], RATE_A], 12,
+         [t, 'loading'])
+    t_is(res['islanding'][:, 0], radial, 12, [t, 'islanding'])
+    t_ok((res['islanding'][:, 1] == -1).all(), [t, 'islanding single'])
+
+    t = 'block size : '
+    res1 = dcscreen(ppc, block=1)
+    t_ok((res1['branch'] == res['branch']).all() and
+         (res1['outage'] == res['outage']).all(), [t, 'same overloads'])
+    t_is(res1['flow'], res['flow'], 12, [t, 'same flows'])
+
+    t = 'double outages : '
+    res = dcscreen(ppc, outages=[], pairs=pairs)
+    ok_l, ok_f = True, True
+    for k, m in pairs[:3]:
+        l, f = reference([k, m])
+        lk, fk = found(res, k, m)
+        ok_l = ok_l and list(lk) == list(l)
+        ok_f = ok_f and abs(fk - f).max(initial=0) < 1e-8
+    t_ok(ok_l, [t, 'overloaded branches'])
+    t_ok(ok_f, [t, 'flows'])
+    t_is(res['islanding'], [pairs[3]], 12, [t, 'islanding'])
+
+    t = 'RATE_C : '
+    ppc['branch'][:, RATE_C] = 0
+    ppc['branch'][:3, RATE_C] = 1
+    res = dcscreen(ppc, outages=arange(10, 20), rating=RATE_C)
+    t_ok(set(res['branch']) == set(range(3)), [t, 'monitored branches'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_dcscreen(quiet=False)
@@ -0,0 +1,92 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for island detection and power flow of islanded networks.
+"""
+
+from numpy import r_, arange
+
+from pypower.case9 import case9
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.ext2int import ext2int
+from pypower.find_islands import find_islands
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, VM, VA, PV, REF
+from pypower.idx_brch import F_BUS, T_BUS, PF, QT, BR_STATUS
+from pypower.idx_gen import GEN_BUS, PG, QG, GEN_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_find_islands(quiet=False):
+    """Tests for island detection and power flow of islanded networks.
+    """
+    t_begin(18, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## case9 and case30 (buses renumbered from 101) in one case
+    a, b = case9(), case30()
+    b['bus'][:, BUS_I] += 100
+    b['gen'][:, GEN_BUS] += 100
+    b['branch'][:, [F_BUS, T_BUS]] += 100
+    ppc = {'version': '2', 'baseMVA': 100.0,
+           'bus': r_[a['bus'], b['bus']],
+           'gen': r_[a['gen'], b['gen'][:, :a['gen'].shape[1]]],
+           'branch': r_[a['branch'], b['branch']]}
+
+    t = 'find_islands : '
+    p = ext2int(ppc)
+    groups = find_islands(p['bus'], p['branch'])
+    t_ok(len(groups) == 2, [t, 'two islands'])
+    t_is(groups[0], arange(9), 12, [t, 'case9 buses'])
+    t_is(groups[1], arange(9, 39), 12, [t, 'case30 buses'])
+    p['branch'][0, BR_STATUS] = 0            ## isolates bus 1
+    groups = find_islands(p['bus'], p['branch'])
+    t_ok(len(groups) == 3 and list(groups[0]) == [0], [t, 'single bus island'])
+
+    ra, _ = runpf(case9(), ppopt)
+    rb, _ = runpf(case30(), ppopt)
+    for nproc in [1, 2]:
+        t = 'runpf, PF_NPROC = %d : ' % nproc
+        r, success = runpf(ppc, ppoption(ppopt, PF_NPROC=nproc))
+        t_ok(success, [t, 'success'])
+        t_is(r['bus'][:, [VM, VA]], r_[ra['bus'], rb['bus']][:, [VM, VA]], 8,
+             [t, 'bus voltages'])
+        t_is(r['branch'][:, PF:QT + 1],
+             r_[ra['branch'], rb['branch']][:, PF:QT + 1], 6, [t, 'flows'])
+
+    t = 'runpf, PF_NPROC = 2, ITER_CALLBACK : '
+    hist = []
+    r, success = runpf(ppc, ppoption(ppopt, PF_NPROC=2,
+                                     ITER_CALLBACK=lambda d: hist.append(d)))
+    t_ok(success, [t, 'success'])
+    t_ok(len(hist) > 0, [t, 'callback called'])
+
+    t = 'island without reference : '
+    ppc['bus'][0, BUS_TYPE] = PV             ## case9 loses its reference
+    r, success = runpf(ppc, ppopt)
+    t_ok(success, [t, 'success'])
+    t_ok(r['bus'][0, BUS_TYPE] == REF, [t, 'PV bus made reference'])
+    t_is(r['bus'][:9, [VM, VA]], ra['bus'][:, [VM, VA]], 8,
+         [t, 'bus voltages'])
+
+    t = 'dead island : '
+    ppc['gen'][:3, GEN_STATUS] = 0           ## case9 loses its generation
+    r, success = runpf(ppc, ppopt)
+    t_ok(success, [t, 'success'])
+    t_ok((r['bus'][:9, VM] == 0).all() and (r['gen'][:3, [PG, QG]] == 0).all(),
+         [t, 'de-energized'])
+    t_is(r['bus'][9:, VM], rb['bus'][:, VM], 8, [t, 'other island solved'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_find_islands(quiet=False)
@@ -0,0 +1,48 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for Gauss-Seidel and Jacobi power flow.
+"""
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.newtonpf import newtonpf
+from pypower.gausspf import gausspf
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+from pypower.t.t_newtonpf import pf_data
+
+
+def t_gausspf(quiet=False):
+    """Tests for Gauss-Seidel and Jacobi power flow.
+    """
+    t_begin(7, quiet)
+
+    ppopt = ppoption(VERBOSE=0)
+    Ybus, Sbus, V0, ref, pv, pq = pf_data(case30())
+    S0 = Sbus.copy()
+    Vsol, _, _ = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+
+    t = 'Gauss-Seidel : '
+    V, success, it = gausspf(Ybus, Sbus, V0, ref, pv, pq, ppopt)
+    t_ok(success, [t, 'success'])
+    t_is(V, Vsol, 6, [t, 'V'])
+    t_ok((Sbus == S0).all(), [t, 'Sbus unchanged'])
+
+    t = 'Jacobi : '
+    opt = ppoption(ppopt, PF_GS_JACOBI=1, PF_MAX_IT_GS=2000)
+    V, success, i = gausspf(Ybus, Sbus, V0, ref, pv, pq, opt)
+    t_ok(success, [t, 'success'])
+    t_is(V, Vsol, 6, [t, 'V'])
+    t_ok(i > it, [t, 'more iterations than Gauss-Seidel'])
+    t_ok((Sbus == S0).all(), [t, 'Sbus unchanged'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_gausspf(quiet=False)
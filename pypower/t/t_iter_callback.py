@@ -0,0 +1,79 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the iteration callback of the power flow and OPF solvers.
+"""
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runopf import runopf
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+from pypower.t.t_bfswpf import feeder
+
+
+def t_iter_callback(quiet=False):
+    """Tests for the iteration callback of the power flow and OPF solvers.
+    """
+    t_begin(19, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    for alg, solver, keys in [
+            (1, 'newtonpf', ['normF', 'step', 'time', 'solve_time', 'V']),
+            (2, 'fdpf', ['type', 'normP', 'normQ', 'normF', 'step', 'time',
+                         'solve_time', 'V']),
+            (4, 'gausspf', ['normF', 'step', 'time', 'V']),
+            (5, 'bfswpf', ['normF', 'step', 'time', 'V'])]:
+        t = '%s : ' % solver
+        records = []
+        opt = ppoption(ppopt, PF_ALG=alg, ITER_CALLBACK=records.append)
+        r, success = runpf(feeder() if alg == 5 else case30(), opt)
+        t_ok(success and len(records) > 0 and
+             all(rec['solver'] == solver for rec in records),
+             [t, 'called'])
+        its = [rec['iteration'] for rec in records if rec.get('type') != 'Q']
+        t_ok(all(k in rec for rec in records for k in keys) and
+             its == list(range(1, len(its) + 1)), [t, 'records'])
+        t_ok(records[-1]['normF'] < opt['PF_TOL'], [t, 'final mismatch'])
+
+    t = 'newtonpf, stopped : '
+    opt = ppoption(ppopt, ITER_CALLBACK=lambda rec: rec['iteration'] == 1)
+    r, success = runpf(case30(), opt)
+    t_ok(not success, [t, 'success = 0'])
+
+    t = 'fdpf, stopped : '
+    records = []
+    def stop(rec):
+        records.append(rec)
+        return rec['type'] == 'Q'
+    r, success = runpf(case30(), ppoption(ppopt, PF_ALG=2, ITER_CALLBACK=stop))
+    t_ok(not success and [rec['type'] for rec in records] == ['P', 'Q'],
+         [t, 'after first Q iteration'])
+
+    t = 'pips : '
+    records = []
+    r = runopf(case30(), ppoption(ppopt, ITER_CALLBACK=records.append))
+    t_ok(r['success'] and len(records) == r['raw']['output']['iterations'] and
+         all(rec['solver'] == 'pips' for rec in records), [t, 'called'])
+    t_ok(all(k in records[0] for k in ['iteration', 'feascond', 'gradcond',
+                                       'compcond', 'costcond', 'stepsize',
+                                       'obj', 'time', 'x']),
+         [t, 'records'])
+
+    t = 'pips, stopped : '
+    opt = ppoption(ppopt, ITER_CALLBACK=lambda rec: rec['iteration'] == 3)
+    r = runopf(case30(), opt)
+    t_ok(not r['success'], [t, 'success = 0'])
+    t_ok(r['raw']['output']['iterations'] == 3, [t, 'iterations'])
+    t_ok(r['raw']['output']['message'] == 'Stopped by callback', [t, 'message'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_iter_callback(quiet=False)
@@ -5,7 +5,9 @@
 """Numerical tests of partial derivative code.
 """
 
-from numpy import ones, conj, eye, exp, pi, array
+from numpy import ones, conj, eye, exp, pi, array, arange, ix_, r_
+
+from scipy.sparse import bmat
 
 from pypower.case30 import case30
 from pypower.ppoption import ppoption
@@ -13,6 +15,8 @@ from pypower.loadcase import loadcase
 from pypower.ext2int import ext2int1
 from pypower.runpf import runpf
 from pypower.makeYbus import makeYbus
+from pypower.bustypes import bustypes
+from pypower.jac_builder import jac_builder
 from pypower.dSbus_dV import dSbus_dV
 from pypower.dSbr_dV import dSbr_dV
 from pypower.dAbr_dV import dAbr_dV
@@ -31,7 +35,7 @@ def t_jacobian(quiet=False):
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    t_begin(28, quiet)
+    t_begin(31, quiet)
 
     ## run powerflow to get solved case
     ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
@@ -172,6 +176,34 @@ def t_jacobian(quiet=False):
     t_is(dIt_dVm_full, num_dIt_dVm, 5, 'dIt_dVm (full)')
     t_is(dIt_dVa_full, num_dIt_dVa, 5, 'dIt_dVa (full)')
 
+    ##-----  check jac_builder code  -----
+    _, pv, pq = bustypes(bus, gen)
+    pvpq = r_[pv, pq]
+    V = Vc.flatten()
+
+    def jac(Ybus):
+        dS_dVm, dS_dVa = dSbus_dV(Ybus, V)
+        return bmat([
+            [dS_dVa[ix_(pvpq, pvpq)].real, dS_dVm[ix_(pvpq, pq)].real],
+            [dS_dVa[ix_(pq,   pvpq)].imag, dS_dVm[ix_(pq,   pq)].imag]
+        ]).todense()
+
+    builder = jac_builder(Ybus, pv, pq)
+    t_is(builder.build(V).todense(), jac(Ybus), 12, 'jac_builder')
+
+    ## values of Ybus changed in place, same pattern
+    builder.Ybus.data *= 1.1
+    t_is(builder.build(V).todense(), jac(builder.Ybus), 12,
+         'jac_builder (Ybus changed in place)')
+
+    ## bordered by a row and a column
+    nj = len(pvpq) + len(pq)
+    b, c = arange(nj) + 1.0, arange(nj) - 0.5
+    A = builder.bordered(V, b, c, 2.0).todense()
+    t_is(A, bmat([[jac(builder.Ybus), b.reshape(-1, 1)],
+                  [c.reshape(1, -1), 2.0]]).todense(), 12,
+         'jac_builder (bordered)')
+
     t_end()
 
 
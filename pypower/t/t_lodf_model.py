@@ -0,0 +1,71 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{lodf_model}.
+"""
+
+from numpy import ones, isnan, outer, ix_
+
+from pypower.case30 import case30
+from pypower.ext2int import ext2int
+from pypower.makePTDF import makePTDF
+from pypower.makeLODF import makeLODF
+from pypower.lodf_model import lodf_model
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_lodf_model(quiet=False):
+    """Tests for C{lodf_model}.
+    """
+    t_begin(11, quiet)
+
+    ppc = ext2int(case30())
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+    nb = bus.shape[0]
+    w = ones(nb)
+
+    H = makePTDF(baseMVA, bus, branch)
+    Hw = makePTDF(baseMVA, bus, branch, w)
+    LODF = makeLODF(branch, H)
+
+    ks = [0, 5, 20, 40]
+    rows = [3, 7, 22]
+    radial = 12
+
+    t = 'LODF columns : '
+    lm = lodf_model(baseMVA, bus, branch, maxcols=3)
+    t_is(lm.lodf(ks), LODF[:, ks], 8, [t, 'all rows'])
+    t_is(lm.lodf(ks, rows), LODF[ix_(rows, ks)], 8, [t, 'selected rows'])
+    t_ok(isnan(lm.lodf(radial)).all(), [t, 'islanding outage'])
+
+    t = 'LRU cache : '
+    t_ok(list(lm.cache.keys()) == [20, 40, radial], [t, 'bounded'])
+    lm.lodf(20)
+    t_ok(list(lm.cache.keys()) == [40, radial, 20], [t, 'order'])
+    lm.cache[20] = 0 * lm.cache[20]
+    t_ok((lm.lodf(20)[:, 0] == [-1 if i == 20 else 0
+                                for i in range(branch.shape[0])]).all(),
+         [t, 'cached column used'])
+
+    t = 'PTDF rows : '
+    t_is(lm.ptdf(rows), H[rows], 8, [t, 'single slack'])
+    lmw = lodf_model(baseMVA, bus, branch, w)
+    t_is(lmw.ptdf(rows), Hw[rows], 8, [t, 'distributed slack'])
+    t_is(lmw.lodf(ks), LODF[:, ks], 8, [t, 'LODF independent of slack'])
+
+    t = 'OTDF : '
+    k = 5
+    O = H[rows] + outer(LODF[rows, k], H[k])
+    t_is(lm.otdf(k, rows), O, 8, [t, 'flowgates'])
+    t_is(lm.otdf(k, rows, [2, 9]), O[:, [2, 9]], 8, [t, 'selected buses'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_lodf_model(quiet=False)
@@ -7,7 +7,8 @@
 
 from os.path import dirname, join
 
-from numpy import ones, zeros, eye, arange, dot, matrix, flatnonzero as find
+from numpy import \
+    ones, zeros, eye, arange, dot, matrix, float32, ix_, flatnonzero as find
 
 from scipy.sparse import csr_matrix as sparse
 
@@ -29,7 +30,7 @@ def t_makePTDF(quiet=False):
 
     @author: Ray Zimmerman (PSERC Cornell)
     """
-    ntests = 24
+    ntests = 35
     t_begin(ntests, quiet)
 
     tdir = dirname(__file__)
@@ -100,6 +101,25 @@ def t_makePTDF(quiet=False):
     t_is(zeros(nbr),  dot(Hg, (-Pd)),  3,  'zeros == Hg  * (-Pd)')
     t_is(zeros(nbr),  dot(Hd, Pg),  3,  'zeros == Hd  * Pg')
 
+    ## selected rows and columns
+    bi = [8, 2, 5]
+    bri = [1, 7]
+    for slack, H, name in [(3, H4, 'H4'), (Pd, Hg, 'Hg'), (Dd, Hd, 'Hd')]:
+        t_is(makePTDF(baseMVA, bus, branch, slack, bus_idx=bi), H[:, bi],
+             8, '%s columns' % name)
+        t_is(makePTDF(baseMVA, bus, branch, slack, branch_idx=bri), H[bri],
+             8, '%s rows' % name)
+
+    ## float32 and lazy operator
+    H = makePTDF(baseMVA, bus, branch, Pd, dtype=float32)
+    t_is(H.dtype == float32, 1, 0, 'float32')
+    t_is(H, Hg, 6, 'float32 values')
+    Hop = makePTDF(baseMVA, bus, branch, Pd, bi, bri, lazy=True)
+    t_is(Hop.shape, (len(bri), len(bi)), 0, 'lazy shape')
+    t_is(Hop.matvec(P[bi]), dot(Hg[ix_(bri, bi)], P[bi]), 8, 'lazy matvec')
+    t_is(Hop.rmatvec(F[bri]), dot(F[bri], Hg[ix_(bri, bi)]), 8,
+         'lazy rmatvec')
+
     t_end()
 
 
@@ -0,0 +1,126 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for options of Newton's method power flow.
+"""
+
+from numpy import exp, pi, ones, conj, r_, setdiff1d, sin, cos, arange, angle
+
+from scipy.sparse import csr_matrix as sparse
+
+from pypower.case30 import case30
+from pypower.case118 import case118
+from pypower.case300 import case300
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.ext2int import ext2int
+from pypower.bustypes import bustypes
+from pypower.makeYbus import makeYbus
+from pypower.makeSbus import makeSbus
+from pypower.newtonpf import newtonpf
+
+from pypower.idx_bus import BUS_TYPE, QD, VM, VA
+from pypower.idx_gen import GEN_BUS, GEN_STATUS, QG, QMAX, QMIN, VG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def pf_data(ppc):
+    """Returns the inputs to C{newtonpf} for the case C{ppc}.
+    """
+    ppc = ext2int(ppc)
+    baseMVA, bus, gen, branch = \
+        ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+    ref, pv, pq = bustypes(bus, gen)
+    Ybus, _, _ = makeYbus(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V0 = bus[:, VM] * exp(1j * pi / 180 * bus[:, VA])
+    gbus = gen[:, GEN_BUS].astype(int)
+    V0[gbus] = gen[:, VG] / abs(V0[gbus]) * V0[gbus]
+
+    return Ybus, Sbus, V0, ref, pv, pq
+
+
+def t_newtonpf(quiet=False):
+    """Tests for options of Newton's method power flow.
+    """
+    t_begin(26, quiet)
+
+    ppopt = ppoption(VERBOSE=0)
+
+    for name, case in [('case30', case30), ('case300', case300)]:
+        Ybus, Sbus, V0, ref, pv, pq = pf_data(case())
+        Vsol, success, it = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+
+        t = '%s : PF_NR_LU = 1 : ' % name
+        opt = ppoption(ppopt, PF_NR_LU=1)
+        V, success, i = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, opt)
+        t_ok(success, [t, 'success'])
+        t_ok(i == it, [t, 'same iterations as full Newton'])
+        t_is(V, Vsol, 9, [t, 'V'])
+
+        t = '%s : PF_NR_LU = 2 : ' % name
+        opt = ppoption(ppopt, PF_NR_LU=2, PF_MAX_IT=20)
+        V, success, i = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, opt)
+        t_ok(success, [t, 'success'])
+        t_ok(i >= it, [t, 'chord iterations'])
+        t_is(V, Vsol, 7, [t, 'V'])
+
+    t = 'case30 : PF_NR_DAMPING : '
+    Ybus, Sbus, V0, ref, pv, pq = pf_data(case30())
+    Vsol, success, it = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+    opt = ppoption(ppopt, PF_NR_DAMPING=1)
+    V, success, i = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, opt)
+    t_is(V, Vsol, 9, [t, 'optimal multiplier, same solution'])
+
+    ## poor initial voltages, where full Newton steps diverge
+    nb = len(V0)
+    V0 = abs(V0) * exp(0.2j * sin(arange(nb)))
+    V0[pq] = (0.95 + 0.1 * cos(arange(len(pq)))) * exp(1j * angle(V0[pq]))
+    V, success, i = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt)
+    t_ok(not success, [t, 'poor start : full steps fail'])
+    for d, name in [(1, 'optimal multiplier'), (2, 'backtracking')]:
+        opt = ppoption(ppopt, PF_NR_DAMPING=d)
+        V, success, i = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, opt)
+        t_ok(success, [t, 'poor start : %s : success' % name])
+        t_is(V, Vsol, 8, [t, 'poor start : %s : V' % name])
+
+    t = 'case118 : Q limits within iterations : '
+    ppc = ext2int(case118())
+    bus, gen = ppc['bus'], ppc['gen']
+    nb, ng = bus.shape[0], gen.shape[0]
+    Cg = sparse((ones(ng), (gen[:, GEN_BUS], range(ng))), (nb, ng))
+    Qmin = (Cg * gen[:, QMIN] - bus[:, QD]) / ppc['baseMVA']
+    Qmax = (Cg * gen[:, QMAX] - bus[:, QD]) / ppc['baseMVA']
+    Ybus, Sbus, V0, ref, pv, pq = pf_data(case118())
+    V, success, i, lim = newtonpf(Ybus, Sbus, V0.copy(), ref, pv, pq, ppopt,
+                                  (Qmin, Qmax))
+    Q = (V * conj(Ybus * V)).imag
+    pv1 = setdiff1d(pv, lim)
+    t_ok(success, [t, 'success'])
+    t_ok(len(lim) > 0, [t, 'some buses converted'])
+    t_ok(all((Q[pv1] <= Qmax[pv1] + 1e-8) & (Q[pv1] >= Qmin[pv1] - 1e-8)),
+         [t, 'PV buses within limits'])
+    t_ok(all((abs(Q[lim] - Qmax[lim]) < 1e-8) | (abs(Q[lim] - Qmin[lim]) < 1e-8)),
+         [t, 'converted buses at limits'])
+    t_is(abs(V[pv1]), abs(V0[pv1]), 12, [t, 'PV bus voltages held'])
+
+    t = 'case30 : ENFORCE_Q_LIMS = 3 vs 1 : '
+    opt = ppoption(ppopt, OUT_ALL=0)
+    r1, success1 = runpf(case30(), ppoption(opt, ENFORCE_Q_LIMS=1))
+    r3, success3 = runpf(case30(), ppoption(opt, ENFORCE_Q_LIMS=3))
+    t_ok(success1 and success3, [t, 'success'])
+    t_is(r3['bus'][:, r_[VM, VA, BUS_TYPE]], r1['bus'][:, r_[VM, VA, BUS_TYPE]],
+         8, [t, 'bus'])
+    on = r3['gen'][:, GEN_STATUS] > 0
+    t_is(r3['gen'][on, QG], r1['gen'][on, QG], 6, [t, 'Qg'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_newtonpf(quiet=False)
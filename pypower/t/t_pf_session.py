@@ -0,0 +1,113 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{pf_session}.
+"""
+
+from numpy import arange
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.makeB import makeB
+from pypower.pf_session import pf_session
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_brch import PF, QT, BR_STATUS
+from pypower.idx_gen import PG, QG, VG, GEN_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_pf_session(quiet=False):
+    """Tests for C{pf_session}.
+    """
+    t_begin(35, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    ## case with an out-of-service branch and generator
+    ppc0 = case30()
+    ppc0['branch'][10, BR_STATUS] = 0
+    ppc0['gen'][3, GEN_STATUS] = 0
+
+    def check(t, r, ppc, prec=8):
+        rpf, success = runpf(ppc, ppopt)
+        t_ok(r['success'] == success, [t, 'success'])
+        t_is(r['bus'][:, [VM, VA]], rpf['bus'][:, [VM, VA]], prec,
+             [t, 'bus voltages'])
+        t_is(r['gen'][:, [PG, QG]], rpf['gen'][:, [PG, QG]], prec - 2,
+             [t, 'gen outputs'])
+        t_is(r['branch'][:, PF:QT + 1], rpf['branch'][:, PF:QT + 1],
+             prec - 2, [t, 'branch flows'])
+
+    pfs = pf_session(ppc0, ppopt)
+    ppc = case30()
+    ppc['branch'][10, BR_STATUS] = 0
+    ppc['gen'][3, GEN_STATUS] = 0
+    ppc['bus'] = ppc['bus'].astype(float)
+    ppc['gen'] = ppc['gen'].astype(float)
+
+    r, _ = pfs.solve()
+    check('base case : ', r, ppc)
+
+    pfs.set_load([7, 21], Pd=[30.0, 25.0], Qd=[12.0, 10.0])
+    ppc['bus'][[6, 20], PD] = [30.0, 25.0]
+    ppc['bus'][[6, 20], QD] = [12.0, 10.0]
+    pfs.set_gen(1, Pg=70.0, Vg=1.05)
+    ppc['gen'][1, [PG, VG]] = [70.0, 1.05]
+    r, _ = pfs.solve()
+    check('loads and dispatch : ', r, ppc)
+
+    pfs.set_branch_status([10, 20], [1, 0])
+    ppc['branch'][[10, 20], BR_STATUS] = [1, 0]
+    r, _ = pfs.solve()
+    check('branch switching : ', r, ppc)
+
+    pfs.ppopt = ppoption(ppopt, PF_ALG=2)
+    r, _ = pfs.solve()
+    check('fast-decoupled : ', r, ppc, 5)
+    pfs.ppopt = ppoption(ppopt, PF_ALG=3)
+    r, _ = pfs.solve()
+    t = 'fast-decoupled BX : '
+    check(t, r, ppc, 5)
+    Bp, Bpp = makeB(pfs.baseMVA, pfs.bus, pfs.ym.branch, 3)
+    t_is(pfs.B[3][0].toarray(), Bp.toarray(), 12, [t, 'B\' not of XB'])
+    t_is(pfs.B[3][1].toarray(), Bpp.toarray(), 12, [t, 'B\'\' not of XB'])
+
+    t = 'recovery : '
+    pfs.ppopt = ppopt
+    nb = ppc['bus'].shape[0]
+    pfs.set_load(arange(1, nb + 1), Pd=6 * ppc['bus'][:, PD])
+    r, success = pfs.solve()
+    t_ok(not success, [t, 'heavy load fails'])
+    pfs.set_load(arange(1, nb + 1), Pd=ppc['bus'][:, PD])
+    r, success = pfs.solve()
+    t_ok(success, [t, 'load restored, success'])
+    check(t, r, ppc)
+
+    t = 'errors : '
+    try:
+        pfs.set_gen(3, Pg=10.0)
+        t_ok(0, [t, 'out-of-service gen'])
+    except ValueError:
+        t_ok(1, [t, 'out-of-service gen'])
+    for bus in [0, -1, 31, 1000]:
+        try:
+            pfs.set_load(bus, Pd=55.0)
+            t_ok(0, [t, 'unknown bus %d' % bus])
+        except ValueError:
+            t_ok(1, [t, 'unknown bus %d' % bus])
+    t_ok(pfs.bus[0, PD] == ppc['bus'][0, PD], [t, 'bus 1 load unchanged'])
+    t_ok((ppc0['branch'][:, BR_STATUS] == case30()['branch'][:, BR_STATUS]
+          ).sum() == ppc0['branch'].shape[0] - 1, [t, 'case not modified'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_pf_session(quiet=False)
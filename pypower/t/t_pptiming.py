@@ -0,0 +1,78 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for per-phase timing of power flow and OPF runs.
+"""
+
+from pypower.case9 import case9
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runopf import runopf
+from pypower.pptiming import pptiming
+from pypower.synthcase import synthcase
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_pptiming(quiet=False):
+    """Tests for per-phase timing of power flow and OPF runs.
+    """
+    t_begin(14, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    t = 'runpf : '
+    r, success = runpf(case30(), ppopt)
+    t_ok('timing' not in r, [t, 'no timing by default'])
+    r, success = runpf(case30(), ppoption(ppopt, TIMING=1))
+    tm = r['timing']
+    t_ok(all(p in tm for p in ['loadcase', 'ext2int', 'makeYbus', 'newtonpf',
+                                'pfsoln', 'int2ext', 'printpf']),
+         [t, 'phases'])
+    t_ok(all(p['time'] >= 0 for p in tm.values()), [t, 'times'])
+    t_ok(tm['newtonpf.solve']['count'] == tm['newtonpf.update']['count'] > 0,
+         [t, 'Newton iterations'])
+    t_ok(tm['newtonpf']['time'] >= tm['newtonpf.solve']['time'],
+         [t, 'iterations within solver'])
+
+    t = 'runpf, fast-decoupled : '
+    r, success = runpf(case30(), ppoption(ppopt, PF_ALG=2, TIMING=1))
+    t_ok('fdpf' in r['timing'] and 'newtonpf' not in r['timing'],
+         [t, 'solver phase'])
+
+    t = 'accumulated : '
+    rec = pptiming()
+    runpf(case30(), ppoption(ppopt, TIMING=rec))
+    r, success = runpf(case30(), ppoption(ppopt, TIMING=rec))
+    t_ok(r['timing']['makeYbus']['count'] == 2, [t, 'two runs'])
+    t_ok(rec.summary() == r['timing'], [t, 'recorder summary'])
+
+    t = 'runpf, islands : '
+    ppc = synthcase(18, base=case9(), nties=0)      ## two islands
+    for nproc in [1, 2]:
+        r, success = runpf(ppc, ppoption(ppopt, PF_NPROC=nproc, TIMING=1))
+        t_ok(r['timing']['makeYbus']['count'] == 2 and
+             r['timing']['newtonpf.solve']['count'] > 0,
+             [t, 'PF_NPROC = %d' % nproc])
+
+    t = 'runopf : '
+    r = runopf(case30(), ppopt)
+    t_ok('timing' not in r, [t, 'no timing by default'])
+    r = runopf(case30(), ppoption(ppopt, TIMING=1))
+    tm = r['timing']
+    t_ok(r['success'], [t, 'success'])
+    t_ok(all(p in tm for p in ['opf_args', 'ext2int', 'opf_setup',
+                                'opf_execute', 'int2ext', 'printpf']),
+         [t, 'phases'])
+    t_ok(tm['pips.solve']['count'] == r['raw']['output']['iterations'],
+         [t, 'PIPS iterations'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_pptiming(quiet=False)
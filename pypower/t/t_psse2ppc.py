@@ -0,0 +1,223 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for PSS/E RAW file conversion.
+"""
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import array_equal
+
+from pypower.case30 import case30
+from pypower.loadcase import loadcase
+from pypower.ppoption import ppoption
+from pypower.psse2ppc import psse2ppc
+from pypower.runpf import runpf
+
+from pypower.idx_bus import BUS_TYPE, PD, QD, GS, BS, VM, VA, BASE_KV, \
+    VMAX, VMIN, BUS_AREA, ZONE
+from pypower.idx_gen import GEN_BUS, PG, QMAX, QMIN, VG, GEN_STATUS, \
+    PMAX, PMIN
+from pypower.idx_brch import T_BUS, BR_R, BR_X, BR_B, RATE_A, TAP, SHIFT, \
+    BR_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+RAW33 = """0,   100.00, 33, 0, 1, 60.00     / PSS(R)E-33    RAW created
+TEST CASE, FOUR BUSES
+VERSION 33
+     1,'BUS 1, HV   ', 345.0000,3,   1,   1,   1,1.04000,   0.0000,1.10000,0.90000,1.10000,0.90000
+     2,'BUS/2       ', 345.0000,2,   1,   1,   1,1.02000,   0.0000,1.05000,0.95000,1.10000,0.90000
+     3,'BUS 3       ', 138.0000,1,   1,   1,   1,1.00000,   0.0000,1.10000,0.90000,1.10000,0.90000
+     4,'BUS 4       ', 138.0000,1,   2,   3,   1,1.00000,   0.0000
+0 / END OF BUS DATA, BEGIN LOAD DATA
+     3,'1 ',1,   1,   1,    50.000,    20.000,     5.000,     2.000,     3.000,    -1.000,   1,1,0
+     3,'2 ',1,   1,   1,    10.000,     5.000,     0.000,     0.000,     0.000,     0.000,   1,1,0
+     4,'1 ',0,   2,   3,    99.000,    99.000,     0.000,     0.000,     0.000,     0.000,   1,1,0
+     4,'2 ',1,   2,   3,    40.000,    10.000
+0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA
+     4,'1 ',1,     1.000,    15.000
+0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA
+     1,'1 ',    50.000,     0.000,   100.000,  -100.000,1.04000,     0,   200.000, 0.00000E+0, 1.00000E+0, 0.00000E+0, 0.00000E+0,1.00000,1,  100.0,   250.000,     0.000,   1,1.0000
+     2,'1 ',    60.000,     0.000,    50.000,   -50.000,1.02000,     0,   100.000, 0.00000E+0, 1.00000E+0, 0.00000E+0, 0.00000E+0,1.00000,1,  100.0,   150.000,    10.000,   1,1.0000
+0 / END OF GENERATOR DATA, BEGIN BRANCH DATA
+     1,     2,'1 ', 1.00000E-2, 5.00000E-2,   0.10000,   250.00,   275.00,   300.00,  0.00000,  0.01000,  0.00000,  0.02000,1,1,   0.00,   1,1.0000
+     3,    -4,'1 ', 2.00000E-2, 8.00000E-2,   0.02000,   100.00,     0.00,     0.00,,,,,1,2,   0.00,   1,1.0000
+0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA
+     2,     3,     0,'1 ',2,2,1,     0.00000,    -0.01000,2,'XFMR 2-3    ',1,   1,1.0000,   0,1.0000,   0,1.0000,   0,1.0000,'            '
+ 1.00000E-3, 2.00000E-2,   200.00
+ 362.250,   0.000,   2.000,   200.00,   220.00,   240.00, 0,      0, 1.10000, 0.90000, 1.10000, 0.90000,  33, 0, 0.00000, 0.00000,  0.000
+ 138.000,   0.000
+     1,     3,     4,'1 ',1,1,1,     0.00000,     0.00000,2,'3WNDTR      ',1,   1,1.0000,   0,1.0000,   0,1.0000,   0,1.0000,'            '
+ 1.00000E-3, 2.00000E-2,   100.00, 1.00000E-3, 2.00000E-2,   100.00, 1.00000E-3, 2.00000E-2,   100.00,1.00000,   0.0000
+ 1.00000,   0.000,   0.000,     0.00,     0.00,     0.00, 0,      0, 1.10000, 0.90000, 1.10000, 0.90000,  33, 0, 0.00000, 0.00000,  0.000
+ 1.00000,   0.000,   0.000,     0.00,     0.00,     0.00, 0,      0, 1.10000, 0.90000, 1.10000, 0.90000,  33, 0, 0.00000, 0.00000,  0.000
+ 1.00000,   0.000,   0.000,     0.00,     0.00,     0.00, 0,      0, 1.10000, 0.90000, 1.10000, 0.90000,  33, 0, 0.00000, 0.00000,  0.000
+0 / END OF TRANSFORMER DATA, BEGIN AREA DATA
+   1,     1,     0.000,    10.000,'AREA 1      '
+0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA
+0 / END OF TWO-TERMINAL DC DATA, BEGIN VSC DC LINE DATA
+Q
+"""
+
+## the same network in version 34, with blanks between some fields
+RAW34 = """0  100.00  34  0  1  60.00     / PSS(R)E-34    RAW created
+TEST CASE, FOUR BUSES
+VERSION 34
+     1 'BUS 1, HV   ' 345.0000 3 1 1 1 1.04000 0.0000 1.10000 0.90000 1.10000 0.90000
+     2,'BUS/2       ', 345.0000,2,   1,   1,   1,1.02000,   0.0000,1.05000,0.95000,1.10000,0.90000
+     3,'BUS 3       ', 138.0000,1,   1,   1,   1,1.00000,   0.0000,1.10000,0.90000,1.10000,0.90000
+     4,'BUS 4       ', 138.0000,1,   2,   3,   1,1.00000,   0.0000
+0 / END OF BUS DATA, BEGIN LOAD DATA
+     3,'1 ',1,   1,   1,    50.000,    20.000,     5.000,     2.000,     3.000,    -1.000,   1,1,0,0.0,0.0,0
+     3,'2 ',1,   1,   1,    10.000,     5.000,     0.000,     0.000,     0.000,     0.000,   1,1,0,0.0,0.0,0
+     4,'1 ',0,   2,   3,    99.000,    99.000,     0.000,     0.000,     0.000,     0.000,   1,1,0,0.0,0.0,0
+     4,'2 ',1,   2,   3,    40.000,    10.000
+0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA
+     4,'1 ',1,     1.000,    15.000
+0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA
+     1,'1 ',    50.000,     0.000,   100.000,  -100.000,1.04000,     0,   200.000, 0.00000E+0, 1.00000E+0, 0.00000E+0, 0.00000E+0,1.00000,1,  100.0,   250.000,     0.000,   1,1.0000
+     2,'1 ',    60.000,     0.000,    50.000,   -50.000,1.02000,     0,   100.000, 0.00000E+0, 1.00000E+0, 0.00000E+0, 0.00000E+0,1.00000,1,  100.0,   150.000,    10.000,   1,1.0000
+0 / END OF GENERATOR DATA, BEGIN BRANCH DATA
+     1,     2,'1 ', 1.00000E-2, 5.00000E-2,   0.10000,'LINE 1-2    ',   250.00,   275.00,   300.00,0,0,0,0,0,0,0,0,0,  0.00000,  0.01000,  0.00000,  0.02000,1,1,   0.00,   1,1.0000
+     3,    -4,'1 ', 2.00000E-2, 8.00000E-2,   0.02000,'            ',   100.00,     0.00,     0.00,0,0,0,0,0,0,0,0,0,,,,,1,2,   0.00,   1,1.0000
+0 / END OF BRANCH DATA, BEGIN SYSTEM SWITCHING DEVICE DATA
+     1,     2,'1 ', 1.00000E-4,   100.00,   100.00,   100.00,0,0,0,0,0,0,0,0,0,1,1,2,'BREAKER     '
+0 / END OF SYSTEM SWITCHING DEVICE DATA, BEGIN TRANSFORMER DATA
+     2,     3,     0,'1 ',2,2,1,     0.00000,    -0.01000,2,'XFMR 2-3    ',1,   1,1.0000,   0,1.0000,   0,1.0000,   0,1.0000,'            ',0
+ 1.00000E-3, 2.00000E-2,   200.00
+ 362.250,   0.000,   2.000,   200.00,   220.00,   240.00,0,0,0,0,0,0,0,0,0, 0,      0, 0, 1.10000, 0.90000, 1.10000, 0.90000,  33, 0, 0.00000, 0.00000,  0.000
+ 138.000,   0.000
+0 / END OF TRANSFORMER DATA, BEGIN AREA DATA
+0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA
+Q
+"""
+
+
+def t_psse2ppc(quiet=False):
+    """Tests for PSS/E RAW file conversion.
+    """
+    t_begin(20, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    tmpdir = mkdtemp()
+    try:
+        fname = join(tmpdir, 'raw33.raw')
+        with open(fname, 'w') as fd:
+            fd.write(RAW33)
+
+        t = 'psse2ppc : '
+        ppc = psse2ppc(fname)
+        bus, gen, branch = ppc['bus'], ppc['gen'], ppc['branch']
+        t_ok(ppc['baseMVA'] == 100 and ppc['version'] == '2', [t, 'baseMVA'])
+        t_ok(bus.shape == (4, 13) and gen.shape == (2, 21) and
+             branch.shape == (3, 13), [t, 'sizes, 3-winding skipped'])
+        t_is(bus[:, BUS_TYPE], [3, 2, 1, 1], 12, [t, 'bus types'])
+        t_is(bus[:, [BASE_KV, BUS_AREA, ZONE, VM]],
+             [[345, 1, 1, 1.04], [345, 1, 1, 1.02], [138, 1, 1, 1],
+              [138, 2, 3, 1]], 12, [t, 'bus data'])
+        t_is(bus[:, [VMAX, VMIN]], [[1.1, 0.9], [1.05, 0.95], [1.1, 0.9],
+                                   [1.1, 0.9]], 12, [t, 'voltage limits'])
+        t_is(bus[:, [PD, QD]], [[0, 0], [0, 0], [68, 28], [40, 10]], 12,
+             [t, 'loads'])
+        t_is(bus[:, [GS, BS]], [[0, 1], [0, 1], [0, 0], [1, 15]], 12,
+             [t, 'shunts'])
+        t_ok(ppc['bus_name'] == ['BUS 1, HV', 'BUS/2', 'BUS 3', 'BUS 4'],
+             [t, 'bus names'])
+        t_is(gen[:, [GEN_BUS, PG, QMAX, QMIN, VG, GEN_STATUS, PMAX, PMIN]],
+             [[1, 50, 100, -100, 1.04, 1, 250, 0],
+              [2, 60, 50, -50, 1.02, 1, 150, 10]], 12, [t, 'generators'])
+        t_is(branch[:2, [T_BUS, BR_R, BR_X, BR_B, RATE_A, TAP, BR_STATUS]],
+             [[2, 0.01, 0.05, 0.1, 250, 0, 1],
+              [4, 0.02, 0.08, 0.02, 100, 0, 1]], 12, [t, 'lines'])
+        t_is(branch[2, [BR_R, BR_X, RATE_A, TAP, SHIFT, BR_STATUS]],
+             [0.0005, 0.01, 200, 1.05, 2, 1], 12, [t, 'transformer'])
+        r, success = runpf(ppc, ppopt)
+        t_ok(success, [t, 'runpf'])
+
+        t = 'version 34 : '
+        fname = join(tmpdir, 'raw34.raw')
+        with open(fname, 'w') as fd:
+            fd.write(RAW34)
+        ppc34 = psse2ppc(fname)
+        t_ok(all(array_equal(ppc34[k], ppc[k])
+                 for k in ['bus', 'gen', 'branch']), [t, 'same case'])
+
+        t = 'errors : '
+        fname = join(tmpdir, 'raw32.raw')
+        with open(fname, 'w') as fd:
+            fd.write(RAW33.replace(' 33, 0, 1', ' 32, 0, 1', 1))
+        t_ok(loadcase(fname) == 5, [t, 'version 32'])
+        fname = join(tmpdir, 'bad.raw')
+        with open(fname, 'w') as fd:
+            fd.write(RAW33.replace("'1 ',1,     1.000", "1X,1,     1.000"))
+        t_ok(loadcase(fname) == 5, [t, 'invalid field'])
+        t_ok(loadcase(join(tmpdir, 'none.raw')) == 8, [t, 'missing'])
+
+        ## case30 written as a RAW file, with transformers for the
+        ## branches with a tap ratio
+        t = 'case30 : '
+        ppc0 = case30()
+        fname = join(tmpdir, 'c30.raw')
+        write_raw(fname, ppc0)
+        ppc = loadcase(join(tmpdir, 'c30'))
+        t_ok(ppc['branch'].shape[0] == ppc0['branch'].shape[0],
+             [t, 'branches'])
+        t_is(ppc['bus'][:, :VMIN + 1], ppc0['bus'], 12, [t, 'bus'])
+        r0, _ = runpf(ppc0, ppopt)
+        r, success = runpf(ppc, ppopt)
+        t_ok(success, [t, 'runpf'])
+        t_is(r['bus'][:, [VM, VA]], r0['bus'][:, [VM, VA]], 8,
+             [t, 'voltages'])
+    finally:
+        rmtree(tmpdir)
+
+    t_end()
+
+
+def write_raw(fname, ppc):
+    """Writes a version 33 PSS/E RAW file of the lines and transformers
+    (branches with a tap ratio) of a case.
+    """
+    bus, gen, branch = ppc['bus'], ppc['gen'], ppc['branch']
+    with open(fname, 'w') as fd:
+        fd.write('0, %g, 33, 0, 1, 60.0 / test\ntitle\ntitle\n' %
+                 ppc['baseMVA'])
+        for b in bus:
+            fd.write("%d,'B%d',%.17g,%d,%d,%d,1,%.17g,%.17g,%.17g,%.17g\n" %
+                     tuple(b[[0, 0, 9, 1, 6, 10, 7, 8, 11, 12]]))
+        fd.write('0 / END OF BUS DATA, BEGIN LOAD DATA\n')
+        for b in bus:
+            fd.write("%d,'1',1,1,1,%.17g,%.17g,0,0,0,0\n" %
+                     tuple(b[[0, 2, 3]]))
+        fd.write('0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA\n')
+        for b in bus:
+            fd.write("%d,'1',1,%.17g,%.17g\n" % tuple(b[[0, 4, 5]]))
+        fd.write('0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA\n')
+        for g in gen:
+            fd.write("%d,'1',%.17g,%.17g,%.17g,%.17g,%.17g,0,%.17g,0,1,0,0,1,"
+                     "%d,100,%.17g,%.17g\n" %
+                     tuple(g[[0, 1, 2, 3, 4, 5, 6, 7, 8, 9]]))
+        fd.write('0 / END OF GENERATOR DATA, BEGIN BRANCH DATA\n')
+        for l in branch[branch[:, TAP] == 0]:
+            fd.write("%d,%d,'1',%.17g,%.17g,%.17g,%.17g,%.17g,%.17g,"
+                     "0,0,0,0,%d\n" % tuple(l[[0, 1, 2, 3, 4, 5, 6, 7, 10]]))
+        fd.write('0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA\n')
+        for l in branch[branch[:, TAP] != 0]:
+            fd.write("%d,%d,0,'1',1,1,1,0,0,2,'T',%d\n" % tuple(l[[0, 1, 10]]))
+            fd.write('%.17g,%.17g,%g\n' % (l[BR_R], l[BR_X], ppc['baseMVA']))
+            fd.write('%.17g,0,%.17g,%.17g,%.17g,%.17g\n' %
+                     tuple(l[[8, 9, 5, 6, 7]]))
+            fd.write('1,0\n')
+        fd.write('0 / END OF TRANSFORMER DATA\nQ\n')
+
+
+if __name__ == '__main__':
+    t_psse2ppc(quiet=False)
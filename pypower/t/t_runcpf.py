@@ -0,0 +1,107 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for continuation power flow.
+"""
+
+from numpy import exp, pi
+
+from pypower.case9 import case9
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runcpf import runcpf
+from pypower.pptiming import pptiming
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_runcpf(quiet=False):
+    """Tests for continuation power flow.
+    """
+    t_begin(16, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    base = case9()
+    target = case9()
+    target['bus'] = target['bus'].astype(float)
+    target['gen'] = target['gen'].astype(float)
+    target['bus'][:, [PD, QD]] = 2.5 * target['bus'][:, [PD, QD]]
+    target['gen'][:, PG] = 2.5 * target['gen'][:, PG]
+
+    def scaled_pf(lam, timing=False):
+        ppc = case9()
+        ppc['bus'] = ppc['bus'].astype(float)
+        ppc['gen'] = ppc['gen'].astype(float)
+        ppc['bus'][:, [PD, QD]] = (1 + 1.5 * lam) * ppc['bus'][:, [PD, QD]]
+        ppc['gen'][:, PG] = (1 + 1.5 * lam) * ppc['gen'][:, PG]
+        return runpf(ppc, ppoption(ppopt, PF_MAX_IT=30, TIMING=timing))
+
+    t = 'stop at nose : '
+    r, success = runcpf(base, target, ppopt)
+    cpf = r['cpf']
+    max_lam = cpf['max_lam']
+    t_ok(success, [t, 'success'])
+    t_ok(cpf['lam'][-1] == max_lam, [t, 'last point at nose'])
+    t_ok(scaled_pf(0.999 * max_lam)[1], [t, 'power flow solvable below nose'])
+    t_ok(not scaled_pf(1.001 * max_lam)[1], [t, 'no solution above nose'])
+    t_is(r['bus'][:, PD], (1 + 1.5 * max_lam) * base['bus'][:, PD], 8,
+         [t, 'Pd at nose'])
+
+    t = 'fixed step size : '
+    r, success = runcpf(base, target, ppoption(ppopt, CPF_ADAPT_STEP=0))
+    t_ok(success, [t, 'success'])
+    t_is(r['cpf']['max_lam'], max_lam, 3, [t, 'max_lam'])
+    t_ok(cpf['iterations'] < r['cpf']['iterations'],
+         [t, 'more iterations than adaptive'])
+
+    ## bisection of max_lam with runpf, to the resolution of the nose
+    ## (CPF_STEP_MIN): 266 factorizations in 15 runs here, against 39 for
+    ## runcpf (with 3 times the base load and PF_MAX_IT = 10, 157 against
+    ## 41 for case30, 140 against 47 for case118, 125 against 46 for
+    ## case300)
+    t = 'runpf bisection : '
+    tm = pptiming()
+    lo, hi = 0.0, 1.0
+    while scaled_pf(hi, tm)[1]:
+        lo, hi = hi, 2 * hi
+    while hi - lo > 1e-4:
+        if scaled_pf((lo + hi) / 2, tm)[1]:
+            lo = (lo + hi) / 2
+        else:
+            hi = (lo + hi) / 2
+    t_ok(lo <= max_lam <= hi + 1e-4, [t, 'same max_lam'])
+    t_ok(3 * cpf['iterations'] < tm.summary()['newtonpf.solve']['count'],
+         [t, '3 times fewer factorizations'])
+
+    t = 'arc length : '
+    r, success = runcpf(base, target, ppoption(ppopt, CPF_PARAMETERIZATION=2))
+    t_is(r['cpf']['max_lam'], max_lam, 3, [t, 'max_lam'])
+
+    t = 'stop at lambda = 0.5 : '
+    r, success = runcpf(base, target, ppoption(ppopt, CPF_STOP_AT=0.5))
+    rpf, _ = scaled_pf(0.5)
+    Vpf = rpf['bus'][:, VM] * exp(1j * pi / 180 * rpf['bus'][:, VA])
+    t_is(r['cpf']['lam'][-1], 0.5, 12, [t, 'lam'])
+    t_is(r['cpf']['V'][-1], Vpf, 8, [t, 'V'])
+    t_is(r['bus'][:, VM], rpf['bus'][:, VM], 8, [t, 'results'])
+
+    t = 'full curve : '
+    r, success = runcpf(base, target, ppoption(ppopt, CPF_STOP_AT='FULL',
+                                               CPF_ADAPT_STEP=1))
+    t_is(r['cpf']['lam'][-1], 0, 12, [t, 'back to lam = 0'])
+    t_ok(r['bus'][:, VM].min() < 0.5 * base['bus'][:, VM].min(),
+         [t, 'low voltage solution'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runcpf(quiet=False)
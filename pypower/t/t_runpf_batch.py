@@ -0,0 +1,78 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for batched Newton power flow.
+"""
+
+from numpy import array, zeros, exp, pi
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runpf_batch import runpf_batch
+from pypower.ext2int import ext2int
+from pypower.makeSbus import makeSbus
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_runpf_batch(quiet=False):
+    """Tests for batched Newton power flow.
+    """
+    t_begin(11, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = case30()
+    scale = array([0.8, 0.9, 1.0, 1.1, 1.2])
+    ns = len(scale)
+    nb = ppc['bus'].shape[0]
+
+    PDs = scale[:, None] * ppc['bus'][:, PD]
+    QDs = scale[:, None] * ppc['bus'][:, QD]
+    PGs = scale[:, None] * ppc['gen'][:, PG]
+
+    ## reference solutions, one runpf per scenario
+    Vref = zeros((ns, nb), complex)
+    for k in range(ns):
+        ppck = case30()
+        ppck['bus'][:, PD] = PDs[k]
+        ppck['bus'][:, QD] = QDs[k]
+        ppck['gen'][:, PG] = PGs[k]
+        r, _ = runpf(ppck, ppopt)
+        Vref[k] = r['bus'][:, VM] * exp(1j * pi / 180 * r['bus'][:, VA])
+
+    t = 'PD, QD, PG scenarios : '
+    V, success, it = runpf_batch(ppc, ppopt, PD=PDs, QD=QDs, PG=PGs)
+    t_ok(success.all(), [t, 'success'])
+    t_ok(V.shape == (ns, nb), [t, 'size'])
+    t_is(abs(V), abs(Vref), 8, [t, 'Vm'])
+    t_is(V.real, Vref.real, 8, [t, 'V real'])
+    t_is(V.imag, Vref.imag, 8, [t, 'V imag'])
+    t_ok((it > 0).all(), [t, 'iterations'])
+
+    t = 'Sbus scenarios : '
+    ppci = ext2int(ppc)     ## all buses in service, same ordering
+    Sbus = makeSbus(ppci['baseMVA'], ppci['bus'], ppci['gen'])
+    Sbus = scale[:, None] * Sbus
+    V, success, it = runpf_batch(ppc, ppopt, Sbus=Sbus)
+    t_ok(success.all(), [t, 'success'])
+    t_is(V.real, Vref.real, 8, [t, 'V real'])
+    t_is(V.imag, Vref.imag, 8, [t, 'V imag'])
+
+    t = 'single scenario : '
+    V, success, it = runpf_batch(ppc, ppopt, PD=PDs[3], QD=QDs[3], PG=PGs[3])
+    t_ok(success.all(), [t, 'success'])
+    t_is(V, Vref[3:4], 8, [t, 'V'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runpf_batch(quiet=False)
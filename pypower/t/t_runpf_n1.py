@@ -0,0 +1,78 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for AC N-1 contingency analysis.
+"""
+
+from numpy import array, sqrt, maximum, argmax
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runpf_n1 import runpf_n1
+
+from pypower.idx_bus import VM
+from pypower.idx_brch import PF, QF, PT, QT, RATE_A, BR_STATUS
+from pypower.idx_gen import GEN_STATUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_runpf_n1(quiet=False):
+    """Tests for AC N-1 contingency analysis.
+    """
+    t_begin(16, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    branches = array([0, 3, 7, 20, 35])
+    gens = array([1, 4])
+
+    ## reference results, one runpf per contingency
+    vmin, loading, lbr = [], [], []
+    for table, col, rows in [('branch', BR_STATUS, branches),
+                             ('gen', GEN_STATUS, gens)]:
+        for k in rows:
+            ppc = case30()
+            ppc[table][k, col] = 0
+            r, _ = runpf(ppc, ppopt)
+            br = r['branch']
+            S = maximum(sqrt(br[:, PF]**2 + br[:, QF]**2),
+                        sqrt(br[:, PT]**2 + br[:, QT]**2))
+            vmin.append(r['bus'][:, VM].min())
+            loading.append(100 * (S / br[:, RATE_A]).max())
+            lbr.append(argmax(S / br[:, RATE_A]))
+
+    for nproc in [1, 2]:
+        t = 'nproc = %d : ' % nproc
+        res, success = runpf_n1(case30(), ppopt, branches, gens, nproc)
+        t_ok(success, [t, 'base case success'])
+        t_ok(res['success'].all(), [t, 'contingencies success'])
+        t_ok((res['idx'] == list(branches) + list(gens)).all(), [t, 'idx'])
+        t_is(res['vmin'], vmin, 6, [t, 'vmin'])
+        t_is(res['max_loading'], loading, 4, [t, 'max_loading'])
+        t_is(res['max_loading_branch'], lbr, 12, [t, 'max_loading_branch'])
+
+    t = 'all contingencies : '
+    res, success = runpf_n1(case30(), ppopt, nproc=1)
+    t_ok(len(res['idx']) == 41 + 6, [t, 'count'])
+
+    ## branch rows 12, 15 and 33 are the only connections of buses 11, 13
+    ## and 26, the other outages are solved
+    t = 'islanding outages : '
+    isl = res['status'] == 'islanded'
+    t_ok((res['type'][isl] == 'branch').all() and
+         list(res['idx'][isl]) == [12, 15, 33], [t, 'status'])
+    t_ok((res['status'][~isl] == 'solved').all() and
+         (res['success'] == ~isl).all(), [t, 'others solved'])
+    t_ok((res['vmin'][isl] == 0).all() and (res['vmin_bus'][isl] == -1).all()
+         and (res['iterations'][isl] == 0).all(), [t, 'no summary, no NaN'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runpf_n1(quiet=False)
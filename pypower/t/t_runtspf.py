@@ -0,0 +1,106 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for time series power flow.
+"""
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from numpy import array, zeros
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.runtspf import runtspf
+from pypower.loadtspf import loadtspf
+
+from pypower.idx_bus import PD, QD, VM, VA
+from pypower.idx_brch import PF, QF, PT, QT, BR_STATUS
+from pypower.idx_gen import PG
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_runtspf(quiet=False):
+    """Tests for time series power flow.
+    """
+    t_begin(14, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+    ppc = case30()
+    ppc['branch'][5, BR_STATUS] = 0
+    scale = array([0.8, 0.9, 1.0, 1.1, 1.2])
+    nt = len(scale)
+    nb, nl = ppc['bus'].shape[0], ppc['branch'].shape[0]
+
+    PDs = scale[:, None] * ppc['bus'][:, PD]
+    QDs = scale[:, None] * ppc['bus'][:, QD]
+    PGs = scale[:, None] * ppc['gen'][:, PG]
+
+    ## reference solutions, one runpf per step
+    Vm, Va, Sf = zeros((nt, nb)), zeros((nt, nb)), zeros((nt, nl, 4))
+    for k in range(nt):
+        ppck = case30()
+        ppck['branch'][5, BR_STATUS] = 0
+        ppck['bus'][:, PD] = PDs[k]
+        ppck['bus'][:, QD] = QDs[k]
+        ppck['gen'][:, PG] = PGs[k]
+        r, _ = runpf(ppck, ppopt)
+        Vm[k], Va[k] = r['bus'][:, VM], r['bus'][:, VA]
+        Sf[k] = r['branch'][:, [PF, QF, PT, QT]]
+
+    tmp = mkdtemp()
+    try:
+        t = 'profile arrays, in chunks : '
+        fname = join(tmp, 'ts1')
+        n, nconv = runtspf(ppc, {'PD': PDs, 'QD': QDs, 'PG': PGs}, fname,
+                           ppopt, chunk=2)
+        res = loadtspf(fname)
+        t_ok(n == nt and nconv == nt, [t, 'steps'])
+        t_ok(res['SUCCESS'].all(), [t, 'success'])
+        t_ok(res['VM'].shape == (nt, nb), [t, 'size'])
+        t_is(res['VM'], Vm, 8, [t, 'VM'])
+        t_is(res['VA'], Va, 6, [t, 'VA'])
+        t_is(res['PF'], Sf[:, :, 0], 6, [t, 'PF'])
+        t_is(res['QT'], Sf[:, :, 3], 6, [t, 'QT'])
+        t_ok((res['ITERATIONS'][1:] <= res['ITERATIONS'][0]).all(),
+             [t, 'warm starts'])
+
+        t = 'generator of chunks : '
+        fname = join(tmp, 'ts2')
+        chunks = ({'PD': PDs[k:k + 3], 'QD': QDs[k:k + 3]}
+                  for k in range(0, nt, 3))
+        n, nconv = runtspf(ppc, chunks, fname, ppopt)
+        res = loadtspf(fname)
+        ppck = case30()
+        ppck['branch'][5, BR_STATUS] = 0
+        ppck['bus'][:, PD] = PDs[3]
+        ppck['bus'][:, QD] = QDs[3]
+        r, _ = runpf(ppck, ppopt)
+        t_ok(n == nt and nconv == nt, [t, 'steps'])
+        t_is(res['VM'][3], r['bus'][:, VM], 8, [t, 'VM'])
+        t_is(res['PT'][3], r['branch'][:, PT], 6, [t, 'PT'])
+
+        t = 'fast-decoupled : '
+        fname = join(tmp, 'ts3')
+        opt = ppoption(ppopt, PF_ALG=2)
+        n, nconv = runtspf(ppc, {'PD': PDs, 'QD': QDs, 'PG': PGs}, fname, opt)
+        res = loadtspf(fname)
+        t_ok(nconv == nt, [t, 'success'])
+        t_is(res['VM'], Vm, 6, [t, 'VM'])
+        t_is(res['VA'], Va, 4, [t, 'VA'])
+        del res
+    finally:
+        rmtree(tmp)
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_runtspf(quiet=False)
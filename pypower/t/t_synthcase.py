@@ -0,0 +1,70 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for synthetic case generation.
+"""
+
+from numpy import array_equal, unique, arange
+
+from pypower.case30 import case30
+from pypower.ppoption import ppoption
+from pypower.runpf import runpf
+from pypower.rundcopf import rundcopf
+from pypower.synthcase import synthcase
+
+from pypower.idx_bus import BUS_I, BUS_TYPE, BUS_AREA, PD, REF
+from pypower.idx_brch import F_BUS, T_BUS
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_synthcase(quiet=False):
+    """Tests for synthetic case generation.
+    """
+    t_begin(13, quiet)
+
+    ppopt = ppoption(VERBOSE=0, OUT_ALL=0)
+
+    t = 'synthcase(1000) : '
+    ppc = synthcase(1000)
+    bus, gen, branch = ppc['bus'], ppc['gen'], ppc['branch']
+    t_ok(bus.shape[0] == 9 * 118 and gen.shape[0] == 9 * 54 and
+         ppc['gencost'].shape[0] == 9 * 54, [t, 'size'])
+    t_ok(branch.shape[0] == 9 * 186 + 12 * 3, [t, 'tie lines'])
+    t_is(bus[118:236, BUS_I], bus[:118, BUS_I] + 1000, 12, [t, 'bus numbers'])
+    t_ok(sum(bus[:, BUS_TYPE] == REF) == 1, [t, 'one reference bus'])
+    t_is(unique(bus[:, BUS_AREA]), arange(1, 10), 12, [t, 'areas'])
+    ties = branch[-36:]
+    t_ok(((ties[:, F_BUS] % 1000) == (ties[:, T_BUS] % 1000)).all(),
+         [t, 'ties between copies of a bus'])
+    t_ok(not array_equal(bus[:118, PD], bus[118:236, PD]), [t, 'copies differ'])
+
+    t = 'seed : '
+    ppc2 = synthcase(1000)
+    t_ok(all(array_equal(ppc[k], ppc2[k])
+             for k in ['bus', 'gen', 'branch', 'gencost']), [t, 'same case'])
+    ppc2 = synthcase(1000, seed=1)
+    t_ok(not array_equal(ppc['bus'], ppc2['bus']), [t, 'other seed'])
+
+    t = 'solvable : '
+    r, success = runpf(ppc, ppopt)
+    t_ok(success, [t, 'runpf'])
+    r, success = runpf(ppc, ppoption(ppopt, PF_ALG=2))
+    t_ok(success, [t, 'runpf, fast-decoupled'])
+    r = rundcopf(ppc, ppopt)
+    t_ok(r['success'], [t, 'rundcopf'])
+
+    t = 'base dict : '
+    ppc = synthcase(100, base=case30(), nties=2)
+    r, success = runpf(ppc, ppopt)
+    t_ok(ppc['bus'].shape[0] == 120 and success, [t, 'runpf'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_synthcase(quiet=False)
@@ -0,0 +1,80 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for C{ybus_model}.
+"""
+
+from numpy import r_
+
+from pypower.case118 import case118
+from pypower.ext2int import ext2int
+from pypower.makeYbus import makeYbus
+from pypower.ybus_model import ybus_model
+
+from pypower.idx_brch import F_BUS, BR_X, BR_B, BR_STATUS, TAP, SHIFT
+
+from pypower.t.t_begin import t_begin
+from pypower.t.t_is import t_is
+from pypower.t.t_ok import t_ok
+from pypower.t.t_end import t_end
+
+
+def t_ybus_model(quiet=False):
+    """Tests for C{ybus_model}.
+    """
+    t_begin(16, quiet)
+
+    ppc = ext2int(case118())
+    baseMVA, bus, branch = ppc['baseMVA'], ppc['bus'], ppc['branch']
+
+    def check(ym, branch, t):
+        Ybus, Yf, Yt = makeYbus(baseMVA, bus, branch)
+        t_is(ym.Ybus.todense(), Ybus.todense(), 12, [t, 'Ybus'])
+        t_is(ym.Yf.todense(), Yf.todense(), 12, [t, 'Yf'])
+        t_is(ym.Yt.todense(), Yt.todense(), 12, [t, 'Yt'])
+
+    ym = ybus_model(baseMVA, bus, branch)
+    Ybus0 = ym.Ybus.copy()
+    nnz = ym.Ybus.nnz
+    check(ym, branch, 'base case : ')
+
+    t = 'branch outage : '
+    ym.update(6, BR_STATUS, 0)
+    br = branch.copy()
+    br[6, BR_STATUS] = 0
+    check(ym, br, t)
+    t_ok(ym.Ybus.nnz == nnz, [t, 'same pattern'])
+
+    t = 'impedance, tap & shift changes : '
+    ym.update([10, 20], [BR_X, BR_B], [[0.05, 0.01], [0.07, 0.02]])
+    ym.update(r_[7, 20], TAP, 1.05)
+    ym.update(7, SHIFT, -3)
+    br[10, [BR_X, BR_B]] = [0.05, 0.01]
+    br[20, [BR_X, BR_B]] = [0.07, 0.02]
+    br[[7, 20], TAP] = 1.05
+    br[7, SHIFT] = -3
+    check(ym, br, t)
+
+    t = 'revert last : '
+    ym.revert(1)
+    br[7, SHIFT] = branch[7, SHIFT]
+    check(ym, br, t)
+
+    t = 'revert all : '
+    ym.revert()
+    t_ok((ym.Ybus != Ybus0).nnz == 0, [t, 'Ybus exactly restored'])
+    t_ok((ym.branch == branch).all(), [t, 'branch restored'])
+
+    t = 'invalid update : '
+    try:
+        ym.update(0, F_BUS, 3)
+        t_ok(False, [t, 'ValueError'])
+    except ValueError:
+        t_ok(True, [t, 'ValueError'])
+
+    t_end()
+
+
+if __name__ == '__main__':
+    t_ybus_model(quiet=False)
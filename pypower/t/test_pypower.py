@@ -23,11 +23,32 @@ def test_pypower(verbose=False):
     tests.append('t_loadcase')
     # tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
+    tests.append('t_newtonpf')
+    tests.append('t_gausspf')
+    tests.append('t_ybus_model')
     tests.append('t_hessian')
     tests.append('t_totcost')
     tests.append('t_modcost')
     tests.append('t_hasPQcap')
     tests.append('t_savecase')
+    tests.append('t_runpf_batch')
+    tests.append('t_runtspf')
+    tests.append('t_runcpf')
+    tests.append('t_runpf_n1')
+    tests.append('t_dcscreen')
+    tests.append('t_lodf_model')
+    tests.append('t_find_islands')
+    tests.append('t_bfswpf')
+    tests.append('t_pf_session')
+    tests.append('t_pptiming')
+    tests.append('t_iter_callback')
+    tests.append('t_benchmark')
+    tests.append('t_synthcase')
+    tests.append('t_api')
+    tests.append('t_casebin')
+    tests.append('t_casem')
+    tests.append('t_psse2ppc')
+    tests.append('t_casecache')
 
     # tests.append('t_pips')
 
@@ -72,7 +93,28 @@ def test_pf(verbose=False):
     tests.append('t_loadcase')
     tests.append('t_ext2int2ext')
     tests.append('t_jacobian')
+    tests.append('t_newtonpf')
+    tests.append('t_gausspf')
+    tests.append('t_ybus_model')
     tests.append('t_pf')
+    tests.append('t_runpf_batch')
+    tests.append('t_runtspf')
+    tests.append('t_runcpf')
+    tests.append('t_runpf_n1')
+    tests.append('t_dcscreen')
+    tests.append('t_lodf_model')
+    tests.append('t_find_islands')
+    tests.append('t_bfswpf')
+    tests.append('t_pf_session')
+    tests.append('t_pptiming')
+    tests.append('t_iter_callback')
+    tests.append('t_benchmark')
+    tests.append('t_synthcase')
+    tests.append('t_api')
+    tests.append('t_casebin')
+    tests.append('t_casem')
+    tests.append('t_psse2ppc')
+    tests.append('t_casecache')
 
     return t_run_tests(tests, verbose)
 
@@ -0,0 +1,137 @@
+# Copyright (c) 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+"""Admittance matrices with incremental branch updates.
+"""
+
+from numpy import \
+    arange, atleast_1d, isscalar, ix_, zeros, empty, r_, unique, bincount, \
+    cumsum, add
+
+from scipy.sparse import csr_matrix
+
+from pypower.makeYbus import branch_admittances
+
+from pypower.idx_bus import GS, BS
+from pypower.idx_brch import F_BUS, T_BUS
+
+
+class ybus_model(object):
+    """Admittance matrices with incremental branch updates.
+
+    Builds the bus admittance matrix C{Ybus} and the branch admittance
+    matrices C{Yf} and C{Yt}, as returned by L{makeYbus}, as CSR matrices
+    whose sparsity pattern includes the entries of every branch, whether
+    in service or not. Changing the status, impedance, line charging, tap
+    ratio or phase shift of C{k} branches with L{update} then modifies the
+    C{data} arrays of the three matrices in place in O(k) time, and
+    L{revert} restores the previous values exactly. Since the pattern
+    never changes, solvers which cache it (see L{jac_builder}) remain
+    valid across updates.
+
+    The matrices are available as C{ym.Ybus}, C{ym.Yf} and C{ym.Yt}, and
+    the current branch data as C{ym.branch}. Expects C{bus} and C{branch}
+    to use internal consecutive bus numbering.
+
+    Example::
+        ym = ybus_model(baseMVA, bus, branch)
+        ym.update(k, BR_STATUS, 0)      ## take branch k out of service
+        V, success, _ = newtonpf(ym.Ybus, Sbus, V0, ref, pv, pq, ppopt)
+        ym.revert()                     ## back in service
+
+    @see: L{makeYbus}
+    """
+
+    def __init__(self, baseMVA, bus, branch):
+        self.branch = branch.copy()
+
+        nb = bus.shape[0]          ## number of buses
+        nl = branch.shape[0]       ## number of lines
+        f = branch[:, F_BUS].astype(int)
+        t = branch[:, T_BUS].astype(int)
+
+        Yff, Yft, Ytf, Ytt = branch_admittances(self.branch)
+        Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
+
+        ## pattern of Ybus, and position in Ybus.data of the ff, ft, tf and
+        ## tt elements of each branch
+        i = r_[f, f, t, t, arange(nb)]
+        j = r_[f, t, f, t, arange(nb)]
+        keys, k = unique(i * nb + j, return_inverse=True)
+        self.pos = k[:4 * nl].reshape(4, nl)
+        Ydata = r_[Yff, Yft, Ytf, Ytt, Ysh]
+        data = bincount(k, Ydata.real, len(keys)) + \
+            1j * bincount(k, Ydata.imag, len(keys))
+        indptr = r_[0, cumsum(bincount(keys // nb, minlength=nb))]
+        self.Ybus = csr_matrix((data, keys % nb, indptr), (nb, nb))
+
+        ## Yf and Yt have the from and to bus elements of each branch,
+        ## in order of increasing column index, in each row
+        self.pf = 2 * arange(nl) + (f > t)
+        self.pt = 2 * arange(nl) + (f < t)
+        indices = empty(2 * nl, int)
+        indices[self.pf] = f
+        indices[self.pt] = t
+        indptr = 2 * arange(nl + 1)
+        data = zeros(2 * nl, complex)
+        data[self.pf], data[self.pt] = Yff, Yft
+        self.Yf = csr_matrix((data, indices, indptr), (nl, nb))
+        data = zeros(2 * nl, complex)
+        data[self.pf], data[self.pt] = Ytf, Ytt
+        self.Yt = csr_matrix((data, indices.copy(), indptr.copy()), (nl, nb))
+
+        self._undo = []
+
+    def update(self, idx, col, val):
+        """Changes branch data and updates the admittance matrices.
+
+        Sets column C{col} (or the list of columns C{col}) of the rows
+        C{idx} of the branch matrix to C{val}, which is broadcast to a
+        C{len(idx)} (by C{len(col)}) array, and updates C{Ybus}, C{Yf}
+        and C{Yt} in place for the affected branches only. Any branch
+        column except C{F_BUS} and C{T_BUS} may be changed, the ones which
+        matter being C{BR_R}, C{BR_X}, C{BR_B}, C{TAP}, C{SHIFT} and
+        C{BR_STATUS}. The update can be undone with L{revert}.
+        """
+        idx = atleast_1d(idx).astype(int)
+        if set(atleast_1d(col)) & set([F_BUS, T_BUS]):
+            raise ValueError('ybus_model: branch end buses cannot be '
+                             'changed, build a new model instead.')
+
+        ## save everything needed to restore the current state exactly
+        pos = self.pos[:, idx]
+        p = r_[self.pf[idx], self.pt[idx]]
+        self._undo.append((idx, self.branch[idx].copy(), pos,
+                           self.Ybus.data[pos], self.Yf.data[p],
+                           self.Yt.data[p]))
+
+        Y0 = branch_admittances(self.branch[idx])
+        if isscalar(col):
+            self.branch[idx, col] = val
+        else:
+            self.branch[ix_(idx, col)] = val
+        Yff, Yft, Ytf, Ytt = Y1 = branch_admittances(self.branch[idx])
+
+        ## parallel branches share elements of Ybus, so accumulate changes
+        for k in range(4):
+            add.at(self.Ybus.data, pos[k], Y1[k] - Y0[k])
+
+        self.Yf.data[self.pf[idx]] = Yff
+        self.Yf.data[self.pt[idx]] = Yft
+        self.Yt.data[self.pf[idx]] = Ytf
+        self.Yt.data[self.pt[idx]] = Ytt
+
+    def revert(self, n=None):
+        """Undoes the last C{n} updates (all of them by default).
+        """
+        if n is None:
+            n = len(self._undo)
+
+        for _ in range(n):
+            idx, branch, pos, Ybus, Yf, Yt = self._undo.pop()
+            p = r_[self.pf[idx], self.pt[idx]]
+            self.branch[idx] = branch
+            self.Ybus.data[pos] = Ybus
+            self.Yf.data[p] = Yf
+            self.Yt.data[p] = Yt